@@ -0,0 +1,88 @@
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import List, Optional
+import warnings
+
+from benchmarks.micro import run_microbenchmarks
+from benchmarks.phases import SQLALCHEMY_DIR, Phases
+from benchmarks.results import compare, format_results, read_results, write_results
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time typpy on a corpus of source files and on its hot functions.",
+    )
+    parser.add_argument(
+        "--corpus",
+        metavar="DIR",
+        type=Path,
+        default=SQLALCHEMY_DIR,
+        help="Package whose files are checked (default: the vendored SQLAlchemy).",
+    )
+    parser.add_argument(
+        "--repeat",
+        metavar="N",
+        type=int,
+        default=5,
+        help="Repetitions of each microbenchmark, the best one is kept.",
+    )
+    parser.add_argument(
+        "--skip-phases",
+        action="store_true",
+        help="Only run microbenchmarks.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="FILE",
+        type=Path,
+        help="Write the results to a JSON file.",
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="FILE",
+        type=Path,
+        help=(
+            "JSON results of a previous run. "
+            "Exit with an error if a benchmark is slower."
+        ),
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Slowdown relative to the baseline considered a regression.",
+    )
+    ns = parser.parse_args(args)
+
+    results = {}
+    if not ns.skip_phases:
+        # Unsupported code in the corpus produces many warnings
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            results.update(Phases(ns.corpus).run())
+    results.update(run_microbenchmarks(repeat=ns.repeat))
+
+    baseline = None if ns.baseline is None else read_results(ns.baseline)
+    print(format_results(results, baseline))
+
+    if ns.output is not None:
+        write_results(results, ns.output)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, ns.tolerance)
+        for regression in regressions:
+            print(
+                f"Regression: {regression.name} is {regression.ratio:.2f}x slower "
+                f"than the baseline",
+                file=sys.stderr,
+            )
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import ast
+import textwrap
+import types
+from typing import Any, Callable, Optional
+
+from typpy.expression import get_expr_type
+from typpy.expression.call import check_call
+from typpy.is_subtype import _is_subtype, is_subtype
+from typpy.scope import Scope, parse_scope
+
+from benchmarks.results import Result, time_call
+
+SOURCE = textwrap.dedent("""
+    from typing import Dict, List, Optional, Tuple, Union
+
+
+    def add(a: int, b: int) -> int:
+        return a + b
+
+
+    def add_default(a: int, b: int = 1) -> int:
+        return a + b
+
+
+    def add_union(a: Union[int, str], b: Optional[float] = None) -> str:
+        return f"{a} + {b}"
+
+
+    def add_tuple(t: Tuple[int, int]) -> int:
+        return t[0] + t[1]
+    """)
+
+SUBTYPE_PAIRS = [
+    (int, int),
+    (bool, int),
+    (str, int),
+    (int, "Union[int, str]"),
+    (None, "Optional[int]"),
+    ("Tuple[int, int]", "Tuple[int, int]"),
+    ("Tuple[int, str]", "Tuple[int, int]"),
+    ("List[int]", "list"),
+    ("Dict[str, int]", "Dict[str, int]"),
+]
+
+EXPRESSIONS = [
+    "1",
+    "'a'",
+    "var",
+    "(1, 'a')",
+    "[1, 2, 3]",
+    "{'a': 1, 'b': 2}",
+    "add(1, 2)",
+]
+
+CALLS = [
+    "add(1, 2)",
+    "add(1, 'b')",
+    "add_default(a=1)",
+    "add_union(1, b=2.0)",
+    "add_tuple((1, 2))",
+    "undefined(1)",
+]
+
+
+def make_scope() -> Scope:
+    module = types.ModuleType("micro_benchmark")
+    exec(compile(SOURCE, "<micro_benchmark>", "exec"), vars(module))
+    scope = parse_scope(module)
+    scope.qualified_name = module.__name__
+    scope.add_variable("var", int)
+    return scope
+
+
+def run_microbenchmarks(
+    repeat: int = 5, number: Optional[int] = None
+) -> dict[str, Result]:
+    """Time the hot functions of the checker.
+
+    Each result is the time of a call over all the inputs of the benchmark.
+    """
+    scope = make_scope()
+    namespace = scope.namespace
+    pairs = [
+        tuple(eval(t, namespace) if isinstance(t, str) else t for t in pair)
+        for pair in SUBTYPE_PAIRS
+    ]
+    expressions = [ast.parse(code, mode="eval").body for code in EXPRESSIONS]
+    calls = [ast.parse(code, mode="eval").body for code in CALLS]
+
+    # The scope memoizes the type and errors of each node: they are
+    # cleared so that every call infers and checks the nodes again.
+    def expr_types() -> list[Any]:
+        scope.expr_types.clear()
+        return [get_expr_type(e, scope) for e in expressions]
+
+    def call_errors() -> list[Any]:
+        scope.expr_types.clear()
+        scope.expr_errors.clear()
+        return [check_call(call, scope) for call in calls]
+
+    benchmarks: dict[str, Callable[[], Any]] = {
+        "micro.is_subtype": lambda: [is_subtype(*pair) for pair in pairs],
+        "micro.is_subtype_uncached": lambda: [_is_subtype(*pair) for pair in pairs],
+        "micro.get_expr_type": expr_types,
+        "micro.check_call": call_errors,
+    }
+    items = {
+        "micro.is_subtype": len(pairs),
+        "micro.is_subtype_uncached": len(pairs),
+        "micro.get_expr_type": len(expressions),
+        "micro.check_call": len(calls),
+    }
+
+    return {
+        name: Result(time_call(func, repeat, number), items=items[name])
+        for name, func in benchmarks.items()
+    }
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+import types
+from pathlib import Path
+from typing import Iterator
+
+from typpy.ast_index import AstIndex
+from typpy.discover_files import find_files
+from typpy.scope import Scope, parse_scope
+from typpy.source import SourceCache
+from typpy.statement import check_statement
+from typpy.type_checker import TypeChecker
+
+from benchmarks.results import Result
+
+ROOT = Path(__file__).parent.parent
+SQLALCHEMY_DIR = ROOT / "tests" / "cases" / "sqlalchemy"
+
+
+class Phases:
+    """Time each phase of a type check on a corpus of source files.
+
+    typpy does not support all the code of the corpus yet, so every
+    file, scope and statement is timed on its own, and failures are
+    counted instead of stopping the phase.
+    """
+
+    def __init__(self, corpus_dir: Path = SQLALCHEMY_DIR):
+        self.corpus_dir = corpus_dir
+        self.type_checker = TypeChecker()
+        self.sources = SourceCache()
+
+        self.files: list[Path] = []
+        self.modules: dict[Path, types.ModuleType] = {}
+        self.scopes: dict[Path, Scope] = {}
+        self.indexes: dict[Path, AstIndex] = {}
+
+    def run(self) -> dict[str, Result]:
+        """Run all phases in order, each one using the output of the previous."""
+        return {
+            "phase.discovery": self.discover(),
+            "phase.import": self.import_modules(),
+            "phase.parse_scope": self.parse_scopes(),
+            "phase.ast_parse": self.parse_sources(),
+            "phase.check": self.check_statements(),
+        }
+
+    def discover(self) -> Result:
+        start = time.perf_counter()
+        self.files = list(find_files([str(self.corpus_dir / "**" / "*.py")]))
+        return Result(time.perf_counter() - start, items=len(self.files))
+
+    def import_modules(self) -> Result:
+        # Import the corpus from scratch, also when repeating the phase
+        package_name = self.corpus_dir.name
+        for module_name in list(sys.modules):
+            if module_name == package_name or module_name.startswith(
+                f"{package_name}."
+            ):
+                del sys.modules[module_name]
+
+        self.modules = {}
+        failures = 0
+        start = time.perf_counter()
+        for file in self.files:
+            try:
+                with self.type_checker.import_module(file) as file_module:
+                    self.modules[file] = file_module.module
+            except Exception:
+                failures += 1
+
+        return Result(time.perf_counter() - start, len(self.files), failures)
+
+    def parse_scopes(self) -> Result:
+        """Create the scope of each module, and compute the
+        signatures of all its callables."""
+        self.scopes = {}
+        failures = 0
+        start = time.perf_counter()
+        for file, module in self.modules.items():
+            scope = parse_scope(module)
+            scope.file = file
+            scope.qualified_name = module.__name__
+            self.scopes[file] = scope
+            for name, _ in scope.iter_callables():
+                try:
+                    scope.resolve_callable(name)
+                except Exception:
+                    failures += 1
+
+        return Result(time.perf_counter() - start, len(self.scopes), failures)
+
+    def parse_sources(self) -> Result:
+        sources = [self.sources.get(file) for file in self.files]
+
+        self.indexes = {}
+        failures = 0
+        start = time.perf_counter()
+        for source in sources:
+            try:
+                self.indexes[source.path] = AstIndex.from_source(source)
+            except SyntaxError:
+                failures += 1
+
+        return Result(time.perf_counter() - start, len(sources), failures)
+
+    def check_statements(self) -> Result:
+        """Check the statements of each module, and of the functions
+        and classes defined at the top level of the module."""
+        items = 0
+        failures = 0
+        start = time.perf_counter()
+        for file, scope in self.scopes.items():
+            index = self.indexes.get(Path(os.path.abspath(file)))
+            if index is None:
+                continue
+
+            for body, body_scope in self._scope_bodies(index, scope):
+                for stmt in body:
+                    items += 1
+                    try:
+                        check_statement(stmt, body_scope)
+                    except Exception:
+                        failures += 1
+
+        return Result(time.perf_counter() - start, items, failures)
+
+    @staticmethod
+    def _scope_bodies(index: AstIndex, scope: Scope) -> Iterator[tuple[list, Scope]]:
+        yield index.tree.body, scope
+
+        module = scope.container
+        for _, obj in scope.iter_callables():
+            if getattr(obj, "__module__", None) != module.__name__:
+                continue
+
+            node = index.find(obj)
+            if node is not None:
+                yield node.body, parse_scope(obj, scope)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import timeit
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from typpy.version import PYTHON_VERSION, __version__
+
+
+@dataclass(frozen=True)
+class Result:
+    """Timing of a benchmark.
+
+    For phases, seconds is the time spent on the whole corpus,
+    for microbenchmarks the time of a single call.
+    """
+
+    seconds: float
+    items: int = 0
+    failures: int = 0
+
+
+@dataclass(frozen=True)
+class Regression:
+    name: str
+    baseline_seconds: float
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        return self.seconds / self.baseline_seconds
+
+
+def time_call(
+    func: Callable[[], Any], repeat: int, number: Optional[int] = None
+) -> float:
+    """Time func, returning the best time of a single call.
+
+    :param number: Calls per repetition. If None, as many as
+        needed for a repetition to last at least 0.2 seconds.
+    """
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def write_results(results: dict[str, Result], path: Path) -> None:
+    data = {
+        "typpy": __version__,
+        "python": PYTHON_VERSION,
+        "benchmarks": {name: asdict(result) for name, result in results.items()},
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def read_results(path: Path) -> dict[str, Result]:
+    data = json.loads(path.read_text())
+    return {name: Result(**result) for name, result in data["benchmarks"].items()}
+
+
+def compare(
+    results: dict[str, Result],
+    baseline: dict[str, Result],
+    tolerance: float = 0.2,
+) -> list[Regression]:
+    """Find the benchmarks slower than the baseline by more than tolerance.
+
+    Benchmarks missing in either results are ignored.
+    """
+    regressions = []
+    for name, result in results.items():
+        baseline_result = baseline.get(name)
+        if baseline_result is None or baseline_result.seconds <= 0:
+            continue
+
+        if result.seconds > baseline_result.seconds * (1 + tolerance):
+            regressions.append(
+                Regression(name, baseline_result.seconds, result.seconds)
+            )
+
+    return regressions
+
+
+def format_results(
+    results: dict[str, Result],
+    baseline: Optional[dict[str, Result]] = None,
+) -> str:
+    name_width = max((len(name) for name in results), default=0)
+    lines = []
+    for name, result in results.items():
+        line = f"{name:<{name_width}}  {_format_seconds(result.seconds):>10}"
+        if result.items:
+            line += f"  {result.items:>6} items"
+        if result.failures:
+            line += f"  {result.failures:>6} failures"
+
+        baseline_result = None if baseline is None else baseline.get(name)
+        if baseline_result is not None and baseline_result.seconds > 0:
+            line += f"  {result.seconds / baseline_result.seconds:.2f}x baseline"
+
+        lines.append(line)
+
+    return "\n".join(lines)
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} us"
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import math
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Optional
+
+from typpy.is_subtype import clear_subtype_cache
+from typpy.type_checker import TypeChecker
+
+from benchmarks.synthetic import SyntheticSpec, generate_package
+
+# Sizes swept for each dimension of the generated packages,
+# the other dimensions keep their default value.
+DEFAULT_SIZES = {
+    "modules": [4, 8, 16, 32],
+    "functions": [4, 8, 16, 32],
+    "calls": [2, 4, 8, 16],
+    "parameters": [2, 4, 8, 16],
+    "union_width": [2, 4, 8, 16],
+    "imports": [1, 2, 4, 7],
+}
+
+# Exponents above this are reported as superlinear
+SUPERLINEAR_EXPONENT = 1.2
+
+
+@dataclass(frozen=True)
+class Sweep:
+    dimension: str
+    sizes: list[int]
+    seconds: list[float]
+
+    @property
+    def exponent(self) -> float:
+        """Exponent k of the best fit of seconds = c * size ** k."""
+        return fit_exponent(self.sizes, self.seconds)
+
+
+def fit_exponent(sizes: list[int], seconds: list[float]) -> float:
+    """Least squares fit of a line in log-log space, returning its slope."""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(s, 1e-9)) for s in seconds]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    covariance = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    variance = sum((x - x_mean) ** 2 for x in xs)
+    return covariance / variance
+
+
+def measure(spec: SyntheticSpec, repeat: int = 1) -> float:
+    """Time the check of a package generated from spec, best of repeat."""
+    best = math.inf
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as directory:
+            # A new name for each package, not to reuse imported modules
+            name = f"synthetic_{time.perf_counter_ns()}"
+            files = generate_package(Path(directory), spec, name)
+            clear_subtype_cache()
+
+            start = time.perf_counter()
+            TypeChecker().check_files(files)
+            best = min(best, time.perf_counter() - start)
+
+            _unload(name)
+
+    return best
+
+
+def sweep(
+    dimension: str,
+    sizes: list[int],
+    base: SyntheticSpec = SyntheticSpec(),
+    repeat: int = 1,
+) -> Sweep:
+    seconds = [
+        measure(replace(base, **{dimension: size}), repeat=repeat) for size in sizes
+    ]
+    return Sweep(dimension, sizes, seconds)
+
+
+def _unload(package: str) -> None:
+    for module_name in list(sys.modules):
+        if module_name == package or module_name.startswith(f"{package}."):
+            del sys.modules[module_name]
+
+
+def main(args: Optional[list[str]] = None) -> None:
+    parser = ArgumentParser(
+        prog="python -m benchmarks.scaling",
+        description=(
+            "Check generated packages of increasing size and fit how "
+            "the time grows with each dimension."
+        ),
+    )
+    parser.add_argument(
+        "dimensions",
+        metavar="DIMENSION",
+        nargs="*",
+        help=f"Dimensions to sweep (default: all of {', '.join(DEFAULT_SIZES)}).",
+    )
+    parser.add_argument(
+        "--sizes",
+        metavar="N",
+        type=int,
+        nargs="+",
+        help="Sizes to sweep, instead of the default ones of each dimension.",
+    )
+    parser.add_argument(
+        "--repeat",
+        metavar="N",
+        type=int,
+        default=3,
+        help="Checks of each size, the best one is kept.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="FILE",
+        type=Path,
+        help="Write the sweeps to a JSON file.",
+    )
+    ns = parser.parse_args(args)
+    for dimension in ns.dimensions:
+        if dimension not in DEFAULT_SIZES:
+            parser.error(f"unknown dimension '{dimension}'")
+
+    sweeps = []
+    for dimension in ns.dimensions or DEFAULT_SIZES:
+        result = sweep(
+            dimension, ns.sizes or DEFAULT_SIZES[dimension], repeat=ns.repeat
+        )
+        sweeps.append(result)
+
+        marker = "  superlinear" if result.exponent > SUPERLINEAR_EXPONENT else ""
+        timings = ", ".join(
+            f"{size}: {seconds * 1e3:.1f} ms"
+            for size, seconds in zip(result.sizes, result.seconds)
+        )
+        print(f"{dimension:<12} O(n^{result.exponent:.2f}){marker}  [{timings}]")
+
+    if ns.output is not None:
+        data = [{**asdict(result), "exponent": result.exponent} for result in sweeps]
+        ns.output.write_text(json.dumps(data, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """Shape of a generated package."""
+
+    modules: int = 8
+    # Functions defined in each module
+    functions: int = 8
+    # Calls in the body of each function
+    calls: int = 4
+    # Parameters of each function, all but the first passed by keyword
+    parameters: int = 3
+    # Types in the union annotating the first parameter
+    union_width: int = 2
+    # Modules from which each module imports functions
+    imports: int = 2
+
+
+def generate_package(directory: Path, spec: SyntheticSpec, name: str) -> list[Path]:
+    """Write a package with the given shape, returning its module files.
+
+    Every module defines the same number of functions, calling each other
+    and the functions imported from the previous modules of the package.
+    The generated code is correctly typed.
+    """
+    package_dir = directory / name
+    package_dir.mkdir(parents=True)
+    (package_dir / "__init__.py").touch()
+
+    files = []
+    for module_index in range(spec.modules):
+        file = package_dir / f"mod_{module_index}.py"
+        file.write_text(_module_source(spec, name, module_index))
+        files.append(file)
+
+    return files
+
+
+def _module_source(spec: SyntheticSpec, package: str, module_index: int) -> str:
+    lines = ["from typing import Union", ""]
+
+    # Only import previous modules, to avoid import cycles
+    imported = []
+    first_import = max(module_index - spec.imports, 0)
+    for imported_index in range(first_import, module_index):
+        function = f"func_{imported_index}_0"
+        lines.append(f"from {package}.mod_{imported_index} import {function}")
+        imported.append(function)
+
+    lines.append("")
+    for type_index in range(spec.union_width - 1):
+        lines += ["", f"class T{type_index}:", "    pass", ""]
+
+    union = ", ".join([f"T{i}" for i in range(spec.union_width - 1)] + ["int"])
+    parameters = [f"p0: Union[{union}]"]
+    parameters += [f"p{i}: int = {i}" for i in range(1, spec.parameters)]
+    arguments = ["1"] + [f"p{i}={i}" for i in range(1, spec.parameters)]
+
+    for function_index in range(spec.functions):
+        name = f"func_{module_index}_{function_index}"
+        callees = [f"func_{module_index}_{i}" for i in range(function_index)]
+        callees += imported
+        callees = callees or [name]
+
+        lines += ["", f"def {name}({', '.join(parameters)}) -> int:", "    x: int = 1"]
+        for call_index in range(spec.calls):
+            callee = callees[call_index % len(callees)]
+            lines.append(f"    {callee}({', '.join(arguments)})")
+        lines += ["    return x", ""]
+
+    return "\n".join(lines)
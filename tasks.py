@@ -11,14 +11,17 @@ ROOT = Path(__file__).parent
 @task
 def lint(ctx):
     """Lint code."""
-    ctx.run("black --check typpy tests --exclude tests/cases/sqlalchemy")
-    ctx.run("flake8 typpy tests --exclude tests/cases/sqlalchemy --max-line-length 100")
+    ctx.run("black --check typpy tests benchmarks --exclude tests/cases/sqlalchemy")
+    ctx.run(
+        "flake8 typpy tests benchmarks --exclude tests/cases/sqlalchemy "
+        "--max-line-length 100"
+    )
 
 
 @task
 def format_code(ctx):
     """Format code."""
-    ctx.run("black typpy tests --exclude tests/cases/sqlalchemy")
+    ctx.run("black typpy tests benchmarks --exclude tests/cases/sqlalchemy")
 
 
 @task
@@ -27,6 +30,23 @@ def test(ctx):
     ctx.run("pytest tests")
 
 
+@task
+def benchmark(ctx, output=None, baseline=None):
+    """Run benchmarks, optionally comparing them with the results of a previous run."""
+    command = "python -m benchmarks"
+    if output:
+        command += f" --output {output}"
+    if baseline:
+        command += f" --baseline {baseline}"
+    ctx.run(command)
+
+
+@task
+def scaling(ctx, dimension=None):
+    """Fit how the check time grows with the size of generated packages."""
+    ctx.run(f"python -m benchmarks.scaling {dimension or ''}")
+
+
 @task
 def check(ctx):
     """Run linting tools and tests."""
@@ -84,6 +104,13 @@ def update_version(version):
     setup = re.sub(r'version="(.+)"', f'version="{version}"', setup)
     setup_path.write_text(setup)
 
+    version_path = ROOT / "typpy" / "version.py"
+    version_module = version_path.read_text()
+    version_module = re.sub(
+        r'__version__ = "(.+)"', f'__version__ = "{version}"', version_module
+    )
+    version_path.write_text(version_module)
+
 
 def tag(ctx, version):
     ctx.run("git add .")
@@ -1,8 +1,18 @@
+import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import pytest
 
+from typpy.signatures import SignatureDatabase, set_signature_database
+from tests.utils import MakePackage
+
+
+@pytest.fixture(autouse=True, scope="session")
+def signature_database() -> None:
+    # Do not write the signature database to the user cache during tests
+    set_signature_database(SignatureDatabase(None))
+
 
 @pytest.fixture
 def test_dir() -> Path:
@@ -26,3 +36,31 @@ def namespace() -> Any:
             self.__dict__[attr] = value
 
     return Namespace()
+
+
+@pytest.fixture
+def make_package(tmp_path: Path) -> Iterator[MakePackage]:
+    """Factory writing a package in a temporary directory.
+
+    The modules imported from the directory while checking it are
+    removed from sys.modules at the end of the test.
+    """
+    names = []
+
+    def make(name: str, modules: dict[str, str]) -> Path:
+        package_dir = tmp_path / name
+        package_dir.mkdir()
+        (package_dir / "__init__.py").touch()
+        for module_name, source in modules.items():
+            (package_dir / f"{module_name}.py").write_text(source)
+        names.append(name)
+        return package_dir
+
+    yield make
+
+    for module_name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if module_name.split(".")[0] in names or (
+            file is not None and tmp_path in Path(file).parents
+        ):
+            del sys.modules[module_name]
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 import pytest
 
 from typpy.scope import Scope, parse_scope
+from typpy.expression import check_expression
 from typpy.expression.call import check_call
 from ..utils import ast_parse_call, CheckTestCase, parametrize_case
 
@@ -140,3 +141,18 @@ def test_check_call(scope: Scope, case: CheckCallTestCase) -> None:
     expr = ast_parse_call(case.code)
     errors = check_call(expr, scope)
     assert [err.message for err in errors] == case.errors
+
+
+def test_check_expression_memoized(
+    scope: Scope, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    expr = ast_parse_call("add(1, '2')")
+    errors = check_expression(expr, scope)
+    assert [err.message for err in errors] == [
+        "Expected 'int' as argument 'b' to 'add', found 'str'"
+    ]
+
+    # The errors are reused, and the list returned can be extended
+    errors.append(None)
+    monkeypatch.setattr(scope, "resolve_binding_plan", None)
+    assert check_expression(expr, scope) == errors[:1]
@@ -80,3 +80,13 @@ def test_get_expr_type(scope: Scope, case: GetExprTypeTestCase) -> None:
     expr = ast_parse_expr(case.code)
     _type = get_expr_type(expr, scope)
     assert _type == case.type
+
+
+def test_get_expr_type_memoized(scope: Scope, monkeypatch: pytest.MonkeyPatch) -> None:
+    expr = ast_parse_expr("[add(1, 2), 'a']")
+    expected = get_expr_type(expr, scope)
+
+    # The type of each node is only inferred once per scope
+    monkeypatch.setattr(scope, "resolve_callable", None)
+    assert get_expr_type(expr, scope) is expected
+    assert get_expr_type(expr.elts[0], scope) is int
@@ -0,0 +1,147 @@
+import ast
+import os
+import textwrap
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from typpy import type_checker
+from typpy.ast_index import AstIndex
+from typpy.source import SourceFile
+from typpy.type_checker import TypeChecker
+from tests.utils import MakePackage
+
+SOURCE = textwrap.dedent("""
+    def function():
+        def inner():
+            ...
+
+        return inner
+
+
+    class Class:
+        def method(self):
+            ...
+
+        class Nested:
+            def method(self):
+                ...
+
+
+    def decorator(func):
+        return func
+
+
+    @decorator
+    def decorated():
+        ...
+
+
+    if True:
+        def conditional():
+            ...
+    """)
+
+
+@pytest.fixture
+def definitions() -> dict[str, Any]:
+    definitions = {}
+    exec(compile(SOURCE, "<test>", "exec"), definitions)
+    return definitions
+
+
+@pytest.fixture
+def index() -> AstIndex:
+    return AstIndex(ast.parse(SOURCE))
+
+
+@pytest.mark.parametrize(
+    "qualified_name, get_obj",
+    [
+        ("function", lambda ns: ns["function"]),
+        ("function.<locals>.inner", lambda ns: ns["function"]()),
+        ("Class", lambda ns: ns["Class"]),
+        ("Class.method", lambda ns: ns["Class"].method),
+        ("Class.Nested", lambda ns: ns["Class"].Nested),
+        ("Class.Nested.method", lambda ns: ns["Class"].Nested.method),
+        ("decorated", lambda ns: ns["decorated"]),
+        ("conditional", lambda ns: ns["conditional"]),
+    ],
+    ids=lambda value: value if isinstance(value, str) else "",
+)
+def test_find(
+    index: AstIndex,
+    definitions: dict[str, Any],
+    qualified_name: str,
+    get_obj: Callable[[dict[str, Any]], Any],
+) -> None:
+    obj = get_obj(definitions)
+
+    node = index.find(obj)
+    assert node is not None
+    assert node.name == obj.__name__
+    assert node is index.by_qualified_name[qualified_name]
+
+
+def test_find_missing(index: AstIndex) -> None:
+    assert index.find(lambda: None) is None
+
+
+def test_file_parsed_once(cases_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    parsed = []
+    original_from_source = AstIndex.from_source.__func__
+
+    def from_source(cls, source: SourceFile) -> AstIndex:
+        parsed.append(source.path)
+        return original_from_source(cls, source)
+
+    def getsource(obj: Any) -> str:
+        raise AssertionError(f"{obj} was parsed on its own")
+
+    monkeypatch.setattr(AstIndex, "from_source", classmethod(from_source))
+    monkeypatch.setattr(type_checker.inspect, "getsource", getsource)
+
+    TypeChecker().check_files([cases_dir / "function" / "function.py"])
+    assert parsed == [(cases_dir / "function" / "function.py").absolute()]
+
+
+def test_file_released_once_checked(tmp_path: Path) -> None:
+    files = [tmp_path / f"module_{index}.py" for index in range(3)]
+    for file in files:
+        file.write_text("def f(a: int) -> int:\n    return a\n")
+
+    type_checker = TypeChecker()
+    for file, errors in type_checker.iter_check_files(files):
+        # Still available to the caller, e.g. to print the errors
+        assert Path(os.path.abspath(file)) in type_checker._ast_indexes
+        assert Path(os.path.abspath(file)) in type_checker.sources._files
+
+    assert type_checker._ast_indexes == {}
+    assert type_checker.sources._files == {}
+
+
+def test_shared_module_parsed_once(
+    make_package: MakePackage, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    package_dir = make_package(
+        "shared_pkg",
+        {
+            "common": "def helper(a: int) -> int:\n    return a\n",
+            **{
+                f"user_{index}": "from shared_pkg.common import helper\n"
+                for index in range(4)
+            },
+        },
+    )
+    parsed = []
+    original_from_source = AstIndex.from_source.__func__
+
+    def from_source(cls, source: SourceFile) -> AstIndex:
+        parsed.append(source.path.name)
+        return original_from_source(cls, source)
+
+    monkeypatch.setattr(AstIndex, "from_source", classmethod(from_source))
+
+    TypeChecker().check_files(sorted(package_dir.glob("user_*.py")))
+    assert parsed.count("common.py") == 1
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+from benchmarks.micro import run_microbenchmarks
+from benchmarks.phases import Phases
+from benchmarks.results import Result, compare, read_results, write_results
+from benchmarks.scaling import fit_exponent, sweep
+from benchmarks.synthetic import SyntheticSpec, generate_package
+
+
+def test_phases(cases_dir: Path) -> None:
+    results = Phases(cases_dir / "resolver" / "pkg").run()
+
+    assert list(results) == [
+        "phase.discovery",
+        "phase.import",
+        "phase.parse_scope",
+        "phase.ast_parse",
+        "phase.check",
+    ]
+    assert results["phase.discovery"].items == 5
+    assert all(result.failures == 0 for result in results.values())
+
+
+def test_microbenchmarks() -> None:
+    results = run_microbenchmarks(repeat=1, number=1)
+
+    assert set(results) == {
+        "micro.is_subtype",
+        "micro.is_subtype_uncached",
+        "micro.get_expr_type",
+        "micro.check_call",
+    }
+    assert all(result.seconds > 0 for result in results.values())
+
+
+def test_compare(tmp_path: Path) -> None:
+    baseline = {"a": Result(1.0), "b": Result(1.0), "removed": Result(1.0)}
+    write_results(baseline, tmp_path / "baseline.json")
+
+    results = {"a": Result(1.1), "b": Result(1.5), "added": Result(1.0)}
+    regressions = compare(results, read_results(tmp_path / "baseline.json"))
+
+    assert [(r.name, r.ratio) for r in regressions] == [("b", 1.5)]
+
+
+def test_generate_package(tmp_path: Path) -> None:
+    spec = SyntheticSpec(modules=3, functions=2, calls=3, parameters=2, imports=1)
+    files = generate_package(tmp_path, spec, "generated_pkg")
+
+    assert [file.name for file in files] == ["mod_0.py", "mod_1.py", "mod_2.py"]
+    mod_2 = files[2].read_text()
+    assert "from generated_pkg.mod_1 import func_1_0" in mod_2
+    assert "def func_2_1(p0: Union[T0, int], p1: int = 1) -> int:" in mod_2
+    for file in files:
+        compile(file.read_text(), str(file), "exec")
+
+
+def test_fit_exponent() -> None:
+    sizes = [1, 2, 4, 8]
+    assert round(fit_exponent(sizes, [3 * size**2 for size in sizes]), 6) == 2
+
+
+def test_sweep() -> None:
+    result = sweep("modules", [1, 2], SyntheticSpec(functions=1, calls=1))
+
+    assert result.sizes == [1, 2]
+    assert all(seconds > 0 for seconds in result.seconds)
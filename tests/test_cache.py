@@ -0,0 +1,105 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from typpy.cache import ResultCache
+from typpy.error import TypingError
+from typpy.type_checker import TypeChecker
+from tests.utils import MakePackage
+
+MODULES = {
+    "helpers": "def add(a: int, b: int) -> int:\n    return a + b\n",
+    "main": (
+        "from cached_pkg.helpers import add\n"
+        "\n"
+        "if __name__ == '__main__':\n"
+        "    add(1, 'b')\n"
+    ),
+}
+
+
+@pytest.fixture
+def package_dir(make_package: MakePackage) -> Path:
+    return make_package("cached_pkg", MODULES)
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Path:
+    return tmp_path / ".typpy_cache"
+
+
+def test_cache(package_dir: Path, cache_dir: Path) -> None:
+    main = package_dir / "main.py"
+    helpers = package_dir / "helpers.py"
+
+    errors = TypeChecker(cache_dir=cache_dir).check_files([main])
+    assert [error.message for error in errors] == [
+        "Expected 'int' as argument 'b' to 'add', found 'str'"
+    ]
+    assert (cache_dir / ".gitignore").exists()
+
+    # A fresh cache instance is needed since hashes are cached for the run
+    assert ResultCache(cache_dir).get(main) == errors
+
+    # Changes to imported modules invalidate the entry
+    helpers.write_text("def add(a: int, b: str) -> int:\n    return a\n")
+    assert ResultCache(cache_dir).get(main) is None
+
+    # So do changes to the file itself
+    TypeChecker(cache_dir=cache_dir).check_files([main])
+    main.write_text(main.read_text() + "\n")
+    assert ResultCache(cache_dir).get(main) is None
+
+
+def test_cache_indirect_dependency(package_dir: Path, cache_dir: Path) -> None:
+    (package_dir / "reexport.py").write_text("from cached_pkg.helpers import add\n")
+    user = package_dir / "user.py"
+    user.write_text(
+        "from cached_pkg.reexport import add\n"
+        "\n"
+        "if __name__ == '__main__':\n"
+        "    add(1, 2)\n"
+    )
+    assert TypeChecker(cache_dir=cache_dir).check_files([user]) == []
+    assert ResultCache(cache_dir).get(user) == []
+
+    # The signature of add changes in the module it is re-exported from
+    helpers = package_dir / "helpers.py"
+    helpers.write_text("def add(a: int, b: str) -> int:\n    return a\n")
+    assert ResultCache(cache_dir).get(user) is None
+
+
+def test_cache_skips_checking(
+    package_dir: Path, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    main = package_dir / "main.py"
+    errors = TypeChecker(cache_dir=cache_dir).check_files([main])
+
+    def check_file(self: TypeChecker, path: Path) -> None:
+        raise AssertionError(f"{path} should not be checked")
+
+    monkeypatch.setattr(TypeChecker, "_check_file", check_file)
+    assert TypeChecker(cache_dir=cache_dir).check_files([main]) == errors
+
+
+def test_cache_missing_file(tmp_path: Path, cache_dir: Path) -> None:
+    cache = ResultCache(cache_dir)
+    assert cache.get(tmp_path / "does_not_exist.py") is None
+
+
+def test_cache_corrupted_entry(package_dir: Path, cache_dir: Path) -> None:
+    main = package_dir / "main.py"
+    TypeChecker(cache_dir=cache_dir).check_files([main])
+
+    for entry in cache_dir.glob("*.json"):
+        entry.write_text("{")
+
+    assert ResultCache(cache_dir).get(main) is None
+    shutil.rmtree(cache_dir)
+    assert ResultCache(cache_dir).get(main) is None
+
+
+def test_error_serialization() -> None:
+    error = TypingError(Path("file.py"), 1, 2, None, "message", "code message")
+    assert TypingError.from_dict(error.to_dict()) == error
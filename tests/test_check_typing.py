@@ -1,7 +1,58 @@
 from pathlib import Path
 
+import pytest
+
 from typpy.type_checker import TypeChecker
 
 
 def test_check_typing(cases_dir: Path) -> None:
     TypeChecker().check_files([cases_dir / "function" / "function.py"])
+
+
+def test_check_typing_parallel(cases_dir: Path) -> None:
+    files = [
+        cases_dir / "function" / "function.py",
+        cases_dir / "resolver" / "pkg" / "mod.py",
+        cases_dir / "resolver" / "outer.py",
+    ]
+
+    errors = TypeChecker().check_files(files)
+    parallel_errors = TypeChecker(jobs=2).check_files(files)
+
+    assert errors
+    assert parallel_errors == errors
+
+
+def test_batch_files(cases_dir: Path) -> None:
+    resolver_dir = cases_dir / "resolver"
+    files = [
+        resolver_dir / "pkg" / "mod.py",
+        resolver_dir / "scripts" / "inner.py",
+        resolver_dir / "pkg" / "subpkg" / "submod.py",
+        resolver_dir / "outer.py",
+        resolver_dir / "pkg" / "subpkg" / "submod2.py",
+    ]
+
+    batches = TypeChecker(jobs=2)._batch_files(files)
+    assert batches == [
+        [files[0], files[2], files[3]],
+        [files[4]],
+        [files[1]],
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_iter_check_files(cases_dir: Path, jobs: int) -> None:
+    files = [
+        cases_dir / "function" / "function.py",
+        cases_dir / "resolver" / "pkg" / "mod.py",
+        cases_dir / "resolver" / "outer.py",
+    ]
+
+    file_errors = list(TypeChecker(jobs=jobs).iter_check_files(files))
+
+    if jobs == 1:
+        assert [file for file, _ in file_errors] == files
+    assert dict(file_errors) == {
+        file: TypeChecker().check_files([file]) for file in files
+    }
@@ -0,0 +1,85 @@
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from typpy.daemon import Daemon, check_with_daemon, iter_check_with_daemon, stop_daemon
+from tests.utils import MakePackage
+
+MODULES = {
+    "helpers": "def add(a: int, b: int) -> int:\n    return a + b\n",
+    "main": (
+        "from daemon_pkg.helpers import add\n"
+        "\n"
+        "if __name__ == '__main__':\n"
+        "    add(1, 'b')\n"
+    ),
+}
+
+
+@pytest.fixture
+def package_dir(make_package: MakePackage) -> Path:
+    return make_package("daemon_pkg", MODULES)
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path) -> Iterator[Path]:
+    socket_path = tmp_path / "daemon.sock"
+    thread = threading.Thread(target=Daemon(socket_path).serve)
+    thread.start()
+
+    while not socket_path.exists():
+        time.sleep(0.01)
+
+    yield socket_path
+
+    stop_daemon(socket_path)
+    thread.join()
+    assert not socket_path.exists()
+
+
+def test_daemon(package_dir: Path, socket_path: Path) -> None:
+    main = package_dir / "main.py"
+
+    errors = check_with_daemon([main], socket_path)
+    assert [error.message for error in errors] == [
+        "Expected 'int' as argument 'b' to 'add', found 'str'"
+    ]
+
+    # Unchanged modules stay imported
+    helpers_module = sys.modules["daemon_pkg.helpers"]
+    assert check_with_daemon([main], socket_path) == errors
+    assert sys.modules["daemon_pkg.helpers"] is helpers_module
+
+    # Changed modules, and the modules using them, are reloaded
+    (package_dir / "helpers.py").write_text(
+        "def add(a: int, b: str) -> str:\n    return f'{a}{b}'\n"
+    )
+    assert check_with_daemon([main], socket_path) == []
+
+
+def test_iter_check_with_daemon(package_dir: Path, socket_path: Path) -> None:
+    files = [package_dir / "helpers.py", package_dir / "main.py"]
+
+    file_errors = list(iter_check_with_daemon(files, socket_path))
+    assert [file for file, _ in file_errors] == files
+    assert file_errors[0][1] == []
+    assert len(file_errors[1][1]) == 1
+
+
+def test_daemon_not_running(tmp_path: Path) -> None:
+    with pytest.raises(OSError):
+        check_with_daemon([], tmp_path / "daemon.sock")
+
+
+def test_daemon_no_import(package_dir: Path, socket_path: Path) -> None:
+    main = package_dir / "main.py"
+
+    errors = check_with_daemon([main], socket_path, import_mode="static")
+    assert [error.message for error in errors] == [
+        "Expected 'int' as argument 'b' to 'add', found 'str'"
+    ]
+    assert "daemon_pkg.main" not in sys.modules
@@ -0,0 +1,139 @@
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from typpy.discover_files import find_files
+
+FILES = [
+    "main.py",
+    "notes.txt",
+    "pkg/__init__.py",
+    "pkg/mod.py",
+    "pkg/sub/deep.py",
+    "pkg/generated_pb2.py",
+    "vendor/lib.py",
+    "build/out.py",
+    ".git/hook.py",
+    "venv/lib/site.py",
+    "pkg/__pycache__/mod.py",
+]
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Iterator[Path]:
+    for file in FILES:
+        (tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file).touch()
+    (tmp_path / ".gitignore").write_text("# Comment\nbuild/\n*_pb2.py\n")
+    (tmp_path / "pkg" / ".gitignore").write_text("/sub\n")
+
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    yield tmp_path
+    os.chdir(cwd)
+
+
+@dataclass(frozen=True)
+class FindFilesTestCase:
+    case_id: str
+    patterns: list[str]
+    files: list[str]
+    exclude: list[str] = field(default_factory=list)
+    default_excludes: bool = True
+    gitignore: bool = False
+
+
+@pytest.mark.parametrize(
+    "case",
+    [
+        FindFilesTestCase(
+            case_id="recursive",
+            patterns=["**/*.py"],
+            files=[
+                "build/out.py",
+                "main.py",
+                "pkg/__init__.py",
+                "pkg/generated_pb2.py",
+                "pkg/mod.py",
+                "pkg/sub/deep.py",
+                "vendor/lib.py",
+            ],
+        ),
+        FindFilesTestCase(
+            case_id="single_level",
+            patterns=["pkg/*.py"],
+            files=["pkg/__init__.py", "pkg/generated_pb2.py", "pkg/mod.py"],
+        ),
+        FindFilesTestCase(
+            case_id="directory",
+            patterns=["./pkg/sub"],
+            files=["pkg/sub/deep.py"],
+        ),
+        FindFilesTestCase(
+            case_id="deduplicated",
+            patterns=["pkg/mod.py", "pkg/m*.py", "./pkg/mod.py"],
+            files=["pkg/mod.py"],
+        ),
+        FindFilesTestCase(
+            case_id="only_python",
+            patterns=["notes.txt", "*"],
+            files=["main.py"],
+        ),
+        FindFilesTestCase(
+            case_id="exclude",
+            patterns=["."],
+            exclude=["vendor", "build/*.py", "*_pb2.py", "pkg/sub"],
+            files=["main.py", "pkg/__init__.py", "pkg/mod.py"],
+        ),
+        FindFilesTestCase(
+            case_id="no_default_excludes",
+            patterns=["venv", "pkg/__pycache__/*.py"],
+            default_excludes=False,
+            files=["venv/lib/site.py", "pkg/__pycache__/mod.py"],
+        ),
+        FindFilesTestCase(
+            case_id="gitignore",
+            patterns=["**/*.py"],
+            gitignore=True,
+            files=["main.py", "pkg/__init__.py", "pkg/mod.py", "vendor/lib.py"],
+        ),
+        FindFilesTestCase(
+            case_id="gitignore_explicit",
+            patterns=["pkg", "build/out.py"],
+            gitignore=True,
+            files=["pkg/__init__.py", "pkg/mod.py", "build/out.py"],
+        ),
+    ],
+    ids=lambda case: case.case_id,
+)
+def test_find_files(tree: Path, case: FindFilesTestCase) -> None:
+    files = find_files(
+        case.patterns,
+        exclude=case.exclude,
+        default_excludes=case.default_excludes,
+        gitignore=case.gitignore,
+    )
+    assert list(files) == [Path(file) for file in case.files]
+
+
+@pytest.mark.parametrize("pattern", ["pkg/sub", "pkg/sub/*.py"])
+def test_gitignore_nested_root(tree: Path, pattern: str) -> None:
+    # Rules of the parents of the searched directory apply to it
+    (tree / "pkg" / ".gitignore").write_text("*_gen.py\n")
+    (tree / "pkg" / "sub" / "deep_gen.py").touch()
+    (tree / "pkg" / "sub" / "deep_pb2.py").touch()
+
+    files = find_files([pattern], gitignore=True)
+    assert list(files) == [Path("pkg/sub/deep.py")]
+
+
+def test_absolute_pattern(tree: Path) -> None:
+    files = find_files([str(tree / "pkg" / "**" / "*.py")], exclude=["*_pb2.py"])
+    assert list(files) == [
+        tree / "pkg" / "__init__.py",
+        tree / "pkg" / "mod.py",
+        tree / "pkg" / "sub" / "deep.py",
+    ]
@@ -0,0 +1,74 @@
+import ast
+from typing import Any
+
+import pytest
+
+from typpy import (
+    register_expression_check,
+    register_expression_type,
+    register_statement_check,
+)
+from typpy.dispatch import Dispatcher
+from typpy.error import TypingError
+from typpy.expression import check_expression, get_expr_type
+from typpy.scope import Scope, parse_scope
+from typpy.statement import check_body, check_statement
+
+
+class Custom(ast.stmt):
+    """Statement of a third party, e.g. produced by a transformer."""
+
+    _fields = ("body",)
+
+
+class CustomExpr(ast.expr):
+    _fields = ()
+
+
+@pytest.fixture
+def scope(namespace: Any) -> Scope:
+    return parse_scope(namespace)
+
+
+def test_dispatcher() -> None:
+    dispatcher = Dispatcher(lambda node: "default")
+    dispatcher.register(ast.expr)(lambda node: "expr")
+    dispatcher.register(ast.Call, ast.Name)(lambda node: "call or name")
+
+    assert dispatcher.get(ast.Call)(None) == "call or name"
+    assert dispatcher.get(ast.Name)(None) == "call or name"
+    # Base classes are looked up
+    assert dispatcher.get(ast.List)(None) == "expr"
+    assert dispatcher.get(ast.Pass)(None) == "default"
+
+    # Registering again replaces the handler, of subclasses as well
+    dispatcher.register(ast.expr)(lambda node: "new expr")
+    assert dispatcher.get(ast.List)(None) == "new expr"
+    assert dispatcher.get(ast.Call)(None) == "call or name"
+
+
+def test_register_statement_check(scope: Scope) -> None:
+    @register_statement_check(Custom)
+    def check_custom(stmt: Custom, scope: Scope) -> list[TypingError]:
+        return check_body(stmt, scope)
+
+    stmt = Custom(body=ast.parse("add(1, 2)\nsub(3)").body)
+
+    errors = check_statement(stmt, scope)
+    assert [error.message for error in errors] == [
+        "Function 'add' is not defined",
+        "Function 'sub' is not defined",
+    ]
+
+
+def test_register_expression(scope: Scope) -> None:
+    @register_expression_type(CustomExpr)
+    def custom_type(expr: CustomExpr, scope: Scope) -> Any:
+        return bytes
+
+    @register_expression_check(CustomExpr)
+    def check_custom(expr: CustomExpr, scope: Scope) -> list[TypingError]:
+        return []
+
+    assert get_expr_type(CustomExpr(), scope) is bytes
+    assert check_expression(CustomExpr(), scope) == []
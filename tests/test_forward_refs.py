@@ -0,0 +1,99 @@
+import inspect
+import textwrap
+import types
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+
+from typpy import forward_refs
+from typpy.forward_refs import ForwardRefs, get_namespace
+from typpy.scope import parse_scope
+from typpy.type_checker import TypeChecker
+
+SOURCE = textwrap.dedent("""
+    from __future__ import annotations
+
+    from typing import Optional
+
+
+    class Local:
+        pass
+
+
+    def function(a: Local, b: Optional[int] = None) -> Undefined:
+        ...
+    """)
+
+
+@pytest.fixture
+def module() -> types.ModuleType:
+    module = types.ModuleType("forward_refs_module")
+    exec(compile(SOURCE, "<test>", "exec"), vars(module))
+    return module
+
+
+def test_resolve_signature(module: types.ModuleType) -> None:
+    signature = inspect.signature(module.function)
+    assert signature.parameters["a"].annotation == "Local"
+
+    resolved = ForwardRefs().resolve_signature(
+        signature, get_namespace(module.function)
+    )
+    assert resolved.parameters["a"].annotation is module.Local
+    assert resolved.parameters["b"].annotation == Optional[int]
+    # Annotations that cannot be resolved are not checked
+    assert resolved.return_annotation is Any
+
+
+def test_resolve_once(
+    module: types.ModuleType, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    evaluated = []
+
+    def _eval(source, *args):
+        evaluated.append(source)
+        return eval(source, *args)
+
+    monkeypatch.setitem(vars(forward_refs), "eval", _eval)
+
+    refs = ForwardRefs()
+    namespace = get_namespace(module)
+    assert refs.resolve("Local", namespace) is module.Local
+    assert refs.resolve("Local", namespace) is module.Local
+    assert refs.resolve(int, namespace) is int
+    assert evaluated == ["Local"]
+
+
+def test_scope_resolves_signatures(module: types.ModuleType) -> None:
+    scope = parse_scope(module)
+
+    _, signature = scope.resolve_callable("function")
+    assert signature.parameters["a"].annotation is module.Local
+    assert scope.resolve_annotation("Local") is module.Local
+
+
+def test_type_checking_import(tmp_path: Path) -> None:
+    file = tmp_path / "type_checking_module.py"
+    file.write_text(
+        "from __future__ import annotations\n"
+        "\n"
+        "from typing import TYPE_CHECKING\n"
+        "\n"
+        "if TYPE_CHECKING:\n"
+        "    from decimal import Decimal\n"
+        "\n"
+        "\n"
+        "def f(a: Decimal, b: int) -> None:\n"
+        "    pass\n"
+        "\n"
+        "\n"
+        "def g() -> None:\n"
+        "    f(1, 'b')\n"
+    )
+
+    errors = TypeChecker().check_files([file])
+    # Decimal is not defined at runtime, only the other argument is checked
+    assert [error.message for error in errors] == [
+        "Expected 'int' as argument 'b' to 'f', found 'str'"
+    ]
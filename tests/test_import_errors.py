@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from typpy.type_checker import TypeChecker
+from tests.utils import MakePackage
+
+MODULES = {
+    "valid": "def add(a: int, b: int) -> int:\n    return a + b\n",
+    "raises": "import json\n\nx = 1\nraise ValueError('broken')\n",
+    "exits": "import sys\n\nsys.exit(3)\n",
+    "syntax": "def f(:\n    pass\n",
+    "sleeps": "import time\n\ntime.sleep(30)\n",
+    "crashes": "import os\n\nos._exit(1)\n",
+    "missing": "import not_installed_dependency\n",
+    "swallows": (
+        "import time\n"
+        "\n"
+        "try:\n"
+        "    time.sleep(30)\n"
+        "except Exception:\n"
+        "    pass\n"
+    ),
+}
+
+
+@pytest.fixture
+def package_dir(make_package: MakePackage) -> Path:
+    return make_package("broken_pkg", MODULES)
+
+
+@dataclass(frozen=True)
+class ImportErrorTestCase:
+    case_id: str
+    module: str
+    line_number: int
+    message: str
+
+
+@pytest.mark.parametrize(
+    "case",
+    [
+        ImportErrorTestCase(
+            case_id="raises",
+            module="raises",
+            line_number=4,
+            message="ValueError: broken",
+        ),
+        ImportErrorTestCase(
+            case_id="exits",
+            module="exits",
+            line_number=3,
+            message="SystemExit: 3",
+        ),
+        ImportErrorTestCase(
+            case_id="syntax",
+            module="syntax",
+            line_number=1,
+            message="SyntaxError: invalid syntax",
+        ),
+        ImportErrorTestCase(
+            case_id="timeout_not_swallowed",
+            module="swallows",
+            line_number=4,
+            message="ImportTimeoutError: Import took more than 0.2 seconds",
+        ),
+        ImportErrorTestCase(
+            case_id="timeout",
+            module="sleeps",
+            line_number=3,
+            message="ImportTimeoutError: Import took more than 0.2 seconds",
+        ),
+    ],
+    ids=lambda case: case.case_id,
+)
+def test_import_error(package_dir: Path, case: ImportErrorTestCase) -> None:
+    file = package_dir / f"{case.module}.py"
+    errors = TypeChecker(import_timeout=0.2).check_files([file])
+
+    assert [(error.line_number, error.message) for error in errors] == [
+        (
+            case.line_number,
+            f"Could not import module 'broken_pkg.{case.module}': {case.message}",
+        )
+    ]
+
+
+def test_import_error_cached(
+    package_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    file = package_dir / "raises.py"
+    cache_dir = tmp_path / ".typpy_cache"
+    errors = TypeChecker(cache_dir=cache_dir).check_files([file])
+
+    def import_file(self: TypeChecker, path: Path) -> None:
+        raise AssertionError(f"{path} should not be imported")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(TypeChecker, "_import_file", import_file)
+        assert TypeChecker(cache_dir=cache_dir).check_files([file]) == errors
+
+    file.write_text("X = 1\n")
+    assert TypeChecker(cache_dir=cache_dir).check_files([file]) == []
+
+
+@pytest.mark.parametrize("module", ["sleeps", "missing"])
+def test_import_error_not_cached(
+    package_dir: Path, tmp_path: Path, module: str
+) -> None:
+    # The import can succeed later without any change to the files,
+    # once given more time or once the missing module is installed
+    file = package_dir / f"{module}.py"
+    type_checker = TypeChecker(cache_dir=tmp_path / ".typpy_cache", import_timeout=0.2)
+    assert len(type_checker.check_files([file])) == 1
+    assert type_checker.cache.get(file) is None
+
+
+def test_import_timeout_in_cache_key(package_dir: Path, tmp_path: Path) -> None:
+    file = package_dir / "valid.py"
+    cache_dir = tmp_path / ".typpy_cache"
+    TypeChecker(cache_dir=cache_dir, import_timeout=0.2).check_files([file])
+
+    assert TypeChecker(cache_dir=cache_dir, import_timeout=0.2).cache.get(file) == []
+    assert TypeChecker(cache_dir=cache_dir, import_timeout=1).cache.get(file) is None
+
+
+def test_worker_crash(package_dir: Path) -> None:
+    files = [package_dir / f"{name}.py" for name in ["valid", "crashes", "raises"]]
+    errors = TypeChecker(jobs=2).check_files(files)
+
+    assert [error.message for error in errors] == [
+        "Could not import module 'broken_pkg.crashes': the process importing it died",
+        "Could not import module 'broken_pkg.raises': ValueError: broken",
+    ]
@@ -0,0 +1,67 @@
+import sys
+import tracemalloc
+from importlib.machinery import SourceFileLoader
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from typpy import instrumentation
+from typpy.import_profiler import ImportProfiler
+from typpy.type_checker import TypeChecker
+from tests.utils import MakePackage
+
+
+@pytest.fixture
+def package_dir(make_package: MakePackage) -> Iterator[Path]:
+    yield make_package(
+        "imported_pkg",
+        {
+            "dependency": "import colorsys\n\nDATA = [0] * 1000\n",
+            "main": "from imported_pkg import dependency\n",
+        },
+    )
+    tracemalloc.stop()
+
+
+def test_nested_imports() -> None:
+    times = iter([0.0, 1.0, 2.0, 4.0, 7.0, 8.0, 9.0, 10.0])
+    profiler = ImportProfiler(memory=False)
+
+    with patch("time.perf_counter", lambda: next(times)):
+        with instrumentation.recording(profiler):
+            with instrumentation.span("file", "main.py"):
+                with instrumentation.span("module", "main"):
+                    with instrumentation.span("scope", "main"):
+                        pass
+                    with instrumentation.span("module", "dependency"):
+                        pass
+            with instrumentation.span("module", "preloaded"):
+                pass
+
+    imports = profiler.profile.imports
+    assert imports["main"].file == "main.py"
+    assert (imports["main"].seconds, imports["main"].self_seconds) == (7.0, 4.0)
+    assert imports["dependency"].file == "main.py"
+    assert imports["dependency"].seconds == 3.0
+    assert imports["preloaded"].file is None
+    assert [i.module for i in profiler.profile.heaviest(2)] == ["main", "dependency"]
+
+
+def test_profile_imports(package_dir: Path) -> None:
+    sys.modules.pop("colorsys", None)
+    main = package_dir / "main.py"
+    with instrumentation.recording(ImportProfiler()) as profiler:
+        TypeChecker().check_files([main])
+
+    imports = profiler.profile.imports
+    assert {"imported_pkg.main", "imported_pkg.dependency", "colorsys"} <= set(imports)
+    assert imports["colorsys"].file == str(main)
+    assert imports["imported_pkg.dependency"].memory > 0
+    assert "Heaviest imports" in profiler.profile.format()
+
+    # The modules keep their own loader
+    dependency = sys.modules["imported_pkg.dependency"]
+    assert isinstance(dependency.__loader__, SourceFileLoader)
+    assert isinstance(dependency.__spec__.loader, SourceFileLoader)
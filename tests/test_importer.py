@@ -0,0 +1,105 @@
+import importlib
+import sys
+from importlib.machinery import PathFinder
+from pathlib import Path
+
+import pytest
+
+from typpy.importer import ModuleFinder
+from typpy.type_checker import TypeChecker
+from tests.utils import MakePackage
+
+
+@pytest.fixture
+def package_dir(make_package: MakePackage) -> Path:
+    package_dir = make_package(
+        "finder_pkg",
+        {
+            "unchecked": "VALUE = 1\n",
+            "main": (
+                "from finder_pkg.unchecked import VALUE\n"
+                "from finder_sibling import add\n"
+                "\n"
+                "if __name__ == '__main__':\n"
+                "    add(1, 'b')\n"
+            ),
+        },
+    )
+    (package_dir.parent / "finder_sibling.py").write_text(
+        "def add(a: int, b: int) -> int:\n    return a + b\n"
+    )
+    return package_dir
+
+
+def test_module_finder(package_dir: Path) -> None:
+    finder = ModuleFinder()
+    main = package_dir / "main.py"
+    assert finder.add_file(main) == "finder_pkg.main"
+    assert finder.modules == {
+        "finder_pkg": str(package_dir / "__init__.py"),
+        "finder_pkg.main": str(main),
+    }
+
+    meta_path = list(sys.meta_path)
+    path = list(sys.path)
+    with finder.installed():
+        with finder.installed():
+            # Before sys.path, after the builtin and frozen modules
+            assert sys.meta_path[sys.meta_path.index(PathFinder) - 1] is finder
+            assert len(sys.meta_path) == len(meta_path) + 2
+
+            module = importlib.import_module("finder_pkg.main")
+
+        # Still installed in the outer context
+        assert finder in sys.meta_path
+
+    assert module.__file__ == str(main)
+    assert sys.modules["finder_pkg"].__path__ == [str(package_dir)]
+    assert sys.modules["finder_sibling"].__file__ == str(
+        package_dir.parent / "finder_sibling.py"
+    )
+    assert sys.meta_path == meta_path
+    assert sys.path == path
+
+
+def test_module_finder_unknown_module(package_dir: Path) -> None:
+    finder = ModuleFinder()
+    finder.add_file(package_dir / "main.py")
+    with finder.installed(), pytest.raises(ModuleNotFoundError):
+        importlib.import_module("finder_missing")
+
+
+def test_check_without_sys_path(package_dir: Path) -> None:
+    path = list(sys.path)
+    errors = TypeChecker().check_files([package_dir / "main.py"])
+    assert [error.message for error in errors] == [
+        "Expected 'int' as argument 'b' to 'add', found 'str'"
+    ]
+    assert sys.path == path
+
+
+def test_stdlib_name(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    file = tmp_path / "code.py"
+    file.write_text("def f(a: int) -> None:\n    pass\n\n\nf('a')\n")
+    # The checked module replaces the one of the standard library,
+    # which is restored at the end of the test
+    monkeypatch.setitem(sys.modules, "code", None)
+    monkeypatch.delitem(sys.modules, "code")
+
+    [error] = TypeChecker().check_files([file])
+    assert error.message == "Expected 'int' as argument 'a' to 'f', found 'str'"
+    assert sys.modules["code"].__file__ == str(file)
+
+
+def test_stdlib_name_imported(tmp_path: Path) -> None:
+    import fractions
+
+    file = tmp_path / "fractions.py"
+    file.write_text("x: int = 'a'\n")
+
+    [error] = TypeChecker().check_files([file])
+    assert error.message == (
+        "Could not import module 'fractions': ImportError: "
+        "the module of the standard library with the same name is imported"
+    )
+    assert sys.modules["fractions"] is fractions
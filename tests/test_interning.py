@@ -0,0 +1,83 @@
+import ast
+from pathlib import Path
+from typing import Any, Iterator, Literal, Optional, Union
+
+import pytest
+
+from typpy.expression.expr_type import get_expr_type
+from typpy.interning import clear_interned, intern_type, interned_count, make_union
+from typpy.scope import Scope, parse_scope
+from typpy.type_checker import TypeChecker
+
+
+@pytest.fixture(autouse=True)
+def interned() -> Iterator[None]:
+    clear_interned()
+    yield
+    clear_interned()
+
+
+@pytest.fixture
+def scope(namespace: Any) -> Scope:
+    return parse_scope(namespace)
+
+
+@pytest.mark.parametrize(
+    "types, expected",
+    [
+        ([int], int),
+        ([int, int], int),
+        ([str, int], Union[int, str]),
+        ([Union[int, str], float], Union[float, int, str]),
+        ([Optional[int], str], Union[None, int, str]),
+    ],
+)
+def test_make_union(types: list, expected: Any) -> None:
+    assert make_union(types) == expected
+
+
+def test_union_order() -> None:
+    union = make_union([int, str, float])
+
+    assert union.__args__ == (float, int, str)
+    assert make_union([str, float, int]) is union
+    assert make_union([Union[str, int], float]) is union
+
+
+def test_union_order_independent_of_interned() -> None:
+    # Equal to Union[int, str], but not the same structure
+    intern_type(Union[str, int])
+
+    assert make_union([int, str]).__args__ == (int, str)
+
+
+def test_intern_type() -> None:
+    assert intern_type(list[int]) is intern_type(list[int])
+    assert intern_type(int) is int
+    # Equal values of different types
+    assert intern_type(Literal[1]) is not intern_type(Literal[True])
+
+
+def test_interned_cleared_after_run(tmp_path: Path) -> None:
+    file = tmp_path / "literals.py"
+    file.write_text("x = [1, 'a']\n")
+    TypeChecker().check_files([file])
+
+    assert interned_count() == 0
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "[1, 2, 3]",
+        "['a', 1]",
+        "{'a': 1, 'b': 'c'}",
+        "{1, 2.0}",
+        "(1, 'a')",
+    ],
+)
+def test_literal_types_are_interned(scope: Scope, code: str) -> None:
+    first = get_expr_type(ast.parse(code).body[0].value, scope)
+    second = get_expr_type(ast.parse(code).body[0].value, scope)
+
+    assert first is second
@@ -5,7 +5,7 @@ from typing import Type, Optional, Union, Any
 
 import pytest
 
-from typpy.is_subtype import is_subtype
+from typpy.is_subtype import is_subtype, subtype_cache_info, clear_subtype_cache
 from typpy.format import fmt_type
 from tests.utils import if_py
 
@@ -70,3 +70,30 @@ class IsSubtypeTestCase:
 )
 def test_is_subtype(case: IsSubtypeTestCase):
     assert is_subtype(case.actual, case.expected) == case.result
+
+
+def test_is_subtype_cache() -> None:
+    clear_subtype_cache()
+
+    assert is_subtype(int, Optional[int])
+    info = subtype_cache_info()
+    # The union members are checked through the cache as well
+    assert (info.hits, info.misses) == (0, 2)
+
+    assert is_subtype(int, Optional[int])
+    info = subtype_cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+
+
+def test_is_subtype_unhashable() -> None:
+    class UnhashableMeta(type):
+        __hash__ = None
+
+    class Unhashable(metaclass=UnhashableMeta):
+        pass
+
+    clear_subtype_cache()
+
+    assert is_subtype(Unhashable, Unhashable)
+    assert not is_subtype(Unhashable, int)
+    assert subtype_cache_info().unhashable == 2
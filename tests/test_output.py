@@ -0,0 +1,29 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from typpy.error import TypingError
+from typpy.output import print_errors
+
+
+def test_print_errors_streamed(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    files = [tmp_path / "a.py", tmp_path / "b.py"]
+    for file in files:
+        file.write_text("x: int = 'x'\n")
+
+    def errors() -> Iterator[TypingError]:
+        for file in files:
+            yield TypingError(file, 1, 9, 12, "Wrong type", "found 'str'")
+            # Errors are printed before the next ones are produced
+            assert str(file) in capsys.readouterr().err
+
+    assert print_errors(errors()) == 2
+
+    out = capsys.readouterr().out
+    assert "Found 2 errors in 2 files" in out
+
+
+def test_print_no_errors(capsys: pytest.CaptureFixture) -> None:
+    assert print_errors(iter([])) == 0
+    assert capsys.readouterr().out == ""
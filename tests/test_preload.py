@@ -0,0 +1,65 @@
+import gc
+import sys
+from pathlib import Path
+
+import pytest
+
+from typpy.__main__ import type_check
+from typpy.preload import find_common_imports, get_fork_context, preload_modules
+from typpy.type_checker import TypeChecker
+
+
+def test_find_common_imports(tmp_path: Path) -> None:
+    package_dir = tmp_path / "preload_pkg"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").touch()
+    (package_dir / "a.py").write_text(
+        "from __future__ import annotations\n"
+        "import json, os.path\n"
+        "from collections import OrderedDict\n"
+        "from . import b\n"
+        "from preload_pkg import c\n"
+        "\n"
+        "def f():\n"
+        "    import json\n"
+    )
+    (package_dir / "b.py").write_text("import json\nimport os.path\n")
+    (package_dir / "c.py").write_text("import json\n")
+    (package_dir / "d.py").write_text("import invalid syntax\n")
+
+    files = sorted(package_dir.glob("*.py"))
+    assert find_common_imports(files, top=2) == ["json", "os.path"]
+    assert find_common_imports(files, top=5) == ["json", "os.path", "collections"]
+
+
+def test_preload_modules() -> None:
+    assert preload_modules(["json", "typpy_missing_module"]) == ["json"]
+    assert "json" in sys.modules
+
+
+@pytest.mark.skipif(get_fork_context() is None, reason="Processes cannot be forked")
+def test_check_preloaded(cases_dir: Path) -> None:
+    files = [
+        cases_dir / "function" / "function.py",
+        cases_dir / "resolver" / "pkg" / "mod.py",
+        cases_dir / "resolver" / "outer.py",
+    ]
+
+    errors = TypeChecker().check_files(files)
+    preloaded_errors = TypeChecker(jobs=2, preload=["decimal"]).check_files(files)
+    assert preloaded_errors == errors
+    assert "decimal" in sys.modules
+    # Objects are frozen only while the workers are forked
+    assert gc.get_freeze_count() == 0
+
+
+@pytest.mark.skipif(get_fork_context() is None, reason="Processes cannot be forked")
+def test_type_check_preloaded(cases_dir: Path) -> None:
+    patterns = [
+        str(cases_dir / "function" / "function.py"),
+        str(cases_dir / "resolver"),
+    ]
+
+    errors = type_check(patterns)
+    assert type_check(patterns, jobs=2, preload=["fractions"]) == errors
+    assert "fractions" in sys.modules
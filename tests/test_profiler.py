@@ -0,0 +1,51 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from typpy import instrumentation
+from typpy.profiler import Profiler
+from typpy.type_checker import TypeChecker
+
+
+def test_nested_spans() -> None:
+    times = iter([0.0, 1.0, 2.0, 4.0, 7.0, 8.0])
+    profiler = Profiler()
+
+    with patch("time.perf_counter", lambda: next(times)):
+        with instrumentation.recording(profiler):
+            with instrumentation.span("scope", "module"):
+                with instrumentation.span("import", "dependency"):
+                    pass
+                with instrumentation.span("scope", "module.function"):
+                    instrumentation.count("event")
+
+    profile = profiler.profile
+    assert profile.phases == {"import": 1.0, "scope": 7.0}
+    # Only files and scopes are reported by name
+    assert profile.spans == {"scope": {"module": 5.0, "module.function": 3.0}}
+    assert profile.counts == {"event": 1}
+
+
+def test_disabled() -> None:
+    assert instrumentation.get_recorder() is None
+    with instrumentation.span("scope", "module"):
+        instrumentation.count("event")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_profile_check(cases_dir: Path, jobs: int) -> None:
+    files = [
+        cases_dir / "function" / "function.py",
+        cases_dir / "resolver" / "outer.py",
+    ]
+
+    with instrumentation.recording(Profiler()) as profiler:
+        TypeChecker(jobs=jobs).check_files(files)
+
+    profile = profiler.profile
+    assert {"file", "import", "parse", "scope"} <= set(profile.phases)
+    assert set(profile.spans["file"]) == {str(file) for file in files}
+    assert "function.add" in profile.spans["scope"]
+    assert profile.counts["is_subtype"] == 4
+    assert "Slowest scopes" in profile.format()
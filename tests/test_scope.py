@@ -0,0 +1,110 @@
+import textwrap
+import types
+
+import pytest
+
+from typpy import scope as scope_module
+from typpy.scope import parse_scope
+
+SOURCE = textwrap.dedent("""
+    import math
+
+    value = 1
+
+
+    def used(a: int) -> int:
+        return a
+
+
+    def unused(b: str) -> str:
+        return b
+
+
+    class Class:
+        def method(self):
+            ...
+    """)
+
+
+@pytest.fixture
+def module() -> types.ModuleType:
+    module = types.ModuleType("scope_module")
+    exec(compile(SOURCE, "<test>", "exec"), vars(module))
+    return module
+
+
+@pytest.fixture
+def signatures(monkeypatch: pytest.MonkeyPatch) -> list:
+    computed = []
+    get_signature = scope_module.get_signature
+
+    def _get_signature(obj):
+        computed.append(obj)
+        return get_signature(obj)
+
+    monkeypatch.setattr(scope_module, "get_signature", _get_signature)
+    return computed
+
+
+def test_signatures_computed_on_lookup(
+    module: types.ModuleType, signatures: list
+) -> None:
+    scope = parse_scope(module)
+    assert signatures == []
+
+    obj, signature = scope.resolve_callable("used")
+    assert obj is module.used
+    assert list(signature.parameters) == ["a"]
+    assert signatures == [module.used]
+
+    # Lookups are memoized
+    scope.resolve_callable("used")
+    assert signatures == [module.used]
+
+
+@pytest.mark.parametrize("name", ["value", "undefined"])
+def test_not_callable(module: types.ModuleType, signatures: list, name: str) -> None:
+    scope = parse_scope(module)
+
+    assert scope.resolve_callable(name) == (None, None)
+    assert scope.resolve_callable(name) == (None, None)
+    assert signatures == []
+
+
+def test_parent_lookup(module: types.ModuleType) -> None:
+    scope = parse_scope(module.Class, parse_scope(module))
+
+    obj, _ = scope.resolve_callable("used")
+    assert obj is module.used
+
+    obj, _ = scope.resolve_callable("len")
+    assert obj is len
+
+
+def test_binding_plan_shared(module: types.ModuleType, signatures: list) -> None:
+    module_scope = parse_scope(module)
+    class_scope = parse_scope(module.Class, module_scope)
+
+    obj, plan = class_scope.resolve_binding_plan("used")
+    assert obj is module.used
+    assert plan.keywords == {"a": 0}
+    assert plan.annotations == (int,)
+    assert plan.required == (0,)
+
+    # Compiled once, in the scope defining the callable
+    assert module_scope.resolve_binding_plan("used") == (module.used, plan)
+    assert class_scope.resolve_binding_plan("used")[1] is plan
+    assert signatures == [module.used]
+
+    assert module_scope.resolve_binding_plan("value") == (None, None)
+
+
+def test_iter_callables(module: types.ModuleType, signatures: list) -> None:
+    scope = parse_scope(module)
+
+    assert dict(scope.iter_callables()) == {
+        "used": module.used,
+        "unused": module.unused,
+        "Class": module.Class,
+    }
+    assert signatures == []
@@ -0,0 +1,120 @@
+import inspect
+import json
+import os.path
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from typpy import signatures
+from typpy.signatures import (
+    SignatureCache,
+    SignatureDatabase,
+    get_signature,
+    get_signature_cache,
+    save_signature_database,
+    set_signature_database,
+)
+
+
+@pytest.fixture
+def database_path(tmp_path: Path) -> Iterator[Path]:
+    database_path = tmp_path / "signatures.pickle"
+    set_signature_database(SignatureDatabase(database_path))
+    # Each test is a new run
+    get_signature_cache().clear()
+    yield database_path
+    set_signature_database(SignatureDatabase(None))
+    get_signature_cache().clear()
+
+
+@pytest.fixture
+def signature_calls(monkeypatch: pytest.MonkeyPatch) -> list:
+    calls = []
+    original_signature = inspect.signature
+
+    def signature(obj):
+        calls.append(obj)
+        return original_signature(obj)
+
+    monkeypatch.setattr(signatures.inspect, "signature", signature)
+    return calls
+
+
+def test_signature_database(database_path: Path, signature_calls: list) -> None:
+    expected = [inspect.signature(os.path.join), inspect.signature(len)]
+    signature_calls.clear()
+
+    assert [get_signature(os.path.join), get_signature(len)] == expected
+    assert signature_calls == [os.path.join, len]
+    signature_calls.clear()
+
+    save_signature_database()
+    assert database_path.exists()
+
+    # A new run reads the signatures from the database
+    set_signature_database(SignatureDatabase(database_path))
+    assert [get_signature(os.path.join), get_signature(len)] == expected
+    assert signature_calls == []
+
+
+def test_signature_database_failure(database_path: Path) -> None:
+    # Some builtins do not have a signature
+    with pytest.raises(ValueError):
+        get_signature(next)
+
+    save_signature_database()
+    set_signature_database(SignatureDatabase(database_path))
+    with pytest.raises(ValueError):
+        get_signature(next)
+
+
+def test_signature_database_corrupted(database_path: Path) -> None:
+    database_path.write_text(json.dumps({}))
+    assert get_signature(len) == inspect.signature(len)
+
+
+def test_not_stdlib(database_path: Path) -> None:
+    def function(a: int) -> int:
+        return a
+
+    assert get_signature(function) == inspect.signature(function)
+    assert get_signature(pytest.raises) == inspect.signature(pytest.raises)
+
+    save_signature_database()
+    assert not database_path.exists()
+
+
+class CallableWithSlots:
+    __slots__ = ()
+
+    def __call__(self, a: int) -> int:
+        return a
+
+
+def test_signature_cache(database_path: Path, signature_calls: list) -> None:
+    def function(a: int) -> int:
+        return a
+
+    cache = get_signature_cache()
+    assert get_signature(function) is get_signature(function)
+    assert signature_calls == [function]
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    # Objects that cannot be weakly referenced are not kept
+    callable_object = CallableWithSlots()
+    get_signature(callable_object)
+    get_signature(callable_object)
+    assert cache.stats() == {"hits": 1, "misses": 3, "size": 1}
+
+
+def test_signature_cache_invalidation() -> None:
+    def function(a: int) -> int:
+        return a
+
+    cache = SignatureCache()
+    cache.set(function, inspect.signature(function))
+    assert cache.get(function) == inspect.signature(function)
+
+    del function
+    assert len(cache) == 0
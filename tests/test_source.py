@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from typpy.error import TypingError
+from typpy.output import print_errors
+from typpy.source import SourceCache, SourceFile
+
+
+@dataclass(frozen=True)
+class LineTestCase:
+    data: bytes
+    lines: list[str]
+
+
+@pytest.mark.parametrize(
+    "case",
+    [
+        LineTestCase(data=b"a = 1\nb = 2\n", lines=["a = 1", "b = 2", ""]),
+        LineTestCase(data=b"a = 1\nb = 2", lines=["a = 1", "b = 2"]),
+        LineTestCase(data=b"a = 1\r\nb = 2\r\n", lines=["a = 1", "b = 2", ""]),
+        LineTestCase(data=b"", lines=[""]),
+        LineTestCase(
+            data="# -*- coding: latin-1 -*-\ns = 'é'\n".encode("latin-1"),
+            lines=["# -*- coding: latin-1 -*-", "s = 'é'", ""],
+        ),
+    ],
+)
+def test_line(case: LineTestCase) -> None:
+    source = SourceFile(Path("file.py"), case.data)
+
+    lines = [source.line(line_number + 1) for line_number in range(len(case.lines))]
+    assert lines == case.lines
+    assert source.text.split("\n") == case.lines
+
+
+def test_file_read_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    file = tmp_path / "file.py"
+    file.write_text("a = 1\nb: int = 'b'\nc: int = 'c'\n")
+
+    read = []
+    read_bytes = Path.read_bytes
+
+    def _read_bytes(path: Path) -> bytes:
+        read.append(path)
+        return read_bytes(path)
+
+    monkeypatch.setattr(Path, "read_bytes", _read_bytes)
+
+    sources = SourceCache()
+    errors = [
+        TypingError(file, line_number, 0, None, "error") for line_number in (2, 3)
+    ]
+    print_errors(errors, sources=sources)
+
+    assert sources.get(tmp_path / "." / "file.py").line(3) == "c: int = 'c'"
+    assert read == [file]
@@ -0,0 +1,128 @@
+import ast
+import inspect
+import sys
+from pathlib import Path
+
+import pytest
+
+from typpy.importer import ModuleFinder
+from typpy.scope import Unknown
+from typpy.static_scope import StaticFunction, StaticModuleBuilder
+from typpy.type_checker import TypeChecker
+from tests.utils import MakePackage
+
+MODULES = {
+    "helpers": (
+        "import os\n"
+        "\n"
+        "LIMIT = 10\n"
+        "\n"
+        "\n"
+        "def scale(value: int, factor: float = 2.0) -> float:\n"
+        "    return value * factor\n"
+        "\n"
+        "\n"
+        "class Point:\n"
+        "    def __init__(self, x: int, y: int):\n"
+        "        pass\n"
+    ),
+    "main": (
+        "import functools\n"
+        "\n"
+        "from side_pkg.helpers import scale, Point\n"
+        "from not_installed_dependency import magic\n"
+        "\n"
+        "\n"
+        "@functools.lru_cache\n"
+        "def cached(value: int) -> int:\n"
+        "    return value\n"
+        "\n"
+        "\n"
+        "def run() -> None:\n"
+        "    a = scale('a')\n"
+        "    b = Point(1, 2)\n"
+        "    c = magic(1, 2, 3)\n"
+        "    d = cached('a')\n"
+    ),
+    "side_effect": (
+        "raise RuntimeError('imported')\n"
+        "\n"
+        "\n"
+        "def add(a: int, b: int) -> int:\n"
+        "    return a + b\n"
+        "\n"
+        "\n"
+        "def run() -> None:\n"
+        "    a = add(1, 'b')\n"
+    ),
+}
+
+
+@pytest.fixture
+def package_dir(make_package: MakePackage) -> Path:
+    return make_package("side_pkg", MODULES)
+
+
+def _messages(errors: list) -> list[tuple[int, str]]:
+    return sorted((error.line_number, error.message) for error in errors)
+
+
+def test_static_matches_import(package_dir: Path) -> None:
+    file = package_dir / "helpers.py"
+    static_errors = TypeChecker(import_mode="static").check_files([file])
+    import_errors = TypeChecker().check_files([file])
+
+    assert _messages(static_errors) == _messages(import_errors)
+
+
+def test_static_does_not_run_module(package_dir: Path) -> None:
+    errors = TypeChecker(import_mode="static").check_files(
+        [package_dir / "side_effect.py"]
+    )
+
+    assert "side_pkg.side_effect" not in sys.modules
+    assert len(errors) == 1
+    assert errors[0].line_number == 9
+
+
+def test_fallback_keeps_import_error(package_dir: Path) -> None:
+    errors = TypeChecker(import_mode="fallback").check_files(
+        [package_dir / "side_effect.py"]
+    )
+
+    assert [error.line_number for error in errors] == [1, 9]
+    assert errors[0].message.startswith(
+        "Could not import module 'side_pkg.side_effect': RuntimeError: imported"
+    )
+
+
+def test_unknown_calls_are_not_checked(package_dir: Path) -> None:
+    errors = TypeChecker(import_mode="static").check_files([package_dir / "main.py"])
+
+    # Only the call to the undecorated function defined in the package
+    assert [error.line_number for error in errors] == [13]
+
+
+def test_static_module(package_dir: Path) -> None:
+    finder = ModuleFinder()
+    main_file = package_dir / "main.py"
+    finder.add_file(main_file)
+    builder = StaticModuleBuilder(finder, lambda file: _parse(Path(file)))
+    main = builder.build(main_file)
+
+    assert isinstance(main.scale, StaticFunction)
+    assert str(inspect.signature(main.scale)) == (
+        "(value: int, factor: float = 2.0) -> float"
+    )
+    assert str(inspect.signature(main.Point)) == "(x: int, y: int)"
+    assert isinstance(main.magic, Unknown)
+    assert isinstance(main.cached, Unknown)
+    assert builder.dependencies("side_pkg.main") == [
+        str(package_dir / "__init__.py"),
+        str(package_dir / "helpers.py"),
+    ]
+    assert "side_pkg.helpers" not in sys.modules
+
+
+def _parse(path: Path) -> ast.Module:
+    return ast.parse(path.read_text())
@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from typpy import instrumentation
+from typpy.instrumentation import RecorderGroup
+from typpy.profiler import Profiler
+from typpy.tracer import Tracer
+from typpy.type_checker import TypeChecker
+
+
+@pytest.fixture
+def files(cases_dir: Path) -> list[Path]:
+    return [cases_dir / "function" / "function.py", cases_dir / "resolver" / "outer.py"]
+
+
+def test_trace(files: list[Path], tmp_path: Path) -> None:
+    with instrumentation.recording(Tracer()) as tracer:
+        TypeChecker().check_files(files)
+
+    categories = {event.category for event in tracer.events}
+    assert {"file", "import", "parse", "scope", "statement", "call"} <= categories
+
+    tracer.write(tmp_path / "trace.json")
+    trace_events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert len(trace_events) == len(tracer.events)
+    assert {event["ph"] for event in trace_events} == {"X"}
+    assert min(event["ts"] for event in trace_events) == 0
+
+    tracer.write(tmp_path / "trace.txt", "collapsed")
+    stacks = (tmp_path / "trace.txt").read_text().splitlines()
+    call_stack = ";".join(
+        [
+            f"file {files[0]}",
+            "scope function",
+            "statement If line 15",
+            "statement Assign line 16",
+            "call add() line 16",
+        ]
+    )
+    assert any(line.startswith(f"{call_stack} ") for line in stacks)
+
+
+def test_trace_parallel(files: list[Path]) -> None:
+    recorder = RecorderGroup([Profiler(), Tracer()])
+    with instrumentation.recording(recorder):
+        TypeChecker(jobs=2).check_files(files)
+
+    profiler, tracer = recorder.recorders
+    assert profiler.profile.counts["is_subtype"] == 4
+
+    file_events = [event for event in tracer.events if event.category == "file"]
+    assert sorted(event.name for event in file_events) == sorted(map(str, files))
+    assert len({event.process_id for event in file_events}) == 2
@@ -4,7 +4,8 @@ import ast
 import sys
 import inspect
 from dataclasses import dataclass, field
-from typing import TypeVar, Any
+from pathlib import Path
+from typing import Callable, Dict, TypeVar, Any
 
 import pytest
 
@@ -41,6 +42,9 @@ class CheckTestCase:
 
 T = TypeVar("T")
 
+# Writes a package of modules by name, see the make_package fixture
+MakePackage = Callable[[str, Dict[str, str]], Path]
+
 
 def parametrize_case(*cases: CheckTestCase):
     def decorator(func: T) -> T:
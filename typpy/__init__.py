@@ -1,5 +1,15 @@
 """All symbols exported by this module are considered public API."""
 
 from .__main__ import run, type_check
+from .expression import register_expression_check, register_expression_type
+from .statement import register_statement_check
+from .version import __version__
 
-__all__ = ["run", "type_check"]
+__all__ = [
+    "run",
+    "type_check",
+    "register_expression_check",
+    "register_expression_type",
+    "register_statement_check",
+    "__version__",
+]
@@ -1,12 +1,28 @@
+import json
 import os
 import sys
 import logging
+import time
 from argparse import ArgumentParser, RawDescriptionHelpFormatter
-from typing import List
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Union
 from dataclasses import dataclass
 
-from typpy.discover_files import find_files
+from typpy import instrumentation
+from typpy.cache import DEFAULT_CACHE_DIR
+from typpy.daemon import (
+    DEFAULT_SOCKET_PATH,
+    Daemon,
+    iter_check_with_daemon,
+    stop_daemon,
+)
+from typpy.discover_files import DEFAULT_EXCLUDES, find_files
+from typpy.import_profiler import ImportProfile, ImportProfiler
 from typpy.output import print_errors
+from typpy.preload import find_common_imports
+from typpy.profiler import Profile, Profiler
+from typpy.tracer import TRACE_FORMATS, Tracer
+from typpy.source import SourceCache
 from typpy.type_checker import TypeChecker
 from typpy.error import TypingError
 
@@ -16,14 +32,52 @@ def run(args: List[str] = None) -> None:
     logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
 
     args = args or sys.argv
+    if args[1:2] == ["daemon"]:
+        _run_daemon(_parse_daemon_args(args[2:]))
+        return
+
     options = _parse_args(args[1:])
 
-    files = list(find_files(options.patterns))
-    type_checker = TypeChecker()
-    errors = type_checker.check_files(files)
+    profiler = Profiler() if options.profile else None
+    import_profiler = ImportProfiler() if options.profile_imports else None
+    tracer = Tracer() if options.trace is not None else None
+    recorder = instrumentation.group_recorders(
+        [
+            recorder
+            for recorder in [profiler, import_profiler, tracer]
+            if recorder is not None
+        ]
+    )
+
+    start = time.perf_counter()
+    with instrumentation.recording(recorder):
+        files = list(
+            find_files(
+                options.patterns,
+                exclude=options.exclude,
+                default_excludes=options.default_excludes,
+                gitignore=options.gitignore,
+            )
+        )
+        sources = SourceCache()
+        # Errors are printed as soon as each file is checked
+        num_errors = print_errors(
+            _check_files(files, options, sources),
+            print_context=options.print_context,
+            sources=sources,
+        )
 
-    if errors:
-        print_errors(errors, print_context=options.print_context)
+    if profiler is not None:
+        profiler.profile.wall_time = time.perf_counter() - start
+        _report_profile(profiler.profile, options.profile_output)
+
+    if import_profiler is not None:
+        _report_profile(import_profiler.profile, options.profile_imports_output)
+
+    if tracer is not None:
+        tracer.write(options.trace, options.trace_format)
+
+    if num_errors:
         sys.exit(1)
 
     print(f"No issues found in {len(files)} files")
@@ -32,7 +86,24 @@ def run(args: List[str] = None) -> None:
 @dataclass(frozen=True)
 class Options:
     patterns: List[str]
+    exclude: List[str]
+    default_excludes: bool
+    gitignore: bool
     print_context: bool
+    jobs: int
+    cache_dir: Optional[Path]
+    daemon: bool
+    socket_path: Path
+    profile: bool
+    profile_output: Optional[Path]
+    profile_imports: bool
+    profile_imports_output: Optional[Path]
+    trace: Optional[Path]
+    trace_format: str
+    preload: List[str]
+    preload_auto: int
+    import_timeout: Optional[float]
+    import_mode: str
 
 
 def _parse_args(args: List[str]) -> Options:
@@ -42,9 +113,12 @@ def _parse_args(args: List[str]) -> Options:
             "Type check python source files.\n\n"
             "Pass in a list of wildcard patterns matching \n"
             "the source files that you want to type check:\n\n"
-            "$ typpy src/**/*.py tests/**/*.py"
+            "$ typpy src/**/*.py tests/**/*.py\n\n"
+            "Arguments can also be read from a file, one per line:\n\n"
+            "$ typpy @arguments.txt"
         ),
         formatter_class=RawDescriptionHelpFormatter,
+        fromfile_prefix_chars="@",
     )
 
     parser.add_argument(
@@ -55,9 +129,35 @@ def _parse_args(args: List[str]) -> Options:
             "Wildcard pattern matching source files to type check. "
             "Can contain '*' to indicate any character sequence, "
             "and '**' to indicate any folder structure. "
-            "Multiple patterns can be passed in."
+            "Directories are searched recursively. "
+            "Multiple patterns can be passed in. "
+            "Pass '-' to read patterns from stdin, one per line."
         ),
     )
+    parser.add_argument(
+        "--exclude",
+        metavar="PATTERN",
+        action="append",
+        default=[],
+        help=(
+            "Wildcard pattern of files and directories not to check. "
+            "Patterns without '/' match file and directory names, "
+            "the others whole paths. Can be passed multiple times."
+        ),
+    )
+    parser.add_argument(
+        "--no-default-excludes",
+        action="store_true",
+        help=(
+            "Also check files in directories skipped by default "
+            f"({', '.join(DEFAULT_EXCLUDES)})."
+        ),
+    )
+    parser.add_argument(
+        "--gitignore",
+        action="store_true",
+        help="Do not check files ignored by .gitignore files.",
+    )
     parser.add_argument(
         "--no-context",
         action="store_true",
@@ -66,18 +166,309 @@ def _parse_args(args: List[str]) -> Options:
             "occurred in the code). "
         ),
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        metavar="N",
+        type=int,
+        default=1,
+        help=(
+            "Number of processes type checking files in parallel. "
+            "Pass 0 to use one process per CPU."
+        ),
+    )
+    import_mode = parser.add_mutually_exclusive_group()
+    import_mode.add_argument(
+        "--no-import",
+        action="store_true",
+        help=(
+            "Do not import the checked modules: find their functions, "
+            "classes and imports from their source, without running any "
+            "of their code. Decorated functions and classes, and modules "
+            "outside of the checked packages and the standard library, "
+            "are not checked."
+        ),
+    )
+    import_mode.add_argument(
+        "--static-fallback",
+        action="store_true",
+        help=(
+            "Check modules failing to import (or to import in time) "
+            "from their source, as with --no-import."
+        ),
+    )
+    parser.add_argument(
+        "--import-timeout",
+        metavar="SECONDS",
+        type=float,
+        help=(
+            "Interrupt the import of a checked module after some seconds. "
+            "Modules failing to import are reported as errors, and are "
+            "not imported again until they or their dependencies change."
+        ),
+    )
+    parser.add_argument(
+        "--preload",
+        metavar="MODULE",
+        action="append",
+        default=[],
+        help=(
+            "Module imported once before starting the processes checking "
+            "files in parallel, which are forked to inherit it instead of "
+            "importing it again. Can be passed multiple times."
+        ),
+    )
+    parser.add_argument(
+        "--preload-auto",
+        metavar="N",
+        type=int,
+        default=0,
+        help=(
+            "Also preload the N modules imported by the most checked files, "
+            "excluding the checked packages."
+        ),
+    )
+    _add_cache_args(parser)
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help=(
+            "Send the files to a running typpy daemon (started with "
+            "'typpy daemon'), which keeps imported modules in memory "
+            "between runs. Falls back to checking the files directly "
+            "if no daemon is running."
+        ),
+    )
+    _add_socket_arg(parser)
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Print the time spent in each phase of the check, the slowest "
+            "files and scopes, and how often the hot functions are called."
+        ),
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="FILE",
+        type=Path,
+        help="Write the profile to a JSON file instead of printing it.",
+    )
+    parser.add_argument(
+        "--profile-imports",
+        action="store_true",
+        help=(
+            "Print the time and memory of the heaviest module imports, "
+            "including the ones of dependencies, and the checked file "
+            "importing them first."
+        ),
+    )
+    parser.add_argument(
+        "--profile-imports-output",
+        metavar="FILE",
+        type=Path,
+        help="Write the import profile to a JSON file instead of printing it.",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        type=Path,
+        help=(
+            "Write a trace of each file, import, scope, statement "
+            "and call checked, to be opened in a trace viewer."
+        ),
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=TRACE_FORMATS,
+        default="chrome",
+        help=(
+            "Format of the trace: Chrome trace events (JSON), or collapsed "
+            "stacks for flame graph tools (default: chrome)."
+        ),
+    )
 
     ns = parser.parse_args(args)
+    if ns.no_import and (ns.preload or ns.preload_auto):
+        parser.error("--preload and --preload-auto import modules, unlike --no-import")
+
     return Options(
-        patterns=ns.patterns,
+        patterns=_read_patterns(ns.patterns),
+        exclude=ns.exclude,
+        default_excludes=not ns.no_default_excludes,
+        gitignore=ns.gitignore,
         print_context=not ns.no_context,
+        jobs=ns.jobs,
+        cache_dir=None if ns.no_cache else ns.cache_dir,
+        daemon=ns.daemon,
+        socket_path=ns.socket,
+        profile=ns.profile or ns.profile_output is not None,
+        profile_output=ns.profile_output,
+        profile_imports=ns.profile_imports or ns.profile_imports_output is not None,
+        profile_imports_output=ns.profile_imports_output,
+        trace=ns.trace,
+        trace_format=ns.trace_format,
+        preload=ns.preload,
+        preload_auto=ns.preload_auto,
+        import_timeout=ns.import_timeout,
+        import_mode=(
+            "static" if ns.no_import else "fallback" if ns.static_fallback else "import"
+        ),
     )
 
 
-def type_check(patterns: List[str]) -> List[TypingError]:
+def _read_patterns(patterns: List[str]) -> List[str]:
+    read_patterns = []
+    for pattern in patterns:
+        if pattern == "-":
+            read_patterns.extend(line.strip() for line in sys.stdin if line.strip())
+        else:
+            read_patterns.append(pattern)
+
+    return read_patterns
+
+
+def _add_cache_args(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=(
+            "Directory where results are cached between runs, "
+            "so that unchanged files are not checked again "
+            f"(default: {DEFAULT_CACHE_DIR})."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write cached results.",
+    )
+
+
+def _add_socket_arg(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        type=Path,
+        default=DEFAULT_SOCKET_PATH,
+        help=f"Unix socket of the typpy daemon (default: {DEFAULT_SOCKET_PATH}).",
+    )
+
+
+def _check_files(
+    files: List[Path],
+    options: Options,
+    sources: SourceCache,
+) -> Iterator[TypingError]:
+    file_errors = None
+    # The activity of the daemon cannot be recorded from here
+    recording = options.profile or options.profile_imports or options.trace is not None
+    if options.daemon and not recording:
+        try:
+            file_errors = iter_check_with_daemon(
+                files,
+                options.socket_path,
+                import_timeout=options.import_timeout,
+                import_mode=options.import_mode,
+            )
+        except OSError:
+            logging.warning(
+                "No typpy daemon is listening on %s, checking files directly",
+                options.socket_path,
+            )
+
+    if file_errors is None:
+        preload = list(options.preload)
+        if (
+            options.preload_auto
+            and options.jobs != 1
+            and options.import_mode != "static"
+        ):
+            preload += find_common_imports(files, options.preload_auto, sources)
+
+        type_checker = TypeChecker(
+            jobs=options.jobs,
+            cache_dir=options.cache_dir,
+            sources=sources,
+            preload=preload,
+            import_timeout=options.import_timeout,
+            import_mode=options.import_mode,
+        )
+        file_errors = type_checker.iter_check_files(files)
+
+    for _, errors in file_errors:
+        yield from errors
+
+
+def _report_profile(
+    profile: Union[Profile, ImportProfile], output: Optional[Path]
+) -> None:
+    if output is None:
+        print(profile.format(), file=sys.stderr)
+    else:
+        output.write_text(json.dumps(profile.to_dict(), indent=2) + "\n")
+
+
+@dataclass(frozen=True)
+class DaemonOptions:
+    socket_path: Path
+    cache_dir: Optional[Path]
+    stop: bool
+
+
+def _parse_daemon_args(args: List[str]) -> DaemonOptions:
+    parser = ArgumentParser(
+        prog="typpy daemon",
+        description=(
+            "Start a typpy daemon, which keeps imported modules in memory\n"
+            "and only imports them again when their source changes.\n"
+            "Files are sent to the daemon with:\n\n"
+            "$ typpy --daemon src/**/*.py"
+        ),
+        formatter_class=RawDescriptionHelpFormatter,
+    )
+    _add_cache_args(parser)
+    _add_socket_arg(parser)
+    parser.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop the daemon listening on the socket.",
+    )
+
+    ns = parser.parse_args(args)
+    return DaemonOptions(
+        socket_path=ns.socket,
+        cache_dir=None if ns.no_cache else ns.cache_dir,
+        stop=ns.stop,
+    )
+
+
+def _run_daemon(options: DaemonOptions) -> None:
+    if options.stop:
+        stop_daemon(options.socket_path)
+    else:
+        Daemon(options.socket_path, cache_dir=options.cache_dir).serve()
+
+
+def type_check(
+    patterns: List[str],
+    jobs: int = 1,
+    cache_dir: Optional[Path] = None,
+    preload: Sequence[str] = (),
+    import_timeout: Optional[float] = None,
+    import_mode: str = "import",
+) -> List[TypingError]:
     files = find_files(patterns)
 
-    type_checker = TypeChecker()
+    type_checker = TypeChecker(
+        jobs=jobs,
+        cache_dir=cache_dir,
+        preload=preload,
+        import_timeout=import_timeout,
+        import_mode=import_mode,
+    )
     errors = type_checker.check_files(files)
 
     return errors
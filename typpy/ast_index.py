@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+from typpy.source import SourceFile
+
+ScopeNode = Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef]
+
+
+class AstIndex:
+    """Index the functions and classes defined in a source file.
+
+    The file is parsed only once, and the subtree of every nested
+    scope is then looked up in the index instead of being parsed
+    again from its own source.
+    """
+
+    def __init__(self, tree: ast.Module):
+        self.tree = tree
+        self.by_qualified_name: dict[str, ScopeNode] = {}
+        self.by_line_number: dict[int, ScopeNode] = {}
+
+        self._index(tree.body, "")
+
+    @classmethod
+    def from_file(cls, path: Path) -> "AstIndex":
+        return cls.from_source(SourceFile(path, path.read_bytes()))
+
+    @classmethod
+    def from_source(cls, source: SourceFile) -> "AstIndex":
+        return cls(ast.parse(source.data, filename=str(source.path)))
+
+    def find(self, obj: Any) -> Optional[ScopeNode]:
+        """Find the definition of a function or class.
+
+        Functions are looked up by the line number of their code object,
+        which is unambiguous even when the same name is defined twice.
+        Classes do not have a code object, and are looked up by their
+        qualified name.
+        """
+        code = getattr(obj, "__code__", None)
+        if code is not None:
+            node = self.by_line_number.get(code.co_firstlineno)
+            if node is not None and node.name == code.co_name:
+                return node
+
+        return self.by_qualified_name.get(getattr(obj, "__qualname__", None))
+
+    def _index(self, nodes: Iterable[ast.AST], prefix: str) -> None:
+        for node in nodes:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                qualified_name = f"{prefix}{node.name}"
+                self.by_qualified_name.setdefault(qualified_name, node)
+                # The first line of a code object is the line of the
+                # first decorator, if there are any.
+                line_number = (
+                    node.decorator_list[0].lineno
+                    if node.decorator_list
+                    else node.lineno
+                )
+                self.by_line_number.setdefault(line_number, node)
+                self._index(node.body, f"{qualified_name}.<locals>.")
+            elif isinstance(node, ast.ClassDef):
+                qualified_name = f"{prefix}{node.name}"
+                self.by_qualified_name.setdefault(qualified_name, node)
+                self._index(node.body, f"{qualified_name}.")
+            elif isinstance(node, (ast.stmt, ast.excepthandler)):
+                # Definitions nested in if, try, with and similar blocks
+                # keep the qualified name of the enclosing scope.
+                self._index(ast.iter_child_nodes(node), prefix)
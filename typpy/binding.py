@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import inspect
+from dataclasses import dataclass
+from typing import Any
+
+from typpy.interning import intern_type
+
+
+@dataclass(frozen=True)
+class BindingPlan:
+    """How the arguments of a call are bound to the parameters of a
+    signature, compiled once per callable and reused by every call.
+
+    Parameters are numbered by their position in the signature: the
+    positional arguments of a call fill them in order, and keyword
+    arguments are looked up in ``keywords``.
+    """
+
+    signature: inspect.Signature
+    parameters: tuple[inspect.Parameter, ...]
+    # Interned, like the types inferred for the arguments
+    annotations: tuple[Any, ...]
+    # Index of each parameter by name
+    keywords: dict[str, int]
+    # Indexes of the parameters without default, in order
+    required: tuple[int, ...]
+
+    @classmethod
+    def from_signature(cls, signature: inspect.Signature) -> BindingPlan:
+        parameters = tuple(signature.parameters.values())
+        return cls(
+            signature=signature,
+            parameters=parameters,
+            annotations=tuple(
+                intern_type(parameter.annotation) for parameter in parameters
+            ),
+            keywords={parameter.name: i for i, parameter in enumerate(parameters)},
+            required=tuple(
+                i
+                for i, parameter in enumerate(parameters)
+                if parameter.default is inspect.Parameter.empty
+            ),
+        )
+
+    def missing(self, bound: set[int]) -> list[inspect.Parameter]:
+        """Parameters without default that are not bound."""
+        return [self.parameters[i] for i in self.required if i not in bound]
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import types
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Iterable, Optional
+
+from typpy.error import TypingError
+from typpy.signatures import is_stdlib_module
+from typpy.source import SourceCache
+from typpy.version import PYTHON_VERSION, __version__
+
+DEFAULT_CACHE_DIR = Path(".typpy_cache")
+
+
+class ResultCache:
+    """Store the errors found in each file on disk, so that
+    files that did not change are not checked again.
+
+    An entry is valid as long as the source of the file, the sources
+    of the modules it imports directly or indirectly, the typpy version,
+    the python version and the options of the check are the same as
+    when the file was checked.
+    """
+
+    def __init__(
+        self,
+        directory: Path = DEFAULT_CACHE_DIR,
+        sources: Optional[SourceCache] = None,
+        options: Optional[dict[str, Any]] = None,
+    ):
+        """
+        :param options: Options of the check changing its results,
+            serializable to JSON.
+        """
+        self.directory = directory
+        self.sources = SourceCache() if sources is None else sources
+        self.options = {} if options is None else options
+        # Hash each file once per run, even if imported by many files
+        self._hashes: dict[Path, Optional[str]] = {}
+        # Modules imported by each module file, parsed once per run
+        self._imports: dict[str, list[types.ModuleType]] = {}
+        self._directory_created = False
+
+    def get(self, path: Path) -> Optional[list[TypingError]]:
+        """Get the errors of a file, or None if the file must be checked."""
+        try:
+            entry = json.loads(self._entry_path(path).read_text())
+        except (OSError, ValueError):
+            return None
+
+        if (
+            entry.get("typpy") != __version__
+            or entry.get("python") != PYTHON_VERSION
+            or entry.get("options", {}) != self.options
+            or entry.get("source") != self.hash_file(path)
+        ):
+            return None
+
+        for dependency, dependency_hash in entry["dependencies"].items():
+            if self.hash_file(Path(dependency)) != dependency_hash:
+                return None
+
+        return [TypingError.from_dict(error) for error in entry["errors"]]
+
+    def set(
+        self,
+        path: Path,
+        errors: list[TypingError],
+        dependencies: Iterable[Path],
+    ) -> None:
+        source_hash = self.hash_file(path)
+        if source_hash is None:
+            return
+
+        entry = {
+            "typpy": __version__,
+            "python": PYTHON_VERSION,
+            "options": self.options,
+            "source": source_hash,
+            "dependencies": {
+                str(dependency): self.hash_file(dependency)
+                for dependency in dependencies
+            },
+            "errors": [error.to_dict() for error in errors],
+        }
+
+        self._ensure_directory()
+        # Write to a temporary file first, so that concurrent
+        # processes never read a partially written entry.
+        with NamedTemporaryFile(
+            "w", dir=self.directory, suffix=".tmp", delete=False
+        ) as file:
+            json.dump(entry, file)
+        os.replace(file.name, self._entry_path(path))
+
+    def hash_file(self, path: Path) -> Optional[str]:
+        path = Path(os.path.abspath(path))
+        if path not in self._hashes:
+            try:
+                data = self.sources.get(path).data
+                self._hashes[path] = hashlib.sha256(data).hexdigest()
+            except OSError:
+                self._hashes[path] = None
+
+        return self._hashes[path]
+
+    def find_dependencies(self, tree: ast.Module, package: Optional[str]) -> list[Path]:
+        """Find the source files of the modules imported by a module,
+        directly or through the modules it imports.
+
+        A symbol can be re-exported by a module from another one, which
+        the module importing it depends on as well. Imports of standard
+        library modules are not followed, they only change with python.
+        :param package: Package of the module, to resolve relative imports.
+        """
+        dependencies: dict[str, None] = {}
+        modules = _find_imported_modules(tree, package)
+        while modules:
+            module = modules.pop()
+            file = module.__file__
+            if file in dependencies:
+                continue
+
+            dependencies[file] = None
+            if not is_stdlib_module(module.__name__):
+                modules.extend(self._find_module_imports(module))
+
+        return [Path(file) for file in dependencies]
+
+    def _find_module_imports(self, module: types.ModuleType) -> list[types.ModuleType]:
+        file = module.__file__
+        imports = self._imports.get(file)
+        if imports is None:
+            imports = []
+            if file.endswith(".py"):
+                try:
+                    tree = ast.parse(self.sources.get(Path(file)).text)
+                except (OSError, SyntaxError, ValueError):
+                    pass
+                else:
+                    imports = _find_imported_modules(tree, module.__package__)
+            self._imports[file] = imports
+
+        return list(imports)
+
+    def _entry_path(self, path: Path) -> Path:
+        key = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()
+        return self.directory / f"{key}.json"
+
+    def _ensure_directory(self) -> None:
+        if self._directory_created:
+            return
+
+        if not self.directory.is_dir():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Keep the cache out of version control
+            (self.directory / ".gitignore").write_text("*\n")
+
+        self._directory_created = True
+
+
+def _find_imported_modules(
+    tree: ast.Module, package: Optional[str]
+) -> list[types.ModuleType]:
+    module_names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            module_names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            name = "." * node.level + (node.module or "")
+            try:
+                name = importlib.util.resolve_name(name, package)
+            except (ImportError, ValueError):
+                continue
+
+            module_names.append(name)
+            # Symbols imported from a package can be submodules
+            module_names.extend(f"{name}.{alias.name}" for alias in node.names)
+
+    modules = []
+    for module_name in dict.fromkeys(module_names):
+        imported_module = sys.modules.get(module_name)
+        if getattr(imported_module, "__file__", None) is not None:
+            modules.append(imported_module)
+
+    return modules
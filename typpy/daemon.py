@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+import traceback
+from contextlib import contextmanager
+from importlib import reload
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterator, Optional
+
+from typpy.cache import DEFAULT_CACHE_DIR
+from typpy.error import TypingError
+from typpy.importer import ModuleFinder
+from typpy.scope import get_builtin_scope
+from typpy.type_checker import TypeChecker
+
+DEFAULT_SOCKET_PATH = DEFAULT_CACHE_DIR / "daemon.sock"
+
+
+class Daemon:
+    """Type check files on request, keeping imported modules warm.
+
+    The daemon listens on a unix socket. Between requests, it only
+    re-imports modules whose source file changed, so that checking
+    after saving a file does not pay the import cost of all its
+    dependencies again.
+    """
+
+    def __init__(
+        self,
+        socket_path: Path = DEFAULT_SOCKET_PATH,
+        cache_dir: Optional[Path] = None,
+    ):
+        self.socket_path = socket_path
+        self.cache_dir = cache_dir
+        self._stopped = False
+
+        # Modules imported before the daemon started (typpy, the standard
+        # library) never change and are never reloaded.
+        self._preloaded_modules = set(sys.modules)
+        self._module_stats: dict[str, Optional[tuple[int, int]]] = {}
+        # Finds the checked modules, needed to reload them
+        self._finder = ModuleFinder()
+
+        # Warm the scope of builtins, which is shared by all checks
+        get_builtin_scope()
+
+    def serve(self) -> None:
+        """Serve requests until a stop request is received."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                request = json.loads(self.rfile.readline())
+                for response in daemon.handle(request):
+                    self.wfile.write(json.dumps(response).encode() + b"\n")
+
+        # Unix sockets are not available on all platforms,
+        # hence the server class is only looked up here
+        with socketserver.UnixStreamServer(str(self.socket_path), Handler) as server:
+            logging.info("Daemon listening on %s", self.socket_path)
+            try:
+                while not self._stopped:
+                    server.handle_request()
+            finally:
+                self.socket_path.unlink()
+
+    def handle(self, request: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        """Handle a request, yielding the responses to send back.
+
+        The errors of each file are sent as soon as the file is checked,
+        followed by a last response marking the end of the check.
+        """
+        command = request.get("command")
+        if command == "stop":
+            self._stopped = True
+            yield {}
+            return
+
+        if command != "check":
+            yield {"exception": f"Unknown command '{command}'"}
+            return
+
+        try:
+            with _working_directory(Path(request["cwd"])):
+                self.reload_changed_modules()
+                files = [Path(file) for file in request["files"]]
+                type_checker = TypeChecker(
+                    cache_dir=self.cache_dir,
+                    import_timeout=request.get("import_timeout"),
+                    import_mode=request.get("import_mode", "import"),
+                )
+                for file, errors in type_checker.iter_check_files(files):
+                    yield {
+                        "file": str(file),
+                        "errors": [error.to_dict() for error in errors],
+                    }
+
+                self._track_modules()
+                self._finder.add_files(files)
+        except Exception:
+            yield {"exception": traceback.format_exc()}
+            return
+
+        yield {"done": True}
+
+    def reload_changed_modules(self) -> None:
+        """Reload the modules whose source file changed since the last check.
+
+        Modules using objects from a reloaded module are reloaded too,
+        otherwise they would keep references to the old objects.
+        """
+        changed = set()
+        for module_name, stat in list(self._module_stats.items()):
+            module = sys.modules.get(module_name)
+            if module is None:
+                del self._module_stats[module_name]
+            elif _stat_module(module) != stat:
+                changed.add(module_name)
+
+        if not changed:
+            return
+
+        outdated = set(changed)
+        while True:
+            dependents = {
+                module_name
+                for module_name in self._module_stats
+                if module_name not in outdated
+                and _references(sys.modules[module_name], outdated)
+            }
+            if not dependents:
+                break
+            outdated |= dependents
+
+        # Modules are moved to the end of sys.modules when their import
+        # completes, so dependencies come before the modules importing them.
+        with self._finder.installed():
+            for module_name in list(self._module_stats):
+                if module_name not in outdated:
+                    continue
+
+                logging.debug("Reloading module %s", module_name)
+                module = sys.modules[module_name]
+                self._module_stats[module_name] = _stat_module(module)
+                try:
+                    reload(module)
+                except Exception:
+                    # Let the next check import the module again
+                    # and report the error
+                    del sys.modules[module_name]
+                    del self._module_stats[module_name]
+
+    def _track_modules(self) -> None:
+        for module_name, module in list(sys.modules.items()):
+            if (
+                module_name not in self._preloaded_modules
+                and module_name not in self._module_stats
+            ):
+                self._module_stats[module_name] = _stat_module(module)
+
+
+def check_with_daemon(
+    files: list[Path],
+    socket_path: Path = DEFAULT_SOCKET_PATH,
+    import_timeout: Optional[float] = None,
+    import_mode: str = "import",
+) -> list[TypingError]:
+    """Type check files using a running daemon.
+
+    :raise OSError: If no daemon is listening on the socket.
+    """
+    errors = []
+    for _, file_errors in iter_check_with_daemon(
+        files, socket_path, import_timeout, import_mode
+    ):
+        errors.extend(file_errors)
+
+    return errors
+
+
+def iter_check_with_daemon(
+    files: list[Path],
+    socket_path: Path = DEFAULT_SOCKET_PATH,
+    import_timeout: Optional[float] = None,
+    import_mode: str = "import",
+) -> Iterator[tuple[Path, list[TypingError]]]:
+    """Type check files using a running daemon, yielding the errors
+    of each file as soon as the daemon checked it.
+
+    The import options are those of :class:`TypeChecker`.
+    :raise OSError: If no daemon is listening on the socket.
+    """
+    client = _connect(
+        socket_path,
+        {
+            "command": "check",
+            "cwd": os.getcwd(),
+            "files": [str(f) for f in files],
+            "import_timeout": import_timeout,
+            "import_mode": import_mode,
+        },
+    )
+    return _iter_check_responses(client)
+
+
+def stop_daemon(socket_path: Path = DEFAULT_SOCKET_PATH) -> None:
+    _send(socket_path, {"command": "stop"})
+
+
+def _iter_check_responses(
+    client: socket.socket,
+) -> Iterator[tuple[Path, list[TypingError]]]:
+    with client, client.makefile("rb") as file:
+        for line in file:
+            response = json.loads(line)
+            if "exception" in response:
+                raise RuntimeError(f"The typpy daemon failed:\n{response['exception']}")
+
+            if response.get("done"):
+                return
+
+            yield (
+                Path(response["file"]),
+                [TypingError.from_dict(error) for error in response["errors"]],
+            )
+
+    raise RuntimeError("The typpy daemon closed the connection during the check")
+
+
+def _send(socket_path: Path, request: dict[str, Any]) -> dict[str, Any]:
+    with _connect(socket_path, request) as client, client.makefile("rb") as file:
+        return json.loads(file.readline())
+
+
+def _connect(socket_path: Path, request: dict[str, Any]) -> socket.socket:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(socket_path))
+        client.sendall(json.dumps(request).encode() + b"\n")
+    except OSError:
+        client.close()
+        raise
+
+    return client
+
+
+def _stat_module(module: Any) -> Optional[tuple[int, int]]:
+    file = getattr(module, "__file__", None)
+    if file is None:
+        return None
+
+    try:
+        stat = os.stat(file)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _references(module: Any, module_names: set[str]) -> bool:
+    """Check whether a module uses any object from the given modules."""
+    for value in list(vars(module).values()):
+        if isinstance(value, ModuleType):
+            value_module = value.__name__
+        else:
+            value_module = getattr(value, "__module__", None)
+
+        if isinstance(value_module, str) and value_module in module_names:
+            return True
+
+    return False
+
+
+@contextmanager
+def _working_directory(path: Path) -> Iterator[None]:
+    # Paths in requests are relative to the client working directory
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
@@ -1,15 +1,255 @@
 from __future__ import annotations
 
-from glob import glob
+import os
+import posixpath
+import re
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator, Optional
 
+# Directories that never contain code to check
+DEFAULT_EXCLUDES = [
+    ".git",
+    ".hg",
+    ".svn",
+    ".tox",
+    ".nox",
+    ".venv",
+    "venv",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".typpy_cache",
+    "node_modules",
+    "*.egg-info",
+]
 
-# TODO: test, docstring
-def find_files(glob_patterns: list[str]) -> Iterable[Path]:
+_MAGIC = re.compile(r"[*?[]")
+
+
+def find_files(
+    glob_patterns: Iterable[str],
+    exclude: Iterable[str] = (),
+    default_excludes: bool = True,
+    gitignore: bool = False,
+) -> Iterator[Path]:
+    """Find the python files matching glob patterns.
+
+    Patterns can contain '*' to match any character sequence in a path
+    segment, and '**' to match any folder structure. Paths without
+    wildcards are taken as they are, and directories are searched
+    recursively. Each file is only returned once, and only '.py'
+    files are returned.
+
+    :param exclude: Glob patterns of files and directories to skip.
+        Patterns without '/' are matched against file and directory
+        names, the others against whole paths.
+    :param default_excludes: Also skip ``DEFAULT_EXCLUDES``.
+    :param gitignore: Skip files ignored by ``.gitignore`` files found
+        while searching directories. Files passed explicitly are
+        never skipped because of ``.gitignore``.
+    """
+    exclude = list(exclude)
+    if default_excludes:
+        exclude += DEFAULT_EXCLUDES
+    finder = _Finder([_ExcludePattern(pattern) for pattern in exclude], gitignore)
+
+    found = set()
     for glob_pattern in glob_patterns:
-        yield from _expand_glob(glob_pattern)
+        for path in finder.find(glob_pattern):
+            if path not in found:
+                found.add(path)
+                yield Path(path)
+
+
+class _Finder:
+    def __init__(self, excludes: list[_ExcludePattern], gitignore: bool):
+        self.excludes = excludes
+        self.gitignore = gitignore
+
+    def find(self, glob_pattern: str) -> Iterator[str]:
+        pattern = posixpath.normpath(glob_pattern.replace(os.sep, "/"))
+
+        if not _MAGIC.search(pattern):
+            if os.path.isdir(pattern):
+                prefix = _dir_prefix(pattern)
+                yield from self._walk(prefix, 0, None, None, self._root_rules(prefix))
+            elif pattern.endswith(".py") and not self._is_excluded(pattern):
+                yield pattern
+            return
+
+        # Only search the folder before the first wildcard
+        segments = pattern.split("/")
+        static = next(i for i, segment in enumerate(segments) if _MAGIC.search(segment))
+        root = "/".join(segments[:static])
+        if static == 1 and not root:
+            # Absolute pattern with a wildcard in the first segment
+            root = "/"
+
+        # Patterns without '**' match files at a fixed depth
+        max_depth = None if "**" in segments else len(segments) - static - 1
+        regex = _glob_to_regex(pattern)
+        prefix = _dir_prefix(root)
+        yield from self._walk(prefix, 0, max_depth, regex, self._root_rules(prefix))
+
+    def _root_rules(self, prefix: str) -> _IgnoreRules:
+        # The .gitignore files of the working directory and of the
+        # directories down to the searched one also apply to it, the
+        # ones of the searched directories are read while walking them.
+        if not self.gitignore or not prefix or prefix.startswith(("/", "../")):
+            return _NO_RULES
+
+        rules = _NO_RULES.extended("")
+        segments = prefix.split("/")[:-2]
+        for end in range(1, len(segments) + 1):
+            rules = rules.extended("/".join(segments[:end]) + "/")
+        return rules
+
+    def _walk(
+        self,
+        prefix: str,
+        depth: int,
+        max_depth: Optional[int],
+        regex: Optional[re.Pattern],
+        rules: _IgnoreRules,
+    ) -> Iterator[str]:
+        """Walk the directory whose path is prefix, without its trailing '/'."""
+        directory = prefix[:-1] or prefix or "."
+        if self.gitignore:
+            rules = rules.extended(prefix)
+
+        try:
+            with os.scandir(directory) as scan:
+                entries = sorted(scan, key=lambda entry: entry.name)
+        except OSError:
+            return
+
+        for entry in entries:
+            path = f"{prefix}{entry.name}"
+            # Symbolic links to directories are not followed, to avoid loops
+            if entry.is_dir(follow_symlinks=False):
+                too_deep = max_depth is not None and depth >= max_depth
+                if too_deep or self._is_skipped(path, True, rules):
+                    continue
+
+                yield from self._walk(f"{path}/", depth + 1, max_depth, regex, rules)
+            elif (
+                entry.name.endswith(".py")
+                and (regex is None or regex.match(path))
+                and not self._is_skipped(path, False, rules)
+            ):
+                yield path
+
+    def _is_skipped(self, path: str, is_dir: bool, rules: _IgnoreRules) -> bool:
+        return self._is_excluded(path) or rules.is_ignored(path, is_dir)
+
+    def _is_excluded(self, path: str) -> bool:
+        return any(exclude.matches(path) for exclude in self.excludes)
+
+
+class _ExcludePattern:
+    def __init__(self, pattern: str):
+        pattern = posixpath.normpath(pattern.replace(os.sep, "/"))
+        self.match_name = "/" not in pattern
+        if self.match_name:
+            self.regex = re.compile(_segment_to_regex(pattern) + r"\Z")
+        else:
+            self.regex = _glob_to_regex(pattern)
+
+    def matches(self, path: str) -> bool:
+        if self.match_name:
+            return bool(self.regex.match(posixpath.basename(path)))
+        return bool(self.regex.match(posixpath.normpath(path)))
+
+
+class _IgnoreRules:
+    """Rules of the .gitignore files of a directory and its parents."""
+
+    def __init__(self, rules: tuple[tuple[re.Pattern, bool, bool], ...] = ()):
+        # Regex, whether the rule is negated, whether it only matches directories
+        self.rules = rules
+
+    def extended(self, prefix: str) -> _IgnoreRules:
+        try:
+            lines = Path(prefix or ".", ".gitignore").read_text().splitlines()
+        except (OSError, UnicodeDecodeError):
+            return self
+
+        rules = list(self.rules)
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+
+            negated = line.startswith("!")
+            line = line[1:] if negated else line
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+
+            if "/" in line:
+                # Relative to the directory of the .gitignore
+                regex = re.escape(prefix) + _glob_to_regex(line.lstrip("/")).pattern
+            else:
+                regex = (
+                    re.escape(prefix) + r"(?:.*/)?" + _segment_to_regex(line) + r"\Z"
+                )
+            rules.append((re.compile(regex), negated, dir_only))
+
+        return _IgnoreRules(tuple(rules))
+
+    def is_ignored(self, path: str, is_dir: bool) -> bool:
+        ignored = False
+        # The last matching rule wins
+        for regex, negated, dir_only in self.rules:
+            if (is_dir or not dir_only) and regex.match(path):
+                ignored = not negated
+
+        return ignored
+
+
+_NO_RULES = _IgnoreRules()
+
+
+def _dir_prefix(directory: str) -> str:
+    if directory in ("", "."):
+        return ""
+    return directory if directory.endswith("/") else f"{directory}/"
+
+
+def _glob_to_regex(pattern: str) -> re.Pattern:
+    segments = pattern.split("/")
+    regex = ""
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if segment == "**":
+            regex += ".*" if last else "(?:.*/)?"
+        else:
+            regex += _segment_to_regex(segment) + ("" if last else "/")
+
+    return re.compile(regex + r"\Z")
+
 
+def _segment_to_regex(segment: str) -> str:
+    """Translate a glob matching a single path segment to a regex."""
+    regex = ""
+    index = 0
+    while index < len(segment):
+        char = segment[index]
+        index += 1
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[" and segment.find("]", index + 1) != -1:
+            end = segment.index("]", index + 1)
+            chars = segment[index:end]
+            if chars.startswith("!"):
+                chars = "^" + chars[1:]
+            chars = chars.replace("\\", "\\\\")
+            regex += f"[{chars}]"
+            index = end + 1
+        else:
+            regex += re.escape(char)
 
-def _expand_glob(glob_pattern: str) -> Iterable[Path]:
-    yield from (Path(path) for path in glob(glob_pattern))
+    return regex
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import ast
+from typing import Any, Callable, Optional, Type, TypeVar
+
+H = TypeVar("H", bound=Callable[..., Any])
+
+
+class Dispatcher:
+    """Handlers of AST nodes, by node class.
+
+    The handler of a node is the one registered for its class, or else
+    for the closest base class, so that a node only costs a dict lookup
+    however many handlers there are.
+    """
+
+    def __init__(self, default: Callable[..., Any]):
+        """
+        :param default: Handler of the nodes without registered handler.
+        """
+        self.default = default
+        self._handlers: dict[type, Callable[..., Any]] = {}
+        # Handler found for each node class seen, including subclasses
+        self._resolved: dict[type, Callable[..., Any]] = {}
+
+    def register(self, *node_types: Type[ast.AST]) -> Callable[[H], H]:
+        """Decorator registering a handler for some node classes.
+
+        A handler registered again for a class replaces the previous one.
+        """
+
+        def decorator(handler: H) -> H:
+            for node_type in node_types:
+                self._handlers[node_type] = handler
+            self._resolved.clear()
+            return handler
+
+        return decorator
+
+    def get(self, node_type: type) -> Callable[..., Any]:
+        handler = self._resolved.get(node_type)
+        if handler is None:
+            handler = self._find(node_type) or self.default
+            self._resolved[node_type] = handler
+
+        return handler
+
+    def _find(self, node_type: type) -> Optional[Callable[..., Any]]:
+        for base in node_type.__mro__:
+            handler = self._handlers.get(base)
+            if handler is not None:
+                return handler
+
+        return None
@@ -1,7 +1,7 @@
 import ast
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Union
 
 from typpy.scope import Scope
 
@@ -44,3 +44,13 @@ class TypingError:
             message=message,
             code_message=code_message,
         )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON serializable dictionary."""
+        data = asdict(self)
+        data["file"] = str(self.file)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TypingError":
+        return cls(**{**data, "file": Path(data["file"])})
@@ -1,7 +1,9 @@
-from typpy.expression.check import check_expression
-from typpy.expression.expr_type import get_expr_type
+from typpy.expression.check import check_expression, register_expression_check
+from typpy.expression.expr_type import get_expr_type, register_expression_type
 
 __all__ = [
     "check_expression",
     "get_expr_type",
+    "register_expression_check",
+    "register_expression_type",
 ]
@@ -2,7 +2,9 @@ import ast
 import inspect
 from typing import List, Type
 
-from typpy.scope import Scope
+from typpy import instrumentation
+from typpy.binding import BindingPlan
+from typpy.scope import Scope, Unknown
 from typpy.error import TypingError
 from typpy.is_subtype import is_subtype
 from typpy.format import fmt_type
@@ -10,67 +12,71 @@ from typpy.expression.expr_type import get_expr_type
 
 
 def check_call(expr: ast.Call, scope: Scope) -> List[TypingError]:
-    cb, signature = scope.resolve_callable(expr.func.id)
-    if signature is None:
+    with instrumentation.span("call", expr):
+        return _check_call(expr, scope)
+
+
+def _check_call(expr: ast.Call, scope: Scope) -> List[TypingError]:
+    cb, plan = scope.resolve_binding_plan(expr.func.id)
+    if plan is None:
         message = f"Function '{expr.func.id}' is not defined"
         return [TypingError.from_scope_stmt(scope, expr.func, message, message)]
 
-    return _check_call_args(cb.__name__, signature, expr, scope)
+    if isinstance(cb, Unknown):
+        # Only known when running the code
+        return []
+
+    return _check_call_args(cb.__name__, plan, expr, scope)
 
 
 def _check_call_args(
     cb_name: str,
-    signature: inspect.Signature,
+    plan: BindingPlan,
     expr: ast.Call,
     scope: Scope,
 ) -> List[TypingError]:
     errors = []
 
-    sign_args = [sign_arg for sign_arg in signature.parameters.values()]
-    required = [
-        sign_arg
-        for sign_arg in signature.parameters.values()
-        if sign_arg.default == inspect._empty
-    ]
+    num_parameters = len(plan.parameters)
+    # Indexes of the parameters given a value
+    bound = set()
 
     total_num_call_args = len(expr.args) + len(expr.keywords)
     # Positional arguments
-    for call_arg in expr.args:
+    for index, call_arg in enumerate(expr.args):
         # If this positional argument does not exist
-        if not sign_args:
+        if index >= num_parameters:
             message = (
-                f"Expected {len(signature.parameters)} arguments "
+                f"Expected {num_parameters} arguments "
                 f"in call to '{expr.func.id}', found {total_num_call_args}"
             )
             code_message = (
-                f"Expected {len(signature.parameters)} arguments, "
-                f"found {total_num_call_args}"
+                f"Expected {num_parameters} arguments, found {total_num_call_args}"
             )
             errors.append(
                 TypingError.from_scope_stmt(scope, call_arg, message, code_message)
             )
             continue
 
-        sign_arg = sign_args.pop(0)
-
         call_arg_type = get_expr_type(call_arg, scope)
-        if not is_subtype(call_arg_type, sign_arg.annotation):
+        if not is_subtype(call_arg_type, plan.annotations[index]):
             new_error = _argument_type_error(
                 cb_name,
                 call_arg_type,
-                sign_arg,
+                plan.parameters[index],
                 call_arg,
                 scope,
             )
             errors.append(new_error)
 
-        if sign_arg in required:
-            required.remove(sign_arg)
+        bound.add(index)
 
+    num_positional = min(len(expr.args), num_parameters)
     # First process all keyword arguments
     for keyword in expr.keywords:
+        index = plan.keywords.get(keyword.arg)
         # If this keyword argument does not exist
-        if keyword.arg not in signature.parameters:
+        if index is None:
             message = f"Unexpected argument '{keyword.arg}' in call to '{expr.func.id}'"
             code_message = f"Unexpected argument '{keyword.arg}'"
             errors.append(
@@ -78,10 +84,8 @@ def _check_call_args(
             )
             continue
 
-        sign_arg = signature.parameters[keyword.arg]
-
         # Check that this argument was not already set by position
-        if sign_arg not in sign_args:
+        if index < num_positional:
             message = (
                 f"Got multiple values for argument '{keyword.arg}'"
                 f" to '{expr.func.id}'"
@@ -92,20 +96,20 @@ def _check_call_args(
             )
 
         keyword_arg_type = get_expr_type(keyword.value, scope)
-        if not is_subtype(keyword_arg_type, sign_arg.annotation):
+        if not is_subtype(keyword_arg_type, plan.annotations[index]):
             new_error = _argument_type_error(
                 cb_name,
                 keyword_arg_type,
-                sign_arg,
+                plan.parameters[index],
                 keyword,
                 scope,
             )
             errors.append(new_error)
 
-        if sign_arg in required:
-            required.remove(sign_arg)
+        bound.add(index)
 
-    # Check that all required arguments were removed
+    # Check that all required arguments were given
+    required = plan.missing(bound)
     if required:
         s = "" if len(required) == 1 else "s"
         args = ", ".join([f"'{arg.name}'" for arg in required])
@@ -1,25 +1,51 @@
 import ast
 import logging
 import warnings
-from typing import List
+from typing import Callable, List, Type
 
+from typpy.dispatch import Dispatcher
 from typpy.expression.call import check_call
 from typpy.error import TypingError
 from typpy.scope import Scope
 
+ExpressionCheck = Callable[[ast.expr, Scope], List[TypingError]]
+
 
 def check_expression(expr: ast.expr, scope: Scope) -> List[TypingError]:
+    errors = scope.expr_errors.get(expr)
+    if errors is None:
+        errors = _check_expression(expr, scope)
+        scope.expr_errors[expr] = errors
+
+    # Callers add their own errors to the list
+    return list(errors)
+
+
+def _check_expression(expr: ast.expr, scope: Scope) -> List[TypingError]:
     logging.debug("expr: %s" % expr)
-    errors = []
-
-    # if isinstance(expr, ast.Compare):
-    #     print(expr.left, expr.comparators, expr.ops)
-    if isinstance(expr, ast.Call):
-        new_errors = check_call(expr, scope)
-        errors.extend(new_errors)
-    else:
-        warnings.warn(
-            f"check for expression {expr} is not implemented. Contact us for a fix."
-        )
-
-    return errors
+    return _checks.get(type(expr))(expr, scope)
+
+
+def _check_not_implemented(expr: ast.expr, scope: Scope) -> List[TypingError]:
+    warnings.warn(
+        f"check for expression {expr} is not implemented. Contact us for a fix."
+    )
+    return []
+
+
+_checks = Dispatcher(_check_not_implemented)
+
+
+def register_expression_check(
+    *node_types: Type[ast.expr],
+) -> Callable[[ExpressionCheck], ExpressionCheck]:
+    """Decorator registering the check of some expression classes,
+    replacing the check of typpy if any.
+
+    The check is called with the expression and its scope and returns
+    the errors found.
+    """
+    return _checks.register(*node_types)
+
+
+register_expression_check(ast.Call)(check_call)
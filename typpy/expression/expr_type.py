@@ -2,94 +2,145 @@ from __future__ import annotations
 
 import ast
 import warnings
-from typing import Type, Union, Iterable, Any
+from typing import Type, Iterable, Any, Callable
 
+from typpy import instrumentation
+from typpy.dispatch import Dispatcher
+from typpy.interning import intern_type, make_union
 from typpy.scope import Scope
 
+ExpressionType = Callable[[ast.expr, Scope], Type]
+
 
 def get_expr_type(expr: ast.expr, scope: Scope) -> Type:
-    # In python 3.7, constants are NameConstant, Str, Bytes or Num
-    # instead of being a single Constant class
-    if isinstance(expr, (ast.Constant, ast.NameConstant)):
-        return type(expr.value)
-    elif isinstance(expr, (ast.Str, ast.Bytes)):
-        return type(expr.s)
-    elif isinstance(expr, ast.Num):
-        return type(expr.n)
-    elif isinstance(expr, ast.Name):
-        val = scope.resolve_variable(expr.id)
-        if val is None:
-            return eval(expr.id)
-        return val
-    elif isinstance(expr, ast.Subscript):
-        outer_type, _ = scope.resolve_callable(expr.value.id)
-
-        # The outer type annotation can contain a single type
-        # or a tuple of types
-        if isinstance(expr.slice, ast.Tuple):
-            inner_type = tuple(get_expr_type(elt, scope) for elt in expr.slice.elts)
-        # On python up to 3.8, the inner part was a ast.Index
-        # instead of an ast.Tuple
-        elif isinstance(expr.slice, ast.Index):
-            value = expr.slice.value
-            # e.g. obj[1, 2, 3]
-            if isinstance(value, ast.Tuple):
-                inner_type = tuple(get_expr_type(elt, scope) for elt in value.elts)
-            # e.g. obj[1]
-            else:
-                inner_type = get_expr_type(value, scope)
-        else:
-            inner_type = get_expr_type(expr.slice, scope)
-
-        return outer_type[inner_type]
-    elif isinstance(expr, ast.Call):
-        cb, signature = scope.resolve_callable(expr.func.id)
-        if signature is None:
-            # TODO: error reporting
-            pass
-
-        # The annotation can also be a string
-        if isinstance(signature.return_annotation, str):
-            return eval(signature.return_annotation)
-
-        return signature.return_annotation
-    elif isinstance(expr, ast.Tuple):
-        types = [get_expr_type(elt, scope) for elt in expr.elts]
-        return tuple[tuple(types)]
-    elif isinstance(expr, ast.List):
-        return _resolve_union(list, expr.elts, scope)
-    elif isinstance(expr, ast.Dict):
-        key_types = {get_expr_type(key, scope) for key in expr.keys}
-        value_types = {get_expr_type(value, scope) for value in expr.values}
-
-        if not key_types:
-            return dict
-
-        if len(key_types) == 1:
-            key_type = key_types.pop()
-        else:
-            key_type = Union[tuple(key_types)]
+    instrumentation.count("get_expr_type")
+    try:
+        return scope.expr_types[expr]
+    except KeyError:
+        pass
+
+    expr_type = _get_expr_type(expr, scope)
+    scope.expr_types[expr] = expr_type
+    return expr_type
 
-        if len(value_types) == 1:
-            value_type = value_types.pop()
-        else:
-            value_type = Union[tuple(value_types)]
 
-        return dict[key_type, value_type]
-    elif isinstance(expr, ast.Set):
-        return _resolve_union(set, expr.elts, scope)
+def _get_expr_type(expr: ast.expr, scope: Scope) -> Type:
+    return _types.get(type(expr))(expr, scope)
 
+
+def _type_not_implemented(expr: ast.expr, scope: Scope) -> Type:
     warnings.warn(
         f"expression type for {expr} is not implemented. Contact us for a fix."
     )
 
 
+_types = Dispatcher(_type_not_implemented)
+
+
+def register_expression_type(
+    *node_types: Type[ast.expr],
+) -> Callable[[ExpressionType], ExpressionType]:
+    """Decorator registering how to infer the type of some expression
+    classes, replacing the one of typpy if any.
+
+    The function is called with the expression and its scope and
+    returns its type. Types of sub-expressions should be inferred with
+    :func:`get_expr_type`, which memoizes them.
+    """
+    return _types.register(*node_types)
+
+
+# In python 3.7, constants are NameConstant, Str, Bytes or Num
+# instead of being a single Constant class
+@register_expression_type(ast.Constant, ast.NameConstant)
+def _constant_type(expr: ast.Constant, scope: Scope) -> Type:
+    return type(expr.value)
+
+
+@register_expression_type(ast.Str, ast.Bytes)
+def _str_type(expr: ast.Str, scope: Scope) -> Type:
+    return type(expr.s)
+
+
+@register_expression_type(ast.Num)
+def _num_type(expr: ast.Num, scope: Scope) -> Type:
+    return type(expr.n)
+
+
+@register_expression_type(ast.Name)
+def _name_type(expr: ast.Name, scope: Scope) -> Type:
+    val = scope.resolve_variable(expr.id)
+    if val is None:
+        return eval(expr.id)
+    return val
+
+
+@register_expression_type(ast.Subscript)
+def _subscript_type(expr: ast.Subscript, scope: Scope) -> Type:
+    outer_type, _ = scope.resolve_callable(expr.value.id)
+
+    # The outer type annotation can contain a single type
+    # or a tuple of types
+    if isinstance(expr.slice, ast.Tuple):
+        inner_type = tuple(get_expr_type(elt, scope) for elt in expr.slice.elts)
+    # On python up to 3.8, the inner part was a ast.Index
+    # instead of an ast.Tuple
+    elif isinstance(expr.slice, ast.Index):
+        value = expr.slice.value
+        # e.g. obj[1, 2, 3]
+        if isinstance(value, ast.Tuple):
+            inner_type = tuple(get_expr_type(elt, scope) for elt in value.elts)
+        # e.g. obj[1]
+        else:
+            inner_type = get_expr_type(value, scope)
+    else:
+        inner_type = get_expr_type(expr.slice, scope)
+
+    return intern_type(outer_type[inner_type])
+
+
+@register_expression_type(ast.Call)
+def _call_type(expr: ast.Call, scope: Scope) -> Type:
+    cb, signature = scope.resolve_callable(expr.func.id)
+    if signature is None:
+        # TODO: error reporting
+        return Any
+
+    # The annotation can also be a string
+    return scope.resolve_annotation(signature.return_annotation)
+
+
+@register_expression_type(ast.Tuple)
+def _tuple_type(expr: ast.Tuple, scope: Scope) -> Type:
+    types = [get_expr_type(elt, scope) for elt in expr.elts]
+    return intern_type(tuple[tuple(types)])
+
+
+@register_expression_type(ast.List)
+def _list_type(expr: ast.List, scope: Scope) -> Type:
+    return _resolve_union(list, expr.elts, scope)
+
+
+@register_expression_type(ast.Dict)
+def _dict_type(expr: ast.Dict, scope: Scope) -> Type:
+    key_types = {get_expr_type(key, scope) for key in expr.keys}
+    value_types = {get_expr_type(value, scope) for value in expr.values}
+
+    if not key_types:
+        return dict
+
+    return intern_type(dict[make_union(key_types), make_union(value_types)])
+
+
+@register_expression_type(ast.Set)
+def _set_type(expr: ast.Set, scope: Scope) -> Type:
+    return _resolve_union(set, expr.elts, scope)
+
+
 def _resolve_union(parent: Type, values: Iterable[Any], scope: Scope) -> Type:
     types = {get_expr_type(value, scope) for value in values}
 
     if not types:
         return parent
-    elif len(types) == 1:
-        return parent[types.pop()]
 
-    return parent[Union[tuple(types)]]
+    return intern_type(parent[make_union(types)])
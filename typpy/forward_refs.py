@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import builtins
+import inspect
+import logging
+import sys
+import types
+from typing import Any
+
+
+class ForwardRefs:
+    """Evaluate string annotations (forward references, or all annotations
+    of modules using ``from __future__ import annotations``) in the
+    namespace of the module defining them.
+
+    Each annotation is evaluated only once per namespace. Annotations
+    that cannot be evaluated (e.g. names only imported under ``if
+    TYPE_CHECKING:``) are resolved to ``Any``, which is not checked.
+    """
+
+    def __init__(self):
+        self._resolved: dict[tuple[int, str], Any] = {}
+        # Keep namespaces alive, so that their ids are not reused
+        self._namespaces: dict[int, dict[str, Any]] = {}
+
+    def resolve(self, annotation: Any, namespace: dict[str, Any]) -> Any:
+        if not isinstance(annotation, str):
+            return annotation
+
+        key = (id(namespace), annotation)
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+
+        try:
+            resolved = eval(annotation, _with_builtins(namespace))
+        except Exception as e:
+            logging.debug("Cannot resolve annotation '%s': %s", annotation, e)
+            resolved = Any
+
+        self._resolved[key] = resolved
+        self._namespaces[id(namespace)] = namespace
+        return resolved
+
+    def resolve_signature(
+        self,
+        signature: inspect.Signature,
+        namespace: dict[str, Any],
+    ) -> inspect.Signature:
+        """Resolve all string annotations of a signature."""
+        parameters = list(signature.parameters.values())
+        annotations = [param.annotation for param in parameters]
+        annotations.append(signature.return_annotation)
+        if not any(isinstance(annotation, str) for annotation in annotations):
+            return signature
+
+        return signature.replace(
+            parameters=[
+                param.replace(annotation=self.resolve(param.annotation, namespace))
+                for param in parameters
+            ],
+            return_annotation=self.resolve(signature.return_annotation, namespace),
+        )
+
+
+def get_namespace(obj: Any) -> dict[str, Any]:
+    """Get the global namespace in which the annotations of obj are defined."""
+    if isinstance(obj, types.ModuleType):
+        return vars(obj)
+
+    if inspect.isroutine(obj):
+        try:
+            obj = inspect.unwrap(obj)
+        except ValueError:
+            pass
+
+        namespace = getattr(obj, "__globals__", None)
+        if namespace is not None:
+            return namespace
+
+        return _get_module_namespace(obj)
+
+    if inspect.isclass(obj):
+        # The signature of a class is the one of its constructor
+        namespace = getattr(obj.__init__, "__globals__", None)
+        if namespace is not None:
+            return namespace
+
+        return _get_module_namespace(obj)
+
+    if callable(obj):
+        # e.g. functions built without importing their module
+        namespace = getattr(obj, "__globals__", None)
+        if isinstance(namespace, dict):
+            return namespace
+
+        return get_namespace(type(obj))
+
+    # Other objects are containers used as modules
+    return getattr(obj, "__dict__", {})
+
+
+def _get_module_namespace(obj: Any) -> dict[str, Any]:
+    module_name = getattr(obj, "__module__", None)
+    if isinstance(module_name, str) and module_name in sys.modules:
+        return vars(sys.modules[module_name])
+
+    return {}
+
+
+def _with_builtins(namespace: dict[str, Any]) -> dict[str, Any]:
+    # eval() adds __builtins__ to the globals it is given,
+    # avoid modifying namespaces that do not have them.
+    if "__builtins__" in namespace:
+        return namespace
+
+    return {**namespace, "__builtins__": builtins}
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+from typpy.instrumentation import Recorder, format_name
+
+
+@dataclass
+class ModuleImport:
+    """Cost of executing a module when it is first imported."""
+
+    module: str
+    # Checked file whose import triggered this one, None if preloaded
+    file: Optional[str]
+    # Including the modules it imports
+    seconds: float = 0.0
+    self_seconds: float = 0.0
+    # Bytes allocated during the import and still in use after it
+    memory: int = 0
+    self_memory: int = 0
+    # Processes which imported the module, when checking in parallel
+    processes: int = 1
+
+
+@dataclass
+class ImportProfile:
+    imports: dict[str, ModuleImport] = field(default_factory=dict)
+
+    def merge(self, other: "ImportProfile") -> None:
+        """Add the imports of another process, in which the same
+        modules are imported again."""
+        for module, other_import in other.imports.items():
+            module_import = self.imports.get(module)
+            if module_import is None:
+                self.imports[module] = other_import
+                continue
+
+            module_import.seconds += other_import.seconds
+            module_import.self_seconds += other_import.self_seconds
+            module_import.memory += other_import.memory
+            module_import.self_memory += other_import.self_memory
+            module_import.processes += other_import.processes
+
+    def heaviest(self, top: int) -> list[ModuleImport]:
+        imports = sorted(self.imports.values(), key=lambda i: i.seconds, reverse=True)
+        return imports[:top]
+
+    def to_dict(self, top: int = 20) -> dict[str, Any]:
+        """Convert to a JSON serializable dictionary."""
+        return {
+            "imports": [
+                asdict(module_import) for module_import in self.imports.values()
+            ],
+            "heaviest": [module_import.module for module_import in self.heaviest(top)],
+        }
+
+    def format(self, top: int = 20) -> str:
+        lines = [
+            "Heaviest imports",
+            f"  {'total':>9}    {'self':>9}    {'memory':>9}     module (imported by)",
+        ]
+        for module_import in self.heaviest(top):
+            imported_by = module_import.file or "preload"
+            lines.append(
+                f"  {module_import.seconds * 1e3:>9.1f} ms "
+                f"{module_import.self_seconds * 1e3:>9.1f} ms "
+                f"{module_import.memory / 1024:>9.0f} KiB  "
+                f"{module_import.module} ({imported_by})"
+            )
+
+        return "\n".join(lines)
+
+
+class ImportProfiler(Recorder):
+    """Record the time and memory of each module import, attributed
+    to the checked file that triggered it.
+
+    Memory is measured with tracemalloc, started on the first import
+    recorded, which slows down the check.
+    """
+
+    def __init__(self, memory: bool = True):
+        self.memory = memory
+        self.profile = ImportProfile()
+        # Category, name, start time, start memory, time and
+        # memory of nested module imports
+        self._stack: list[list[Any]] = []
+        self._files: list[str] = []
+
+    def enter(self, category: str, name: Any) -> None:
+        if category == "file":
+            self._files.append(format_name(name))
+        # Memory is only measured around imports, as it is slow
+        memory = self._traced_memory() if category == "module" else 0
+        self._stack.append([category, name, time.perf_counter(), memory, 0.0, 0])
+
+    def exit(self) -> None:
+        category, name, start, start_memory, nested, nested_memory = self._stack.pop()
+        if category == "file":
+            self._files.pop()
+        if category != "module":
+            return
+
+        duration = time.perf_counter() - start
+        memory = self._traced_memory() - start_memory
+        self.profile.imports.setdefault(
+            name,
+            ModuleImport(
+                module=name,
+                file=self._files[-1] if self._files else None,
+                seconds=duration,
+                self_seconds=duration - nested,
+                memory=memory,
+                self_memory=memory - nested_memory,
+            ),
+        )
+
+        # Add to the enclosing module import
+        for frame in reversed(self._stack):
+            if frame[0] == "module":
+                frame[4] += duration
+                frame[5] += memory
+                break
+
+    def fork(self) -> "ImportProfiler":
+        return ImportProfiler(self.memory)
+
+    def merge(self, other: Recorder) -> None:
+        if isinstance(other, ImportProfiler):
+            self.profile.merge(other.profile)
+
+    def _traced_memory(self) -> int:
+        if not self.memory:
+            return 0
+        if not tracemalloc.is_tracing():
+            # Started lazily, to also start in worker processes
+            tracemalloc.start()
+        return tracemalloc.get_traced_memory()[0]
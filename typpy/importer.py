@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import os
+import signal
+import sys
+import threading
+from contextlib import contextmanager
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec, PathFinder
+from importlib.util import spec_from_file_location
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+from typpy import instrumentation
+from typpy.resolver import Resolver
+
+
+class ImportTimeoutError(BaseException):
+    """Raised in the code of a module taking too long to import.
+
+    Like KeyboardInterrupt, it is not an Exception, so that the module
+    cannot catch it with ``except Exception:`` and keep running.
+    """
+
+
+@contextmanager
+def import_timeout(seconds: Optional[float]) -> Iterator[None]:
+    """Interrupt the code run in the context after some seconds,
+    raising ImportTimeoutError.
+
+    The timeout relies on SIGALRM, so it is only enforced in the main
+    thread of platforms supporting it. Code blocked in a C extension
+    is only interrupted once it returns to python.
+    """
+    if (
+        seconds is None
+        or not hasattr(signal, "SIGALRM")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def interrupt(signum: int, frame: Any) -> None:
+        raise ImportTimeoutError(f"Import took more than {seconds:g} seconds")
+
+    previous_handler = signal.signal(signal.SIGALRM, interrupt)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+class ModuleFinder(MetaPathFinder):
+    """Find the checked modules, without searching ``sys.path``.
+
+    Each checked file is mapped to its fully qualified module name,
+    together with the packages containing it, so that they are loaded
+    directly by spec. Other modules of the folders containing the
+    checked packages (e.g. an unchecked sibling module) are found
+    after all other finders, as if these folders were at the end of
+    ``sys.path``. Third-party and standard library modules are found
+    as usual, unless a checked file has the same name (e.g. ``code.py``).
+    """
+
+    def __init__(self, resolver: Optional[Resolver] = None):
+        self.resolver = Resolver() if resolver is None else resolver
+        # Absolute path of the file of each module and package
+        self.modules: dict[str, str] = {}
+        # Folders containing the outermost packages
+        self.roots: dict[str, None] = {}
+        self._fallback = _RootsFinder(self.roots)
+        self._installed = 0
+
+    def add_file(self, path: Path) -> str:
+        """Map a file to its module, returning the module name."""
+        module_name, containing_path = self.resolver.resolve(path)
+        root = os.path.abspath(containing_path)
+        self.roots[root] = None
+        self.modules[module_name] = os.path.abspath(path)
+
+        # Map the packages containing the module as well
+        parts = module_name.split(".")
+        for end in range(1, len(parts)):
+            package_dir = os.path.join(root, *parts[:end])
+            self.modules.setdefault(
+                ".".join(parts[:end]), os.path.join(package_dir, "__init__.py")
+            )
+
+        return module_name
+
+    def add_files(self, paths: Iterable[Path]) -> None:
+        for path in paths:
+            self.add_file(path)
+
+    @contextmanager
+    def installed(self) -> Iterator[ModuleFinder]:
+        """Install the finder while in the context.
+
+        Nested contexts do not install the finder again, so that
+        ``sys.meta_path`` is only changed once per run.
+        """
+        if not self._installed:
+            # After the builtin and frozen modules, before sys.path
+            sys.meta_path.insert(_path_finder_index(), self)
+            sys.meta_path.append(self._fallback)
+        self._installed += 1
+        try:
+            yield self
+        finally:
+            self._installed -= 1
+            if not self._installed:
+                sys.meta_path.remove(self)
+                sys.meta_path.remove(self._fallback)
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]] = None,
+        target: Any = None,
+    ) -> Optional[ModuleSpec]:
+        file = self.modules.get(fullname)
+        if file is None:
+            return None
+
+        if os.path.basename(file) == "__init__.py":
+            return spec_from_file_location(
+                fullname, file, submodule_search_locations=[os.path.dirname(file)]
+            )
+        return spec_from_file_location(fullname, file)
+
+
+def _path_finder_index() -> int:
+    for index, finder in enumerate(sys.meta_path):
+        if finder is PathFinder:
+            return index
+    return len(sys.meta_path)
+
+
+class _RootsFinder(MetaPathFinder):
+    """Find top-level modules in the folders containing the checked packages."""
+
+    def __init__(self, roots: dict[str, None]):
+        self.roots = roots
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]] = None,
+        target: Any = None,
+    ) -> Optional[ModuleSpec]:
+        if path is not None or not self.roots:
+            # Submodules are found in the __path__ of their package
+            return None
+
+        return PathFinder.find_spec(fullname, list(self.roots), target)
+
+
+@contextmanager
+def recording_modules() -> Iterator[None]:
+    """Record a "module" span around the execution of each module
+    imported in the context, including transitive imports.
+
+    Nothing is done unless the activity of the type checker is recorded.
+    """
+    if instrumentation.get_recorder() is None or any(
+        isinstance(finder, _SpanFinder) for finder in sys.meta_path
+    ):
+        yield
+        return
+
+    finder = _SpanFinder()
+    sys.meta_path.insert(0, finder)
+    try:
+        yield
+    finally:
+        sys.meta_path.remove(finder)
+
+
+class _SpanFinder(MetaPathFinder):
+    """Find modules with the other finders, wrapping their loader."""
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]] = None,
+        target: Any = None,
+    ) -> Optional[ModuleSpec]:
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                if hasattr(spec.loader, "exec_module"):
+                    spec.loader = _SpanLoader(spec.loader)
+                return spec
+
+        return None
+
+
+class _SpanLoader(Loader):
+    def __init__(self, loader: Any):
+        self.loader = loader
+
+    def create_module(self, spec: ModuleSpec) -> Any:
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module: Any) -> None:
+        # Leave no trace of the wrapper in the module
+        module.__loader__ = self.loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+
+        with instrumentation.span("module", module.__name__):
+            self.loader.exec_module(module)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.loader, name)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import ast
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional, TypeVar
+
+
+class Recorder:
+    """Receive the activity of the type checker.
+
+    Activity is recorded as nested spans, each with a category
+    (e.g. "import") and a name (e.g. the imported module), and
+    as counts of events.
+    """
+
+    def enter(self, category: str, name: Any) -> None:
+        pass
+
+    def exit(self) -> None:
+        pass
+
+    def count(self, event: str) -> None:
+        pass
+
+    def fork(self) -> "Recorder":
+        """Create an empty recorder of the same kind, for a worker process."""
+        return type(self)()
+
+    def merge(self, other: "Recorder") -> None:
+        """Add the activity recorded by a fork of this recorder."""
+
+
+class RecorderGroup(Recorder):
+    """Send the activity to several recorders."""
+
+    def __init__(self, recorders: Iterable[Recorder] = ()):
+        self.recorders = list(recorders)
+
+    def enter(self, category: str, name: Any) -> None:
+        for recorder in self.recorders:
+            recorder.enter(category, name)
+
+    def exit(self) -> None:
+        for recorder in self.recorders:
+            recorder.exit()
+
+    def count(self, event: str) -> None:
+        for recorder in self.recorders:
+            recorder.count(event)
+
+    def fork(self) -> "RecorderGroup":
+        return RecorderGroup(recorder.fork() for recorder in self.recorders)
+
+    def merge(self, other: Recorder) -> None:
+        if isinstance(other, RecorderGroup):
+            for recorder, other_recorder in zip(self.recorders, other.recorders):
+                recorder.merge(other_recorder)
+
+
+def group_recorders(recorders: list[Recorder]) -> Optional[Recorder]:
+    """Combine recorders into one, or None if there are none."""
+    if not recorders:
+        return None
+    if len(recorders) == 1:
+        return recorders[0]
+    return RecorderGroup(recorders)
+
+
+def format_name(name: Any) -> str:
+    """Format the name of a span, which can be an AST node."""
+    if isinstance(name, ast.Call):
+        callee = getattr(name.func, "id", type(name.func).__name__)
+        return f"{callee}() line {name.lineno}"
+    if isinstance(name, ast.AST):
+        return f"{type(name).__name__} line {getattr(name, 'lineno', '?')}"
+    return str(name)
+
+
+# Nothing is recorded if None, which is the case unless profiling or tracing
+_recorder: Optional[Recorder] = None
+
+R = TypeVar("R", bound=Optional[Recorder])
+
+
+def get_recorder() -> Optional[Recorder]:
+    return _recorder
+
+
+@contextmanager
+def recording(recorder: R) -> Iterator[R]:
+    """Record the activity of the type checker while in the context."""
+    global _recorder
+    previous = _recorder
+    _recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _recorder = previous
+
+
+def span(category: str, name: Any) -> Any:
+    """Context manager recording a span of activity.
+
+    :param name: Only converted to string if recording,
+        so that nothing is formatted otherwise.
+    """
+    if _recorder is None:
+        return _NO_SPAN
+
+    return _Span(_recorder, category, name)
+
+
+def count(event: str) -> None:
+    if _recorder is not None:
+        _recorder.count(event)
+
+
+class _Span:
+    __slots__ = ("recorder", "category", "name")
+
+    def __init__(self, recorder: Recorder, category: str, name: Any):
+        self.recorder = recorder
+        self.category = category
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.recorder.enter(self.category, self.name)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.recorder.exit()
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Type, Union
+
+# Canonical object of each type inferred, by structure, see _structure
+_interned: dict[Any, Any] = {}
+
+
+def intern_type(type_: Type) -> Type:
+    """Get the canonical object of a type with the same structure as type_.
+
+    Types inferred for expressions are interned so that equal types are
+    the same object, which makes comparing them an identity check.
+    Types are only kept until :func:`clear_interned` is called at the
+    end of each run.
+    """
+    try:
+        return _interned.setdefault(_structure(type_), type_)
+    except TypeError:
+        # e.g. Literal of an unhashable value
+        return type_
+
+
+def make_union(types: Iterable[Type]) -> Type:
+    """Create the canonical union of types.
+
+    Nested unions are flattened and duplicates removed. The members are
+    sorted, so that the same set of types always gives the same union
+    whatever the order in which they were found.
+    """
+    members = set()
+    for type_ in types:
+        if getattr(type_, "__origin__", None) is Union:
+            members.update(type_.__args__)
+        else:
+            members.add(type_)
+
+    if len(members) == 1:
+        return intern_type(members.pop())
+
+    return intern_type(Union[tuple(sorted(members, key=repr))])
+
+
+def interned_count() -> int:
+    return len(_interned)
+
+
+def clear_interned() -> None:
+    _interned.clear()
+
+
+def _structure(type_: Any) -> Any:
+    """Key identifying a type by its structure.
+
+    Unlike the equality of types, the order of the arguments matters
+    (``Union[int, str] == Union[str, int]``), and so do the types of
+    literal values (``Literal[1]`` and ``Literal[True]``).
+    """
+    if isinstance(type_, type):
+        return type_
+
+    # typing.get_origin and typing.get_args are only available since 3.8
+    origin = getattr(type_, "__origin__", None)
+    if origin is None:
+        return type(type_), type_
+
+    args = getattr(type_, "__args__", None) or ()
+    return type(type_), origin, tuple(_structure(arg) for arg in args)
@@ -1,19 +1,79 @@
 from __future__ import annotations
 
 import warnings
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Type, Union, Any, Optional, Tuple
 from inspect import isclass
 
+from typpy import instrumentation
+
+# The same few type pairs are checked over and over,
+# this is large enough to hold them for big code bases.
+SUBTYPE_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class SubtypeCacheInfo:
+    hits: int
+    misses: int
+    # Calls that could not use the cache because a type is not hashable
+    unhashable: int
+    maxsize: int
+    currsize: int
+
+
+_unhashable_calls = 0
+
 
 # TODO: test
 def is_subtype(act_type: Optional[Type], exp_type: Optional[Type]) -> bool:
+    instrumentation.count("is_subtype")
+    try:
+        return _cached_is_subtype(act_type, exp_type)
+    except TypeError:
+        if _is_hashable(act_type) and _is_hashable(exp_type):
+            raise
+
+    global _unhashable_calls
+    _unhashable_calls += 1
+    return _is_subtype(act_type, exp_type)
+
+
+def subtype_cache_info() -> SubtypeCacheInfo:
+    info = _cached_is_subtype.cache_info()
+    return SubtypeCacheInfo(
+        hits=info.hits,
+        misses=info.misses,
+        unhashable=_unhashable_calls,
+        maxsize=info.maxsize,
+        currsize=info.currsize,
+    )
+
+
+def clear_subtype_cache() -> None:
+    global _unhashable_calls
+    _unhashable_calls = 0
+    _cached_is_subtype.cache_clear()
+
+
+def _is_hashable(obj: Any) -> bool:
+    try:
+        hash(obj)
+    except TypeError:
+        return False
+
+    return True
+
+
+def _is_subtype(act_type: Optional[Type], exp_type: Optional[Type]) -> bool:
     act_type = type(None) if act_type is None else act_type
     exp_type = type(None) if exp_type is None else exp_type
 
-    if isinstance(act_type, str):
-        act_type = eval(act_type)
-    if isinstance(exp_type, str):
-        exp_type = eval(exp_type)
+    if isinstance(act_type, str) or isinstance(exp_type, str):
+        # String annotations are resolved in the namespace of their
+        # module, see ForwardRefs, those left cannot be checked
+        return True
 
     # optimization for common use case
     if act_type is exp_type:
@@ -53,6 +113,9 @@ def is_subtype(act_type: Optional[Type], exp_type: Optional[Type]) -> bool:
     )
 
 
+_cached_is_subtype = lru_cache(maxsize=SUBTYPE_CACHE_SIZE)(_is_subtype)
+
+
 def _check_union(act_type: Type, exp_type: Union) -> bool:
     # If the act_type is an Union, check that act_type is a subset
     if getattr(act_type, "__origin__", None) is Union:
@@ -1,19 +1,39 @@
 from __future__ import annotations
 
 import sys
+from typing import Iterable, Optional
 
 from colorama import Fore, Style
 
 from typpy.error import TypingError
+from typpy.source import SourceCache
 
 
-# TODO: tests
-def print_errors(errors: list[TypingError], print_context: bool = True) -> None:
+def print_errors(
+    errors: Iterable[TypingError],
+    print_context: bool = True,
+    sources: Optional[SourceCache] = None,
+) -> int:
+    """Print errors as they come, grouped by file.
+
+    :param errors: Errors of the same file must come one after the other.
+    :param sources: Source files already read during the run,
+        used to print the context of the errors.
+    :return: The number of errors. If any, a summary is printed last.
+    """
+    if sources is None:
+        sources = SourceCache()
+
     last_file = None
 
     num_files = 0
+    num_errors = 0
     for error in errors:
+        num_errors += 1
         if error.file != last_file:
+            # Show the errors of the previous file right away,
+            # even when the output is not a terminal
+            sys.stdout.flush()
             print(f"{Style.BRIGHT}{error.file}{Style.RESET_ALL}", file=sys.stderr)
             last_file = error.file
             num_files += 1
@@ -26,9 +46,7 @@ def print_errors(errors: list[TypingError], print_context: bool = True) -> None:
             file=sys.stderr,
         )
         if print_context:
-            # TODO: cache text
-            content = error.file.read_text().split("\n")
-            snippet = content[error.line_number - 1]
+            snippet = sources.get(error.file).line(error.line_number)
 
             if error.end_column_number is None:
                 cursor_char = "^"
@@ -53,5 +71,8 @@ def print_errors(errors: list[TypingError], print_context: bool = True) -> None:
                 f"{Style.BRIGHT}{Fore.RED}{cursor}{Style.RESET_ALL}\n"
             )
 
-    print()
-    print(f"Found {len(errors)} errors in {num_files} files")
+    if num_errors:
+        print()
+        print(f"Found {num_errors} errors in {num_files} files")
+
+    return num_errors
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import ast
+import gc
+import logging
+import multiprocessing
+from collections import Counter
+from contextlib import contextmanager
+from importlib import import_module
+from multiprocessing.context import BaseContext
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from typpy import instrumentation
+from typpy.resolver import Resolver
+from typpy.scope import get_builtin_scope
+from typpy.source import SourceCache
+
+
+def find_common_imports(
+    files: Iterable[Path],
+    top: int,
+    sources: Optional[SourceCache] = None,
+) -> list[str]:
+    """Find the modules imported by the most files.
+
+    Relative imports and the packages of the files themselves are
+    skipped: only dependencies are worth preloading.
+    """
+    sources = SourceCache() if sources is None else sources
+    resolver = Resolver()
+
+    checked_packages = set()
+    counts: Counter[str] = Counter()
+    for file in files:
+        checked_packages.add(resolver.resolve(file)[0].split(".")[0])
+        try:
+            tree = ast.parse(sources.get(file).text)
+        except (OSError, SyntaxError, ValueError):
+            continue
+
+        # Each module is only counted once per file
+        counts.update(_find_imports(tree))
+
+    for module_name in list(counts):
+        package = module_name.split(".")[0]
+        if package in checked_packages or package == "__future__":
+            del counts[module_name]
+
+    return [module_name for module_name, _ in counts.most_common(top)]
+
+
+def _find_imports(tree: ast.AST) -> set[str]:
+    imports = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+            imports.add(node.module)
+
+    return imports
+
+
+def preload_modules(module_names: Iterable[str]) -> list[str]:
+    """Import modules to be inherited by forked worker processes.
+
+    Modules failing to import are skipped with a warning, they
+    are imported again by the workers to report the error.
+    :return: The names of the modules imported.
+    """
+    # Shared by all checks, like the preloaded modules
+    get_builtin_scope()
+
+    preloaded = []
+    for module_name in module_names:
+        try:
+            with instrumentation.span("import", module_name):
+                import_module(module_name)
+        except Exception as e:
+            logging.warning("Could not preload module %s: %s", module_name, e)
+        else:
+            preloaded.append(module_name)
+
+    return preloaded
+
+
+@contextmanager
+def frozen_objects() -> Iterator[None]:
+    """Keep the existing objects out of garbage collections while forking.
+
+    Collections would otherwise write to the pages of the preloaded
+    objects in the forked processes and defeat copy-on-write. The
+    objects are collected again by the parent process afterwards.
+    """
+    gc.freeze()
+    try:
+        yield
+    finally:
+        gc.unfreeze()
+
+
+def get_fork_context() -> Optional[BaseContext]:
+    """Context starting processes with fork, or None if not supported."""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context("fork")
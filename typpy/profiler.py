@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from typpy.instrumentation import Recorder, format_name
+
+# Phases of the type checker, as categories of spans
+PHASES = {
+    "file": "other (caching, bookkeeping)",
+    "import": "find modules",
+    "module": "load and run modules",
+    "parse": "parse source",
+    "signature": "inspect signatures",
+    "scope": "check scopes",
+    "statement": "check statements",
+    "call": "check calls",
+}
+
+# Categories of spans whose time is also reported by name
+NAMED_CATEGORIES = {"file", "scope"}
+
+
+@dataclass
+class Profile:
+    """Time spent in each phase, file and scope of a run."""
+
+    # Time spent in each category of spans, excluding nested spans
+    phases: dict[str, float] = field(default_factory=dict)
+    # Time spent in each span, by category and name. Nested
+    # spans of the same category (e.g. sub-scopes) are excluded.
+    spans: dict[str, dict[str, float]] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=dict)
+    wall_time: float = 0.0
+
+    def merge(self, other: "Profile") -> None:
+        for category, seconds in other.phases.items():
+            self.phases[category] = self.phases.get(category, 0.0) + seconds
+
+        for category, spans in other.spans.items():
+            category_spans = self.spans.setdefault(category, {})
+            for name, seconds in spans.items():
+                category_spans[name] = category_spans.get(name, 0.0) + seconds
+
+        for event, number in other.counts.items():
+            self.counts[event] = self.counts.get(event, 0) + number
+
+    def slowest(self, category: str, top: int) -> list[tuple[str, float]]:
+        spans = self.spans.get(category, {})
+        return sorted(spans.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    def to_dict(self, top: int = 10) -> dict[str, Any]:
+        """Convert to a JSON serializable dictionary."""
+        data = asdict(self)
+        data["slowest_files"] = dict(self.slowest("file", top))
+        data["slowest_scopes"] = dict(self.slowest("scope", top))
+        return data
+
+    def format(self, top: int = 10) -> str:
+        total = sum(self.phases.values())
+        lines = [f"Wall time: {self.wall_time * 1e3:.1f} ms", "", "Phase"]
+        for category, seconds in sorted(
+            self.phases.items(), key=lambda item: item[1], reverse=True
+        ):
+            share = seconds / total * 100 if total else 0
+            label = PHASES.get(category, category)
+            lines.append(f"  {label:<30} {seconds * 1e3:>9.1f} ms {share:>5.1f}%")
+
+        for title, category in [("Slowest files", "file"), ("Slowest scopes", "scope")]:
+            lines += ["", title]
+            for name, seconds in self.slowest(category, top):
+                lines.append(f"  {seconds * 1e3:>9.1f} ms  {name}")
+
+        lines += ["", "Counts"]
+        for event, number in sorted(self.counts.items()):
+            lines.append(f"  {event:<30} {number:>9}")
+
+        return "\n".join(lines)
+
+
+class Profiler(Recorder):
+    """Aggregate the time spent in each phase of the type checker."""
+
+    def __init__(self):
+        self.profile = Profile()
+        # Category, name, start time, time of nested spans, and
+        # time of nested spans of the same category
+        self._stack: list[list[Any]] = []
+
+    def enter(self, category: str, name: Any) -> None:
+        self._stack.append([category, name, time.perf_counter(), 0.0, 0.0])
+
+    def exit(self) -> None:
+        category, name, start, nested, nested_same = self._stack.pop()
+        duration = time.perf_counter() - start
+
+        phases = self.profile.phases
+        phases[category] = phases.get(category, 0.0) + duration - nested
+
+        if category in NAMED_CATEGORIES:
+            spans = self.profile.spans.setdefault(category, {})
+            name = format_name(name)
+            spans[name] = spans.get(name, 0.0) + duration - nested_same
+
+        if self._stack:
+            self._stack[-1][3] += duration
+        for frame in reversed(self._stack):
+            if frame[0] == category:
+                frame[4] += duration
+                break
+
+    def count(self, event: str) -> None:
+        counts = self.profile.counts
+        counts[event] = counts.get(event, 0) + 1
+
+    def merge(self, other: Recorder) -> None:
+        if isinstance(other, Profiler):
+            self.profile.merge(other.profile)
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import ast
 import inspect
-from typing import Any, Optional, Type
+from typing import Any, Iterator, Optional, Type
 import warnings
 from functools import lru_cache
 
+from typpy import instrumentation
+from typpy.binding import BindingPlan
+from typpy.forward_refs import ForwardRefs, get_namespace
+from typpy.signatures import get_signature
+
 
 @lru_cache(maxsize=None)
 def get_builtin_scope() -> "Scope":
@@ -16,28 +22,72 @@ def get_builtin_scope() -> "Scope":
     return parse_scope(BuiltinContainer())
 
 
+class Unknown:
+    """Value of a symbol that cannot be known without running code,
+    e.g. a decorated function or a name imported from a third-party
+    module that is not imported.
+
+    Calls to unknown symbols are not checked, and return ``Any``.
+    """
+
+    __signature__ = inspect.Signature(
+        [
+            inspect.Parameter("args", inspect.Parameter.VAR_POSITIONAL),
+            inspect.Parameter("kwargs", inspect.Parameter.VAR_KEYWORD),
+        ],
+        return_annotation=Any,
+    )
+
+    def __init__(self, name: str):
+        self.__name__ = name
+        self.__qualname__ = name
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError(f"'{self.__name__}' is only known statically")
+
+    def __repr__(self) -> str:
+        return f"<unknown {self.__name__}>"
+
+
 class Scope:
     def __init__(
         self,
         name: str,
         parent: "Optional[Scope]" = None,
+        container: Any = None,
     ):
         self.name = name
         self.parent = parent
+        # Symbols of the container are only parsed when they are looked up
+        self.container = container
 
         self.file = None
         self.qualified_name = None
+        # Global namespace of the code in this scope
+        self.namespace: dict[str, Any] = {}
         if parent is None:
+            self.forward_refs = ForwardRefs()
             # Avoid recursion
             if name != "BuiltinContainer":
                 self.parent = get_builtin_scope()
         else:
             self.file = parent.file
             self.qualified_name = f"{parent.qualified_name}.{name}"
+            self.namespace = parent.namespace
+            # String annotations are resolved once for the whole file
+            self.forward_refs = parent.forward_refs
 
         self.variables: dict[str, Type] = {}
         self.types = {}
         self.callables = {}
+        # Compiled when a callable is first called, see resolve_binding_plan
+        self.binding_plans: dict[str, BindingPlan] = {}
+        # Symbols of the container that are not callables with a signature
+        self._not_callables: set[str] = set()
+        # Type and errors of the expressions of this scope already checked,
+        # by node, as a statement can look at the same expression many times
+        self.expr_types: dict[ast.expr, Any] = {}
+        self.expr_errors: dict[ast.expr, list[Any]] = {}
 
     def add_variable(self, name: str, annotation: Type) -> None:
         self.variables[name] = annotation
@@ -50,16 +100,81 @@ class Scope:
         return annotation
 
     def add_callable(self, name: str, obj: Any, cb: inspect.Signature) -> None:
+        # Annotations are resolved in the namespace of the module defining
+        # the callable, which is not always the module of this scope.
+        cb = self.forward_refs.resolve_signature(cb, get_namespace(obj))
         self.callables[name] = (obj, cb)
+        self.binding_plans.pop(name, None)
+
+    def resolve_annotation(self, annotation: Any) -> Any:
+        """Resolve a string annotation used in this scope."""
+        return self.forward_refs.resolve(annotation, self.namespace)
 
     def resolve_callable(self, name: str) -> Optional[tuple[Any, inspect.Signature]]:
         obj, cb = self.callables.get(name, (None, None))
+        if cb is None:
+            obj, cb = self._parse_callable(name)
 
         if cb is None and self.parent is not None:
             return self.parent.resolve_callable(name)
 
         return obj, cb
 
+    def resolve_binding_plan(self, name: str) -> tuple[Any, Optional[BindingPlan]]:
+        """Like :meth:`resolve_callable`, with the plan binding call
+        arguments to the signature instead of the signature.
+
+        The plan is compiled once and kept in the scope defining the
+        callable, so that all the calls to it share the plan.
+        """
+        plan = self.binding_plans.get(name)
+        if plan is not None:
+            return self.callables[name][0], plan
+
+        obj, cb = self.callables.get(name, (None, None))
+        if cb is None:
+            obj, cb = self._parse_callable(name)
+
+        if cb is None:
+            if self.parent is not None:
+                return self.parent.resolve_binding_plan(name)
+            return None, None
+
+        plan = BindingPlan.from_signature(cb)
+        self.binding_plans[name] = plan
+        return obj, plan
+
+    def iter_callables(self) -> Iterator[tuple[str, Any]]:
+        """Iterate over the callables defined in the container of this scope,
+        without computing their signatures."""
+        for symbol, obj in self._symbols().items():
+            if callable(obj):
+                yield symbol, obj
+
+    def _parse_callable(self, name: str) -> tuple[Any, Optional[inspect.Signature]]:
+        if name in self._not_callables:
+            return None, None
+
+        obj = self._symbols().get(name, None)
+        if obj is None or not callable(obj):
+            self._not_callables.add(name)
+            return None, None
+
+        try:
+            with instrumentation.span("signature", name):
+                signature = get_signature(obj)
+        except ValueError:
+            # This happens for certain builtin magic stuff
+            warnings.warn(f"inspect.signature does not work for {obj}")
+            self._not_callables.add(name)
+            return None, None
+
+        self.add_callable(name, obj, signature)
+        return self.callables[name]
+
+    def _symbols(self) -> dict[str, Any]:
+        return getattr(self.container, "__dict__", {})
+
     @staticmethod
     def _format_dict(dictionary: dict[str, Any]) -> str:
         if dictionary:
@@ -83,19 +198,11 @@ def parse_scope(
     container: Any,
     parent_scope: Optional[Scope] = None,
 ) -> Scope:
-    """Populate scope with all existing symbols."""
-    scope = Scope(container.__name__, parent_scope)
-
-    objects = dict(container.__dict__)
-    for symbol, obj in objects.items():
-        if callable(obj):
-            try:
-                signature = inspect.signature(obj)
-            except ValueError:
-                # This happens for certain builtin magic stuff
-                warnings.warn(f"inspect.signature does not work for {obj}")
-                continue
-
-            scope.add_callable(symbol, obj, signature)
+    """Create the scope of a container (module, class or function).
 
+    The signatures of the symbols of the container are only computed
+    when they are first looked up, see :meth:`Scope.resolve_callable`.
+    """
+    scope = Scope(container.__name__, parent_scope, container)
+    scope.namespace = get_namespace(container)
     return scope
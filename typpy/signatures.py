@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import inspect
+import logging
+import os
+import pickle
+import sys
+import sysconfig
+import weakref
+from functools import lru_cache
+from importlib.machinery import FrozenImporter, PathFinder
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Optional
+
+from typpy import instrumentation
+from typpy.version import PYTHON_VERSION, __version__
+
+_STDLIB_PATH = os.path.normcase(os.path.abspath(sysconfig.get_paths()["stdlib"]))
+
+
+def get_signature(obj: Any) -> inspect.Signature:
+    """Get the signature of a callable, like ``inspect.signature``.
+
+    Signatures of builtins and of the standard library are read from
+    a database that persists between runs, since they are the same
+    for every run with the same interpreter.
+
+    Signatures are also kept in memory for the whole process, see
+    :class:`SignatureCache`.
+
+    :raise ValueError: If no signature can be provided for obj.
+    """
+    signature = _cache.get(obj)
+    if signature is None:
+        signature = _compute_signature(obj)
+        _cache.set(obj, signature)
+
+    return signature
+
+
+def _compute_signature(obj: Any) -> inspect.Signature:
+    key = _get_stdlib_key(obj)
+    if key is None:
+        return inspect.signature(obj)
+
+    return get_signature_database().signature(obj, key)
+
+
+class SignatureCache:
+    """Signatures of the callables seen by this process.
+
+    The same function is seen by many scopes, e.g. when it is imported
+    by several modules, so its signature is computed once and shared.
+    Callables are identified by their id, and are removed from the cache
+    when they are garbage collected, before their id can be reused.
+    Callables that cannot be weakly referenced (e.g. builtin functions)
+    are not cached.
+    """
+
+    def __init__(self) -> None:
+        self._signatures: dict[int, inspect.Signature] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, obj: Any) -> Optional[inspect.Signature]:
+        signature = self._signatures.get(id(obj))
+        if signature is None:
+            self.misses += 1
+            instrumentation.count("signature cache miss")
+        else:
+            self.hits += 1
+            instrumentation.count("signature cache hit")
+
+        return signature
+
+    def set(self, obj: Any, signature: inspect.Signature) -> None:
+        key = id(obj)
+        if key in self._signatures:
+            return
+
+        try:
+            finalizer = weakref.finalize(obj, self._signatures.pop, key, None)
+        except TypeError:
+            return
+        finalizer.atexit = False
+
+        self._signatures[key] = signature
+
+    def clear(self) -> None:
+        self._signatures.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._signatures),
+        }
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+_cache = SignatureCache()
+
+
+def get_signature_cache() -> SignatureCache:
+    return _cache
+
+
+class SignatureDatabase:
+    """Signatures of standard library callables, stored on disk.
+
+    The database is only loaded when the first signature is looked up,
+    and only written if new signatures have been added.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        """
+        :param path: File storing the database. If None,
+            signatures are only kept in memory.
+        """
+        self.path = path
+        self._signatures: Optional[dict[str, Optional[inspect.Signature]]] = None
+        self._new_keys: set[str] = set()
+
+    def signature(self, obj: Any, key: str) -> inspect.Signature:
+        signatures = self._load()
+
+        if key in signatures:
+            signature = signatures[key]
+        else:
+            try:
+                signature = inspect.signature(obj)
+            except ValueError:
+                signature = None
+
+            signatures[key] = signature
+            self._new_keys.add(key)
+
+        if signature is None:
+            raise ValueError(f"no signature found for {obj}")
+
+        return signature
+
+    def save(self) -> None:
+        if self.path is None or not self._new_keys:
+            return
+
+        # Other processes could have added signatures in the meantime
+        signatures = self._read()
+        for key in self._new_keys:
+            signature = self._signatures[key]
+            try:
+                pickle.dumps(signature)
+            except Exception:
+                # Some annotations or defaults cannot be serialized
+                continue
+
+            signatures[key] = signature
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile(
+                "wb", dir=self.path.parent, suffix=".tmp", delete=False
+            ) as file:
+                pickle.dump(signatures, file)
+            os.replace(file.name, self.path)
+        except OSError as e:
+            logging.debug("Cannot write signature database %s: %s", self.path, e)
+            return
+
+        self._new_keys.clear()
+
+    def _load(self) -> dict[str, Optional[inspect.Signature]]:
+        if self._signatures is None:
+            self._signatures = self._read()
+
+        return self._signatures
+
+    def _read(self) -> dict[str, Optional[inspect.Signature]]:
+        if self.path is None:
+            return {}
+
+        try:
+            with self.path.open("rb") as file:
+                return pickle.load(file)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.debug("Cannot read signature database %s: %s", self.path, e)
+            return {}
+
+
+def default_signature_database_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return (
+        Path(cache_home)
+        / "typpy"
+        / f"signatures-{PYTHON_VERSION}-typpy-{__version__}.pickle"
+    )
+
+
+_database: Optional[SignatureDatabase] = None
+
+
+def get_signature_database() -> SignatureDatabase:
+    global _database
+    if _database is None:
+        _database = SignatureDatabase(default_signature_database_path())
+
+    return _database
+
+
+def set_signature_database(database: Optional[SignatureDatabase]) -> None:
+    """Replace the signature database. If None, the default one is used."""
+    global _database
+    _database = database
+
+
+def save_signature_database() -> None:
+    if _database is not None:
+        _database.save()
+
+
+def _get_stdlib_key(obj: Any) -> Optional[str]:
+    if not (inspect.isroutine(obj) or inspect.isclass(obj)):
+        return None
+
+    module_name = getattr(obj, "__module__", None)
+    qualified_name = getattr(obj, "__qualname__", None)
+    if not isinstance(module_name, str) or not isinstance(qualified_name, str):
+        return None
+
+    # Local functions and lambdas do not have a unique name
+    if "<" in qualified_name:
+        return None
+
+    if not is_stdlib_module(module_name):
+        return None
+
+    return f"{module_name}:{qualified_name}"
+
+
+@lru_cache(maxsize=None)
+def is_stdlib_module(module_name: str) -> bool:
+    """Whether an imported module is part of the standard library."""
+    if module_name in sys.builtin_module_names:
+        return True
+
+    file = getattr(sys.modules.get(module_name), "__file__", None)
+    if file is None:
+        return False
+
+    return is_stdlib_file(file)
+
+
+@lru_cache(maxsize=None)
+def is_stdlib_package(name: str) -> bool:
+    """Whether a top-level module is part of the standard library,
+    without importing it."""
+    if name in sys.builtin_module_names:
+        return True
+    if hasattr(sys, "stdlib_module_names"):
+        return name in sys.stdlib_module_names
+
+    # Before python 3.10, look at where the module would be loaded from.
+    # Only the default finders are used, the ones of sys.meta_path can
+    # depend on this function.
+    if FrozenImporter.find_spec(name) is not None:
+        return True
+    spec = PathFinder.find_spec(name)
+    if spec is None or spec.origin is None:
+        return False
+    return is_stdlib_file(spec.origin)
+
+
+def is_stdlib_file(file: str) -> bool:
+    path = os.path.normcase(os.path.abspath(file))
+    return path.startswith(_STDLIB_PATH + os.sep) and "-packages" not in path
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+from importlib.util import decode_source
+from pathlib import Path
+from typing import Optional
+
+
+class SourceFile:
+    """Content of a source file, decoded and split into lines on demand."""
+
+    def __init__(self, path: Path, data: bytes):
+        self.path = path
+        self.data = data
+        self._text: Optional[str] = None
+        self._line_offsets: Optional[list[int]] = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            # Same decoding (encoding declaration, universal
+            # newlines) as the one used when importing the file
+            self._text = decode_source(self.data)
+
+        return self._text
+
+    def line(self, line_number: int) -> str:
+        """Get a line of the file, without its line ending.
+
+        :param line_number: Line number, starting from 1.
+        """
+        line_offsets = self._get_line_offsets()
+        start = line_offsets[line_number - 1]
+        if line_number < len(line_offsets):
+            end = line_offsets[line_number] - 1
+        else:
+            end = len(self.text)
+
+        return self.text[start:end]
+
+    def _get_line_offsets(self) -> list[int]:
+        if self._line_offsets is None:
+            text = self.text
+            line_offsets = [0]
+            index = text.find("\n")
+            while index != -1:
+                line_offsets.append(index + 1)
+                index = text.find("\n", index + 1)
+
+            self._line_offsets = line_offsets
+
+        return self._line_offsets
+
+
+class SourceCache:
+    """Read each source file only once per run.
+
+    The same file is needed to parse it, to hash it for the result cache
+    and to print the context of each of its errors.
+    """
+
+    def __init__(self):
+        self._files: dict[Path, SourceFile] = {}
+
+    def get(self, path: Path) -> SourceFile:
+        """:raise OSError: If the file cannot be read."""
+        path = Path(os.path.abspath(path))
+        source = self._files.get(path)
+        if source is None:
+            source = SourceFile(path, path.read_bytes())
+            self._files[path] = source
+
+        return source
+
+    def discard(self, path: Path) -> None:
+        """Forget a file, which is read again if it is needed later."""
+        self._files.pop(Path(os.path.abspath(path)), None)
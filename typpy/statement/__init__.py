@@ -1,5 +1,7 @@
-from typpy.statement.check import check_statement
+from typpy.statement.check import check_body, check_statement, register_statement_check
 
 __all__ = [
+    "check_body",
     "check_statement",
+    "register_statement_check",
 ]
@@ -1,36 +1,78 @@
 import ast
 import logging
 import warnings
-from typing import List
+from typing import Callable, List, Type
 
+from typpy import instrumentation
+from typpy.dispatch import Dispatcher
 from typpy.error import TypingError
 from typpy.expression import check_expression
 from typpy.scope import Scope
 from typpy.statement.assignment import check_assignment
 
+StatementCheck = Callable[[ast.stmt, Scope], List[TypingError]]
+
 
 def check_statement(stmt: ast.stmt, scope: Scope) -> List[TypingError]:
+    with instrumentation.span("statement", stmt):
+        return _check_statement(stmt, scope)
+
+
+def _check_statement(stmt: ast.stmt, scope: Scope) -> List[TypingError]:
     logging.debug("stmt: %s" % stmt)
+    return _checks.get(type(stmt))(stmt, scope)
 
-    # These two are already evaluated by the module import
-    # and are retrieved dynamically instead of parsed.
-    if isinstance(stmt, (ast.ClassDef, ast.FunctionDef)):
-        return []
 
-    errors = []
-    if isinstance(stmt, ast.If):
-        errors = check_expression(stmt.test, scope)
-    elif isinstance(stmt, (ast.Assign, ast.AnnAssign)):
-        errors = check_assignment(stmt, scope)
-    elif isinstance(stmt, ast.Expr):
-        errors = check_expression(stmt.value, scope)
-    else:
-        warnings.warn(
-            f"check for statement {stmt} is not implemented. Contact us for a fix."
-        )
+def _check_not_implemented(stmt: ast.stmt, scope: Scope) -> List[TypingError]:
+    warnings.warn(
+        f"check for statement {stmt} is not implemented. Contact us for a fix."
+    )
+    return check_body(stmt, scope)
+
+
+_checks = Dispatcher(_check_not_implemented)
+
+
+def register_statement_check(
+    *node_types: Type[ast.stmt],
+) -> Callable[[StatementCheck], StatementCheck]:
+    """Decorator registering the check of some statement classes,
+    replacing the check of typpy if any.
+
+    The check is called with the statement and its scope and returns
+    the errors found. Checks of statements with a body are responsible
+    for checking it, see :func:`check_body`.
+    """
+    return _checks.register(*node_types)
+
 
+def check_body(stmt: ast.stmt, scope: Scope) -> List[TypingError]:
+    """Check the statements of the body of a statement, if any."""
+    errors = []
     for sub_stmt in getattr(stmt, "body", []):
         new_errors = check_statement(sub_stmt, scope)
         errors.extend(new_errors)
 
     return errors
+
+
+@register_statement_check(ast.ClassDef, ast.FunctionDef)
+def _check_definition(stmt: ast.stmt, scope: Scope) -> List[TypingError]:
+    # These two are already evaluated by the module import
+    # and are retrieved dynamically instead of parsed.
+    return []
+
+
+@register_statement_check(ast.If)
+def _check_if(stmt: ast.If, scope: Scope) -> List[TypingError]:
+    errors = check_expression(stmt.test, scope)
+    errors.extend(check_body(stmt, scope))
+    return errors
+
+
+register_statement_check(ast.Assign, ast.AnnAssign)(check_assignment)
+
+
+@register_statement_check(ast.Expr)
+def _check_expr(stmt: ast.Expr, scope: Scope) -> List[TypingError]:
+    return check_expression(stmt.value, scope)
@@ -0,0 +1,427 @@
+from __future__ import annotations
+
+import ast
+import builtins
+import importlib.util
+import inspect
+import os
+import sys
+import types
+from importlib import import_module
+from importlib.machinery import PathFinder
+from typing import Any, Callable, Optional
+
+from typpy.importer import ModuleFinder
+from typpy.scope import Unknown
+from typpy.signatures import is_stdlib_package
+
+# Attribute of the classes built statically, holding their definition
+_NODE_ATTRIBUTE = "__typpy_node__"
+
+
+class StaticFunction:
+    """Function defined in a module that is not imported,
+    with the signature given by its definition."""
+
+    def __init__(
+        self,
+        node: ast.FunctionDef | ast.AsyncFunctionDef,
+        module_name: str,
+        qualified_name: str,
+        namespace: dict[str, Any],
+    ):
+        self.__name__ = node.name
+        self.__qualname__ = qualified_name
+        self.__module__ = module_name
+        # Annotations are evaluated in the namespace of the module
+        self.__globals__ = namespace
+        self.node = node
+
+    @property
+    def __signature__(self) -> inspect.Signature:
+        # Evaluated when looked up, once the whole module is bound
+        return _build_signature(self.node, self.__globals__)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError(f"'{self.__qualname__}' is only known statically")
+
+    def __repr__(self) -> str:
+        return f"<static function {self.__module__}.{self.__qualname__}>"
+
+
+def get_static_node(obj: Any) -> Optional[ast.AST]:
+    """Get the definition of a function or class built statically."""
+    if isinstance(obj, StaticFunction):
+        return obj.node
+    if inspect.isclass(obj):
+        return obj.__dict__.get(_NODE_ATTRIBUTE)
+    return None
+
+
+class StaticModuleBuilder:
+    """Build modules from the AST of their source, without running them.
+
+    The namespace of a module holds its functions, classes, type aliases
+    and imports. Modules of the checked packages are built statically too,
+    standard library modules are imported, and other modules are unknown.
+    """
+
+    def __init__(self, finder: ModuleFinder, parse: Callable[[str], ast.Module]):
+        """
+        :param finder: Maps the checked files to their module, and holds
+            the folders containing their packages.
+        :param parse: Parse the file at a path.
+        """
+        self.finder = finder
+        self.parse = parse
+        self.modules: dict[str, Any] = {}
+        # Files of the modules built statically that each module imports
+        self._dependencies: dict[str, dict[str, None]] = {}
+
+    def build(self, path: os.PathLike) -> types.ModuleType:
+        """Build the module of a checked file.
+
+        :raise SyntaxError: If the file cannot be parsed.
+        """
+        module_name = self.finder.add_file(path)
+        module = self.modules.get(module_name)
+        if isinstance(module, types.ModuleType):
+            # Already built when imported by another module
+            return module
+
+        return self._build(module_name, os.path.abspath(path))
+
+    def dependencies(self, module_name: str) -> list[str]:
+        """Files of the modules built statically imported by a module."""
+        return list(self._dependencies.get(module_name, {}))
+
+    def _build(self, module_name: str, file: str) -> types.ModuleType:
+        module = types.ModuleType(module_name)
+        module.__file__ = file
+        module.__typpy_static__ = True
+        is_package = os.path.basename(file) == "__init__.py"
+        if is_package and not module_name.endswith(".__init__"):
+            module.__path__ = [os.path.dirname(file)]
+            module.__package__ = module_name
+        else:
+            module.__package__ = module_name.rpartition(".")[0]
+
+        # Registered before binding, for import cycles
+        self.modules[module_name] = module
+        self._dependencies[module_name] = {}
+        try:
+            tree = self.parse(file)
+        except BaseException:
+            del self.modules[module_name]
+            raise
+
+        self._bind(tree.body, vars(module), module, module_name)
+        return module
+
+    def _bind(
+        self,
+        body: list[ast.stmt],
+        namespace: dict[str, Any],
+        module: types.ModuleType,
+        qualified_name: str,
+    ) -> None:
+        """Bind the symbols defined by statements to a namespace."""
+        prefix = "" if namespace is vars(module) else f"{qualified_name}."
+        for stmt in body:
+            if isinstance(stmt, ast.Import):
+                for alias in stmt.names:
+                    imported = self._import(alias.name, module.__name__)
+                    if alias.asname is not None:
+                        namespace[alias.asname] = imported
+                    else:
+                        top_level = alias.name.split(".")[0]
+                        namespace[top_level] = self._import(top_level, module.__name__)
+            elif isinstance(stmt, ast.ImportFrom):
+                self._bind_import_from(stmt, namespace, module)
+            elif isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if stmt.decorator_list:
+                    # Decorators can return anything
+                    namespace[stmt.name] = Unknown(stmt.name)
+                else:
+                    namespace[stmt.name] = StaticFunction(
+                        stmt, module.__name__, f"{prefix}{stmt.name}", vars(module)
+                    )
+            elif isinstance(stmt, ast.ClassDef):
+                namespace[stmt.name] = self._build_class(stmt, module, prefix)
+            elif isinstance(stmt, (ast.Assign, ast.AnnAssign)):
+                targets = (
+                    stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target]
+                )
+                if stmt.value is None:
+                    continue
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        namespace[target.id] = _evaluate_value(
+                            stmt.value, vars(module), target.id
+                        )
+            elif isinstance(stmt, (ast.If, ast.Try, ast.With)):
+                # e.g. imports in "if TYPE_CHECKING:" or "try: ... except ImportError:"
+                for block in ("body", "orelse", "finalbody"):
+                    self._bind(
+                        getattr(stmt, block, []), namespace, module, qualified_name
+                    )
+                for handler in getattr(stmt, "handlers", []):
+                    self._bind(handler.body, namespace, module, qualified_name)
+
+    def _bind_import_from(
+        self,
+        stmt: ast.ImportFrom,
+        namespace: dict[str, Any],
+        module: types.ModuleType,
+    ) -> None:
+        try:
+            base = importlib.util.resolve_name(
+                "." * stmt.level + (stmt.module or ""), module.__package__
+            )
+        except (ImportError, ValueError):
+            for alias in stmt.names:
+                namespace[alias.asname or alias.name] = Unknown(alias.name)
+            return
+
+        imported = self._import(base, module.__name__)
+        for alias in stmt.names:
+            if alias.name == "*":
+                if not isinstance(imported, Unknown):
+                    namespace.update(
+                        (name, value)
+                        for name, value in vars(imported).items()
+                        if not name.startswith("_")
+                    )
+                continue
+
+            value = getattr(imported, alias.name, None)
+            if value is None or isinstance(imported, Unknown):
+                # Symbols imported from a package can be submodules
+                value = self._import(f"{base}.{alias.name}", module.__name__)
+            namespace[alias.asname or alias.name] = value
+
+    def _build_class(
+        self, node: ast.ClassDef, module: types.ModuleType, prefix: str
+    ) -> Any:
+        if node.decorator_list or node.keywords:
+            # Decorators and metaclasses can change the class
+            return Unknown(node.name)
+
+        try:
+            bases = tuple(_evaluate(base, vars(module)) for base in node.bases)
+        except _NotStatic:
+            return Unknown(node.name)
+
+        namespace: dict[str, Any] = {
+            "__module__": module.__name__,
+            "__qualname__": f"{prefix}{node.name}",
+            _NODE_ATTRIBUTE: node,
+        }
+        self._bind(node.body, namespace, module, f"{prefix}{node.name}")
+        try:
+            return type(node.name, bases, namespace)
+        except Exception:
+            return Unknown(node.name)
+
+    def _import(self, module_name: str, importer: str) -> Any:
+        module = self.modules.get(module_name)
+        if module is not None:
+            self._add_dependency(importer, module)
+            return module
+
+        if module_name in sys.modules:
+            return sys.modules[module_name]
+
+        file = self._find_file(module_name)
+        if file is not None:
+            parent_name, _, child = module_name.rpartition(".")
+            parent = self._import(parent_name, importer) if parent_name else None
+            try:
+                module = self._build(module_name, file)
+            except (OSError, SyntaxError, ValueError):
+                return Unknown(module_name)
+            if isinstance(parent, types.ModuleType):
+                setattr(parent, child, module)
+            self._add_dependency(importer, module)
+            return module
+
+        # Importing the standard library does not run user code
+        if is_stdlib_package(module_name.split(".")[0]):
+            try:
+                return import_module(module_name)
+            except Exception:
+                pass
+
+        module = Unknown(module_name)
+        self.modules[module_name] = module
+        return module
+
+    def _find_file(self, module_name: str) -> Optional[str]:
+        """Find the source file of a module of the checked packages."""
+        file = self.finder.modules.get(module_name)
+        if file is not None:
+            return file
+
+        search_path: Optional[list[str]] = list(self.finder.roots)
+        spec = None
+        for end in range(1, module_name.count(".") + 2):
+            if not search_path:
+                return None
+            spec = PathFinder.find_spec(
+                ".".join(module_name.split(".")[:end]), search_path
+            )
+            if spec is None:
+                return None
+            search_path = spec.submodule_search_locations
+
+        if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+            return None
+        return spec.origin
+
+    def _add_dependency(self, importer: str, module: Any) -> None:
+        file = getattr(module, "__file__", None)
+        if getattr(module, "__typpy_static__", False) and file is not None:
+            self._dependencies.setdefault(importer, {})[file] = None
+
+
+class _NotStatic(Exception):
+    """Raised when an expression cannot be evaluated without running code."""
+
+
+def _evaluate(
+    node: ast.expr, namespace: dict[str, Any], types_only: bool = True
+) -> Any:
+    """Evaluate a type expression, e.g. an annotation, without calling
+    any code of the checked modules.
+
+    :param types_only: Whether unknown symbols and functions are rejected.
+    :raise _NotStatic: If the expression is not a type expression,
+        or refers to unknown symbols.
+    """
+    try:
+        value = _evaluate_node(node, namespace)
+    except _NotStatic:
+        raise
+    except Exception as e:
+        raise _NotStatic() from e
+
+    if types_only and isinstance(value, (Unknown, StaticFunction)):
+        raise _NotStatic()
+    return value
+
+
+def _evaluate_node(node: ast.expr, namespace: dict[str, Any]) -> Any:
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, str):
+            # String annotation
+            return _evaluate(ast.parse(node.value, mode="eval").body, namespace)
+        return node.value
+    elif isinstance(node, ast.Name):
+        if node.id in namespace:
+            return namespace[node.id]
+        if hasattr(builtins, node.id):
+            return getattr(builtins, node.id)
+        raise _NotStatic()
+    elif isinstance(node, ast.Attribute):
+        value = _evaluate(node.value, namespace)
+        return getattr(value, node.attr)
+    elif isinstance(node, ast.Subscript):
+        value = _evaluate(node.value, namespace)
+        return value[_evaluate(node.slice, namespace)]
+    elif isinstance(node, ast.Tuple):
+        return tuple(_evaluate(elt, namespace) for elt in node.elts)
+    elif isinstance(node, ast.List):
+        return [_evaluate(elt, namespace) for elt in node.elts]
+    elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        return _evaluate(node.left, namespace) | _evaluate(node.right, namespace)
+
+    raise _NotStatic()
+
+
+def _evaluate_value(node: ast.expr, namespace: dict[str, Any], name: str) -> Any:
+    """Evaluate the value assigned to a variable: literals, aliases
+    and type aliases are known, other values are unknown."""
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        pass
+
+    try:
+        return _evaluate(node, namespace, types_only=False)
+    except _NotStatic:
+        return Unknown(name)
+
+
+def _evaluate_annotation(node: Optional[ast.expr], namespace: dict[str, Any]) -> Any:
+    if node is None:
+        return inspect.Parameter.empty
+
+    try:
+        return _evaluate(node, namespace)
+    except _NotStatic:
+        # Do not report errors because of annotations that are not known
+        return Any
+
+
+def _build_signature(
+    node: ast.FunctionDef | ast.AsyncFunctionDef, namespace: dict[str, Any]
+) -> inspect.Signature:
+    args = node.args
+    parameters = []
+
+    # Positional-only parameters are only parsed since python 3.8
+    positional = [
+        (arg, inspect.Parameter.POSITIONAL_ONLY)
+        for arg in getattr(args, "posonlyargs", [])
+    ] + [(arg, inspect.Parameter.POSITIONAL_OR_KEYWORD) for arg in args.args]
+    # Defaults belong to the last positional parameters
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    for (arg, kind), default in zip(positional, defaults):
+        parameters.append(_build_parameter(arg, kind, default, namespace))
+
+    if args.vararg is not None:
+        parameters.append(
+            _build_parameter(
+                args.vararg, inspect.Parameter.VAR_POSITIONAL, None, namespace
+            )
+        )
+    for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+        parameters.append(
+            _build_parameter(arg, inspect.Parameter.KEYWORD_ONLY, default, namespace)
+        )
+    if args.kwarg is not None:
+        parameters.append(
+            _build_parameter(args.kwarg, inspect.Parameter.VAR_KEYWORD, None, namespace)
+        )
+
+    return inspect.Signature(
+        parameters,
+        return_annotation=(
+            inspect.Signature.empty
+            if node.returns is None
+            else _evaluate_annotation(node.returns, namespace)
+        ),
+    )
+
+
+def _build_parameter(
+    arg: ast.arg,
+    kind: Any,
+    default: Optional[ast.expr],
+    namespace: dict[str, Any],
+) -> inspect.Parameter:
+    if default is None:
+        default_value = inspect.Parameter.empty
+    else:
+        # Only whether there is a default matters
+        try:
+            default_value = ast.literal_eval(default)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            default_value = ...
+
+    return inspect.Parameter(
+        arg.arg,
+        kind,
+        default=default_value,
+        annotation=_evaluate_annotation(arg.annotation, namespace),
+    )
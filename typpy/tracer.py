@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from typpy.instrumentation import Recorder, format_name
+
+TRACE_FORMATS = ["chrome", "collapsed"]
+
+
+@dataclass(frozen=True)
+class TraceEvent:
+    category: str
+    name: str
+    # Seconds, from time.perf_counter
+    start: float
+    duration: float
+    # Duration minus the one of nested spans
+    self_duration: float
+    process_id: int
+    # Names of the enclosing spans, outermost first, and of this span
+    stack: tuple[str, ...]
+
+
+class Tracer(Recorder):
+    """Record every span of activity, to be opened in a trace viewer
+    (Chrome trace-event format) or a flame graph tool (collapsed stacks).
+    """
+
+    def __init__(self):
+        self.events: list[TraceEvent] = []
+        # Category, name, start time, time of nested spans
+        self._stack: list[list[Any]] = []
+        self._process_id: Optional[int] = None
+
+    def enter(self, category: str, name: Any) -> None:
+        self._stack.append([category, format_name(name), time.perf_counter(), 0.0])
+
+    def exit(self) -> None:
+        if self._process_id is None:
+            # Set lazily, forks are created in the parent process
+            self._process_id = os.getpid()
+
+        stack = tuple(f"{frame[0]} {frame[1]}" for frame in self._stack)
+        category, name, start, nested = self._stack.pop()
+        duration = time.perf_counter() - start
+        if self._stack:
+            self._stack[-1][3] += duration
+
+        self.events.append(
+            TraceEvent(
+                category=category,
+                name=name,
+                start=start,
+                duration=duration,
+                self_duration=duration - nested,
+                process_id=self._process_id,
+                stack=stack,
+            )
+        )
+
+    def merge(self, other: Recorder) -> None:
+        if isinstance(other, Tracer):
+            self.events.extend(other.events)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Complete ("X") events of the Chrome trace-event format."""
+        origin = min((event.start for event in self.events), default=0.0)
+        return {
+            "traceEvents": [
+                {
+                    "name": event.name,
+                    "cat": event.category,
+                    "ph": "X",
+                    "ts": (event.start - origin) * 1e6,
+                    "dur": event.duration * 1e6,
+                    "pid": event.process_id,
+                    "tid": event.process_id,
+                }
+                for event in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def collapsed_stacks(self) -> list[str]:
+        """Self time of each stack in microseconds, one "a;b;c time" per line."""
+        stacks: dict[str, float] = {}
+        for event in self.events:
+            # Semicolons separate the frames
+            stack = ";".join(frame.replace(";", ",") for frame in event.stack)
+            stacks[stack] = stacks.get(stack, 0.0) + event.self_duration
+
+        return [
+            f"{stack} {round(seconds * 1e6)}"
+            for stack, seconds in sorted(stacks.items())
+        ]
+
+    def write(self, path: Path, trace_format: str = "chrome") -> None:
+        if trace_format == "chrome":
+            path.write_text(json.dumps(self.chrome_trace()))
+        elif trace_format == "collapsed":
+            path.write_text("".join(f"{line}\n" for line in self.collapsed_stacks()))
+        else:
+            raise ValueError(f"Unknown trace format '{trace_format}'")
@@ -1,19 +1,57 @@
 import ast
 import inspect
 import logging
+import math
+import multiprocessing
+import os
+import queue
 import sys
+import traceback
 import types
-from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
 from importlib import import_module
+from multiprocessing.context import BaseContext
 from pathlib import Path
-from typing import Iterable, Generator, Any, List
+from typing import (
+    Iterable,
+    Iterator,
+    Generator,
+    Any,
+    List,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
+from typpy import instrumentation
+from typpy.ast_index import AstIndex
+from typpy.cache import ResultCache
 from typpy.error import TypingError
+from typpy.importer import (
+    ImportTimeoutError,
+    ModuleFinder,
+    import_timeout,
+    recording_modules,
+)
+from typpy.interning import clear_interned
+from typpy.preload import frozen_objects, get_fork_context, preload_modules
 from typpy.resolver import Resolver
 from typpy.scope import Scope, parse_scope
+from typpy.signatures import is_stdlib_module, save_signature_database
+from typpy.source import SourceCache
+from typpy.static_scope import StaticModuleBuilder, get_static_node
 from typpy.statement import check_statement
 
+# How the symbols of the checked modules are found, see TypeChecker
+IMPORT_MODES = ["import", "static", "fallback"]
+
+# Seconds between checks of the state of worker processes
+_POLL_INTERVAL = 0.1
+
 
 @dataclass(frozen=True)
 class FileModule:
@@ -24,63 +62,418 @@ class FileModule:
 
 # TODO: docstring, tests
 class TypeChecker:
-    def __init__(self):
+    def __init__(
+        self,
+        jobs: int = 1,
+        cache_dir: Optional[Path] = None,
+        sources: Optional[SourceCache] = None,
+        preload: Sequence[str] = (),
+        import_timeout: Optional[float] = None,
+        import_mode: str = "import",
+    ):
+        """
+        :param jobs: Number of processes checking files in parallel.
+            If 0, one process per CPU is used.
+        :param cache_dir: Directory where the errors of each file are
+            cached between runs. If None, files are always checked.
+        :param sources: Cache of the source files read during the run.
+        :param preload: Modules imported once before starting the worker
+            processes, which are forked to inherit them instead of
+            importing them again. Only used when checking in parallel.
+        :param import_timeout: Seconds after which the import of a checked
+            module is interrupted. Files failing to import are reported
+            with an error instead of stopping the run.
+        :param import_mode: How the symbols of the checked modules are
+            found. Either "import" to import the modules, "static" to build
+            them from their source without running any of their code, or
+            "fallback" to do so only for modules failing to import.
+        """
+        if import_mode not in IMPORT_MODES:
+            raise ValueError(f"Unknown import mode '{import_mode}'")
+
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        # Source files read during the run, also used to print errors
+        self.sources = SourceCache() if sources is None else sources
+        self.cache = None
+        if cache_dir is not None:
+            # Results depend on how the symbols are found
+            if import_mode != "import":
+                cache_dir = cache_dir / import_mode
+            # Failures depend on the timeout, only the default one is implied
+            options = {}
+            if import_timeout is not None:
+                options["import_timeout"] = import_timeout
+            self.cache = ResultCache(cache_dir, self.sources, options)
+        self.preload = list(preload)
+        self.import_timeout = import_timeout
+        self.import_mode = import_mode
         self.resolver = Resolver()
+        # Checked modules are imported by this finder, installed once per run
+        self.finder = ModuleFinder(self.resolver)
+        self.static_builder = StaticModuleBuilder(
+            self.finder, lambda file: self._get_ast_index(Path(file)).tree
+        )
+        # Each source file is parsed once and shared by all its scopes
+        self._ast_indexes: Dict[Path, AstIndex] = {}
 
     def check_files(self, files: Iterable[Path]) -> List[TypingError]:
-        pending_files = set(files)
-        processed_files = set()
+        # Remove duplicates, keeping the order stable
+        files = list(dict.fromkeys(files))
+        file_errors = dict(self.iter_check_files(files))
 
+        # Errors are reported in the order of the files,
+        # independently of which process finished first
         errors = []
+        for file in files:
+            errors.extend(file_errors[file])
+
+        return errors
+
+    def iter_check_files(
+        self, files: Iterable[Path]
+    ) -> Iterator[Tuple[Path, List[TypingError]]]:
+        """Check files, yielding the errors of each file as soon as it is checked.
+
+        Files are checked in order, unless they are checked in parallel:
+        then cached files come first, followed by the other files in the
+        order in which the worker processes finish them.
+        """
+        files = list(dict.fromkeys(files))
+        self.finder.add_files(files)
+
+        try:
+            with self.finder.installed(), recording_modules():
+                for file, errors in self._iter_check_files_in_order(files):
+                    yield file, errors
+                    # The errors have been handled by the caller, e.g.
+                    # printed with their context: memory does not grow
+                    # with the number of files checked.
+                    self._release_file(file)
+        finally:
+            save_signature_database()
+            # Do not keep the classes of the checked modules alive
+            clear_interned()
+
+    def _iter_check_files_in_order(
+        self, files: List[Path]
+    ) -> Iterator[Tuple[Path, List[TypingError]]]:
+        if self.jobs > 1 and len(files) > 1:
+            yield from self._iter_check_files_parallel(files)
+        else:
+            for file in files:
+                errors = self._get_cached_errors(file)
+                if errors is None:
+                    errors = self._check_file(file)
+                yield file, errors
+
+    def _get_cached_errors(self, file: Path) -> Optional[List[TypingError]]:
+        return None if self.cache is None else self.cache.get(file)
+
+    def _iter_check_files_parallel(
+        self, files: List[Path]
+    ) -> Iterator[Tuple[Path, List[TypingError]]]:
+        pending_files = []
+        for file in files:
+            cached_errors = self._get_cached_errors(file)
+            if cached_errors is None:
+                pending_files.append(file)
+            else:
+                yield file, cached_errors
+
+        if len(pending_files) <= 1:
+            for file in pending_files:
+                yield file, self._check_file(file)
+            return
+
+        mp_context = self._get_mp_context()
         while pending_files:
-            file = pending_files.pop()
-            new_errors = self._check_file(file)
-            errors.extend(new_errors)
-            processed_files.add(file)
+            batches = self._batch_files(pending_files)
+            finished = set()
+            try:
+                for file, errors in self._run_workers(batches, mp_context):
+                    finished.add(file)
+                    yield file, errors
+                return
+            except BrokenProcessPool:
+                pass
+
+            # A worker process died, e.g. because of a crash in an extension
+            # module. Workers check their batch in order, so the first file
+            # not finished of each batch may be the culprit: these are checked
+            # again on their own, and the other files in new worker processes.
+            suspects = []
+            for batch in batches:
+                unfinished = [file for file in batch if file not in finished]
+                suspects.extend(unfinished[:1])
+
+            for file in suspects:
+                yield file, self._check_file_isolated(file, mp_context)
+
+            pending_files = [
+                file
+                for file in pending_files
+                if file not in finished and file not in suspects
+            ]
+
+    def _run_workers(
+        self,
+        batches: List[List[Path]],
+        mp_context: Optional[BaseContext],
+    ) -> Iterator[Tuple[Path, List[TypingError]]]:
+        """Check batches of files in worker processes.
 
+        :raise BrokenProcessPool: If a worker process died.
+        """
+        recorder = instrumentation.get_recorder()
+        # Workers send the errors of each file as soon as it is checked,
+        # instead of returning the errors of the whole batch at once.
+        results = (mp_context or multiprocessing).Queue()
+        with ProcessPoolExecutor(
+            max_workers=min(self.jobs, len(batches)),
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(results,),
+        ) as executor:
+            # The workers are forked when the first batch is submitted,
+            # from a process with the preloaded modules if any
+            with nullcontext() if mp_context is None else frozen_objects():
+                futures = [
+                    executor.submit(
+                        _check_batch,
+                        batch,
+                        self.cache_dir,
+                        self.import_timeout,
+                        self.import_mode,
+                        None if recorder is None else recorder.fork(),
+                    )
+                    for batch in batches
+                ]
+
+            remaining = sum(len(batch) for batch in batches)
+            while remaining:
+                try:
+                    file, errors = results.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    # Raise the exception of failed workers
+                    for future in futures:
+                        if future.done():
+                            future.result()
+                    continue
+
+                remaining -= 1
+                yield file, errors
+
+            if recorder is not None:
+                for future in futures:
+                    recorder.merge(future.result())
+
+    def _check_file_isolated(
+        self, file: Path, mp_context: Optional[BaseContext]
+    ) -> List[TypingError]:
+        """Check a file alone in a worker process, reporting an error
+        if the process dies."""
+        try:
+            [(_, errors)] = self._run_workers([[file]], mp_context)
+            return errors
+        except BrokenProcessPool:
+            pass
+
+        module_name, _ = self.resolver.resolve(file)
+        errors = [
+            TypingError(
+                file=file,
+                line_number=1,
+                column_number=0,
+                end_column_number=None,
+                message=f"Could not import module '{module_name}': "
+                "the process importing it died",
+            )
+        ]
+        if self.cache is not None:
+            self.cache.set(file, errors, [])
         return errors
 
+    def _get_mp_context(self) -> Optional[BaseContext]:
+        """Preload modules, returning the context forking the workers.
+
+        Returns None to start the workers the default way
+        if there is nothing to preload.
+        """
+        # Nothing is imported when checking statically
+        if not self.preload or self.import_mode == "static":
+            return None
+
+        mp_context = get_fork_context()
+        if mp_context is None:
+            logging.warning("Cannot preload modules, processes cannot be forked")
+            return None
+
+        preload_modules(self.preload)
+        return mp_context
+
+    def _batch_files(self, files: List[Path]) -> List[List[Path]]:
+        """Split files into batches to be checked by the worker processes.
+
+        Files in the same batch share the folder containing their outermost
+        package, so that the modules they have in common are only imported
+        once per worker. Large packages are split in multiple batches
+        to keep all workers busy.
+        """
+        packages: Dict[Path, List[Path]] = {}
+        for file in files:
+            _, containing_path = self.resolver.resolve(file)
+            packages.setdefault(containing_path, []).append(file)
+
+        batch_size = math.ceil(len(files) / self.jobs)
+        batches = []
+        for package_files in packages.values():
+            for start in range(0, len(package_files), batch_size):
+                end = start + batch_size
+                batches.append(package_files[start:end])
+
+        return batches
+
     @contextmanager
     def import_module(self, path: Path) -> Generator[FileModule, None, None]:
-        module_name, containing_path = self.resolver.resolve(path)
+        with self.finder.installed():
+            yield self._import_file(path)
 
-        sys.path.append(str(containing_path))
-        try:
-            module = import_module(module_name)
-
-            yield FileModule(
-                qualified_name=module_name,
-                path=path,
-                module=module,
+    def _import_file(self, path: Path) -> FileModule:
+        module_name = self.finder.add_file(path)
+        if module_name in sys.modules and is_stdlib_module(module_name):
+            # Importing it would give the module of the standard library,
+            # which cannot be replaced while it is used.
+            raise ImportError(
+                "the module of the standard library with the same name is imported"
             )
-        finally:
-            sys.path.remove(str(containing_path))
+
+        with self.finder.installed(), import_timeout(self.import_timeout):
+            with instrumentation.span("import", module_name):
+                module = import_module(module_name)
+
+        return FileModule(
+            qualified_name=module_name,
+            path=path,
+            module=module,
+        )
 
     def _check_file(self, path: Path) -> List[TypingError]:
-        with self.import_module(path) as module:
-            scope = parse_scope(module.module)
-            # TODO: better way to bootstrap?
-            # Bootstrap scope qualified name
-            scope.file = path
-            scope.qualified_name = module.qualified_name
-            return self._check_scope_typing(module.module, scope)
+        with instrumentation.span("file", path):
+            if self.import_mode == "static":
+                errors, dependencies = self._check_static_file(path)
+            else:
+                errors, dependencies = self._check_imported_file(path)
+
+            if self.cache is not None and dependencies is not None:
+                self.cache.set(path, errors, dependencies)
+
+            return errors
+
+    def _check_imported_file(
+        self, path: Path
+    ) -> Tuple[List[TypingError], Optional[List[Path]]]:
+        """Check a file by importing it.
+
+        :return: The errors, and the files they depend on, or None if
+            they must not be cached.
+        """
+        try:
+            module = self._import_file(path)
+        except (Exception, SystemExit, ImportTimeoutError) as e:
+            # Report the failure and carry on with the other files
+            errors = [_import_error(path, self.resolver.resolve(path)[0], e)]
+            dependencies: Optional[List[Path]] = []
+            if isinstance(e, (ModuleNotFoundError, ImportTimeoutError)):
+                # Can succeed without any change to the sources, once the
+                # module is installed or given more time
+                dependencies = None
+            elif self.cache is not None:
+                dependencies = self._find_failure_dependencies(path, e)
+
+            if self.import_mode == "fallback":
+                static_errors, static_dependencies = self._check_static_file(path)
+                errors.extend(static_errors)
+                if dependencies is not None:
+                    dependencies.extend(static_dependencies)
+
+            return errors, dependencies
+
+        errors = self._check_module(path, module.qualified_name, module.module)
+        dependencies = []
+        if self.cache is not None:
+            tree = self._get_ast_index(path).tree
+            dependencies = self.cache.find_dependencies(tree, module.module.__package__)
+
+        return errors, dependencies
+
+    def _check_static_file(self, path: Path) -> Tuple[List[TypingError], List[Path]]:
+        """Check a file without importing it, see :class:`StaticModuleBuilder`."""
+        try:
+            with instrumentation.span("parse", path):
+                module = self.static_builder.build(path)
+        except (OSError, SyntaxError, ValueError) as e:
+            module_name, _ = self.resolver.resolve(path)
+            return [_import_error(path, module_name, e, action="parse")], []
+
+        errors = self._check_module(path, module.__name__, module)
+        dependencies = self.static_builder.dependencies(module.__name__)
+        return errors, [Path(dependency) for dependency in dependencies]
+
+    def _check_module(
+        self, path: Path, qualified_name: str, module: types.ModuleType
+    ) -> List[TypingError]:
+        scope = parse_scope(module)
+        # TODO: better way to bootstrap?
+        # Bootstrap scope qualified name
+        scope.file = path
+        scope.qualified_name = qualified_name
+        return self._check_scope_typing(module, scope)
+
+    def _find_failure_dependencies(
+        self, path: Path, exception: BaseException
+    ) -> List[Path]:
+        """Find the files a failed import depends on.
+
+        These are the modules imported before the failure, and the
+        files of the traceback, which include the module that failed
+        if it is a dependency.
+        """
+        dependencies = []
+        try:
+            tree = self._get_ast_index(path).tree
+        except (OSError, SyntaxError, ValueError):
+            pass
+        else:
+            module_name, _ = self.resolver.resolve(path)
+            package = module_name.rpartition(".")[0]
+            dependencies.extend(self.cache.find_dependencies(tree, package))
+
+        for frame in traceback.extract_tb(exception.__traceback__):
+            if frame.filename.endswith(".py") and os.path.isfile(frame.filename):
+                dependencies.append(Path(frame.filename))
+
+        return list(dict.fromkeys(dependencies))
 
     def _check_scope(
         self,
         obj: Any,
         parent_scope: Scope,
     ) -> List[TypingError]:
-        # Parse scope before everything else so that all symbols
-        # are already parsed and can be referenced without assuming
-        # they come before the checked statement.
+        # The scope holds all symbols of obj, so that they can be
+        # referenced without assuming they come before the checked statement.
         scope = parse_scope(obj, parent_scope)
         return self._check_scope_typing(obj, scope)
 
     def _check_scope_typing(self, obj: Any, scope: Scope) -> List[TypingError]:
-        tree = ast.parse(inspect.getsource(obj))
+        with instrumentation.span("scope", scope.qualified_name):
+            return self._check_scope_statements(obj, scope)
 
-        if not isinstance(obj, types.ModuleType):
-            tree = tree.body[0]
+    def _check_scope_statements(self, obj: Any, scope: Scope) -> List[TypingError]:
+        tree = self._get_scope_tree(obj)
+        if tree is None:
+            # No python source, e.g. builtins or C extensions
+            return []
 
         errors = []
         for stmt in tree.body:
@@ -88,11 +481,136 @@ class TypeChecker:
             errors.extend(new_errors)
 
         # Check sub-scopes
-        # TODO: clean-up
-        for cb in scope.callables.values():
-            new_errors = self._check_scope(cb[0], scope)
+        for _, sub_obj in scope.iter_callables():
+            new_errors = self._check_scope(sub_obj, scope)
             errors.extend(new_errors)
 
         logging.debug("obj: %s - scope: %s" % (obj.__name__, scope))
 
         return errors
+
+    def _get_scope_tree(self, obj: Any) -> Optional[ast.AST]:
+        """Get the AST of a module, class or function.
+
+        The tree is taken from the index of the file defining the object,
+        so that each file is parsed only once however many scopes it has.
+        Returns None if obj is not defined in python source code.
+        """
+        node = get_static_node(obj)
+        if node is not None:
+            return node
+
+        if not isinstance(obj, types.ModuleType):
+            obj = inspect.unwrap(obj)
+
+        try:
+            source_file = inspect.getsourcefile(obj)
+        except TypeError:
+            return None
+
+        if source_file is not None:
+            index = self._get_ast_index(Path(source_file))
+            if isinstance(obj, types.ModuleType):
+                return index.tree
+
+            node = index.find(obj)
+            if node is not None:
+                return node
+
+        # The object could not be found in the index (e.g. a lambda),
+        # fall back to parsing its source on its own.
+        try:
+            source = inspect.getsource(obj)
+        except (OSError, TypeError):
+            # e.g. a class whose definition is not in its module source
+            return None
+        with instrumentation.span("parse", obj.__qualname__):
+            tree = ast.parse(source)
+        if isinstance(obj, types.ModuleType):
+            return tree
+        return tree.body[0]
+
+    def _release_file(self, file: Path) -> None:
+        """Forget the source and tree of a checked file.
+
+        The files it imports are kept, they are likely imported by the
+        next files as well.
+        """
+        path = Path(os.path.abspath(file))
+        self._ast_indexes.pop(path, None)
+        self.sources.discard(path)
+
+    def _get_ast_index(self, path: Path) -> AstIndex:
+        path = Path(os.path.abspath(path))
+        index = self._ast_indexes.get(path)
+        if index is None:
+            with instrumentation.span("parse", path):
+                index = AstIndex.from_source(self.sources.get(path))
+            self._ast_indexes[path] = index
+
+        return index
+
+
+# Queue where worker processes send the errors of each checked file
+_results: Any = None
+
+
+def _init_worker(results: Any) -> None:
+    global _results
+    _results = results
+
+
+def _import_error(
+    path: Path, module_name: str, exception: BaseException, action: str = "import"
+) -> TypingError:
+    """Report a module failing to import, at the line of
+    the file being executed when it failed."""
+    line_number, column_number = 1, 0
+    description = str(exception)
+    if isinstance(exception, SyntaxError):
+        description = exception.msg
+        if exception.filename == os.path.abspath(path):
+            line_number = exception.lineno or 1
+            column_number = max((exception.offset or 1) - 1, 0)
+    else:
+        for frame in traceback.extract_tb(exception.__traceback__):
+            if frame.filename == os.path.abspath(path) and frame.lineno is not None:
+                line_number = frame.lineno
+
+    return TypingError(
+        file=path,
+        line_number=line_number,
+        column_number=column_number,
+        end_column_number=None,
+        message=(
+            f"Could not {action} module '{module_name}': "
+            f"{type(exception).__name__}: {description}"
+        ),
+    )
+
+
+def _check_batch(
+    files: List[Path],
+    cache_dir: Optional[Path],
+    import_timeout: Optional[float],
+    import_mode: str,
+    recorder: Optional[instrumentation.Recorder],
+) -> Optional[instrumentation.Recorder]:
+    """Check a batch of files in a worker process.
+
+    :param recorder: Records the activity of the worker, which is
+        returned to be merged with the one of the main process.
+    """
+    with instrumentation.recording(recorder):
+        type_checker = TypeChecker(
+            cache_dir=cache_dir, import_timeout=import_timeout, import_mode=import_mode
+        )
+        type_checker.finder.add_files(files)
+        with type_checker.finder.installed(), recording_modules():
+            for file in files:
+                _results.put((file, type_checker._check_file(file)))
+                type_checker._release_file(file)
+
+    save_signature_database()
+    clear_interned()
+    return recorder
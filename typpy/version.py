@@ -0,0 +1,6 @@
+import sys
+
+# Updated automatically on release, keep in sync with setup.py
+__version__ = "0.4.0"
+
+PYTHON_VERSION = f"{sys.implementation.name}-{sys.version.split()[0]}"